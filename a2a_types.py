@@ -158,6 +158,11 @@ class TaskNotFoundError(JSONRPCError):
     message: str = "Task not found"
     data: None = None
 
+class ServerBusyError(JSONRPCError):
+    code: int = -32010
+    message: str = "Server is busy, retry later"
+    data: Any | None = None
+
 ########################################################
 #                   Streaming                          #
 ########################################################
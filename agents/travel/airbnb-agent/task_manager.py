@@ -11,16 +11,21 @@ from a2a_types import (
     TaskArtifactUpdateEvent,
     TextPart,
     TaskState,
-    Task,
     SendTaskResponse,
     JSONRPCResponse,
     SendTaskStreamingRequest,
     SendTaskStreamingResponse,
-    JSONRPCError
+    JSONRPCError,
 )
 
 from server.task_manager import InMemoryTaskManager
+from server.task_retention import TaskRetentionPolicy
+from server.task_store import TaskStore
+from server.invoke_pool import InvokePool, InvokePoolFullError
+from server.artifact_chunker import ArtifactChunker, ArtifactChunking
+from server.singleflight import Singleflight, normalize_query
 from google.genai import types
+from google.adk.agents.run_config import RunConfig, StreamingMode
 
 import logging
 logger = logging.getLogger(__name__)
@@ -67,8 +72,15 @@ class AgentWithTaskManager(ABC):
                 session_id=session_id,
             )
         async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
+            user_id=self._user_id, session_id=session.id, new_message=content,
+            run_config=RunConfig(streaming_mode=StreamingMode.SSE),
         ):
+            if event.partial:
+                if event.content and event.content.parts:
+                    text = "".join(p.text for p in event.content.parts if p.text)
+                    if text:
+                        yield {"is_task_complete": False, "chunk": text}
+                continue
             if event.is_final_response():
                 response = ""
                 if (
@@ -97,22 +109,66 @@ class AgentWithTaskManager(ABC):
 
 class AgentTaskManager(InMemoryTaskManager):
     
-    def __init__(self, agent: AgentWithTaskManager):
-        super().__init__()
+    def __init__(
+        self,
+        agent: AgentWithTaskManager,
+        retention_policy: TaskRetentionPolicy | None = None,
+        store: TaskStore | None = None,
+        invoke_pool: InvokePool | None = None,
+        chunking: ArtifactChunking | None = None,
+        coalesce: bool = False,
+    ):
+        super().__init__(retention_policy, store, invoke_pool)
         self.agent = agent
+        self.chunking = chunking or ArtifactChunking()
+        # Identical first-turn requests in flight at once share one agent run
+        self.singleflight = Singleflight(self._share_session) if coalesce else None
+
+    def metrics(self) -> dict:
+        metrics = super().metrics()
+        if self.singleflight is not None:
+            metrics["singleflight"] = {**self.singleflight.stats, "in_flight": len(self.singleflight)}
+        return metrics
 
     async def _stream_generator(
         self, request: SendTaskStreamingRequest
     ) -> AsyncIterable[SendTaskStreamingResponse] | JSONRPCResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
+        chunker = ArtifactChunker(self.agent._agent.name, self.chunking)
+        closed: list[Artifact] = []  # text streamed by earlier steps, e.g. before a tool call
         try:
-          async for item in self.agent.stream(query, task_send_params.sessionId):
+          async for item in self._agent_stream(query, task_send_params):
+            if "chunk" in item:
+              # Incremental LLM text goes out right away as artifact append chunks
+              chunk = chunker.feed(item["chunk"])
+              if chunk:
+                yield SendTaskStreamingResponse(
+                    id=request.id,
+                    result=TaskArtifactUpdateEvent(
+                        id=task_send_params.id,
+                        artifact=chunk,
+                    )
+                )
+              continue
             is_task_complete = item["is_task_complete"]
             artifacts = None
             if not is_task_complete:
               task_state = TaskState.WORKING
               parts = [{"type": "text", "text": item["updates"]}]
+              # The step that streamed text is over: close its artifact, so the
+              # next step's text goes under a new index instead of appending
+              last_chunk = chunker.finish()
+              if last_chunk:
+                closed.append(chunker.artifact())
+                chunker = ArtifactChunker(self.agent._agent.name, self.chunking, chunker.index + 1)
+                yield SendTaskStreamingResponse(
+                    id=request.id,
+                    result=TaskArtifactUpdateEvent(
+                        id=task_send_params.id,
+                        artifact=last_chunk,
+                    )
+                )
             else:
               if isinstance(item["content"], dict):
                 if ("response" in item["content"]
@@ -126,10 +182,25 @@ class AgentTaskManager(InMemoryTaskManager):
               else:
                 task_state = TaskState.COMPLETED
                 parts = [{"type": "text", "text": item["content"]}]
-              artifacts = [Artifact(name=self.agent._agent.name, parts=parts, index=0, append=False)]
+              artifacts = [Artifact(name=self.agent._agent.name, parts=parts, index=chunker.index, append=False)]
+          outgoing = []
+          if artifacts:
+            # If the text was already streamed, only the closing chunk is left to send
+            last_chunk = chunker.finish()
+            if last_chunk and parts[0]["type"] == "text":
+              outgoing = [last_chunk]
+              artifacts = [chunker.artifact()]
+            elif last_chunk:
+              closed.append(chunker.artifact())
+              artifacts[0].index += 1
+              outgoing = [last_chunk, *artifacts]
+            else:
+              outgoing = artifacts
+          # Stored artifacts match what the host reassembles from the stream
+          artifacts = closed + (artifacts or [])
           message = Message(role=self.agent._agent.name, parts=parts)
           task_status = TaskStatus(state=task_state, message=message)
-          await self._update_store(task_send_params.id, task_status, artifacts)
+          await self._update_store(task_send_params.id, task_status, artifacts or None)
           task_update_event = TaskStatusUpdateEvent(
                 id=task_send_params.id,
                 status=task_status,
@@ -137,15 +208,14 @@ class AgentTaskManager(InMemoryTaskManager):
             )
           yield SendTaskStreamingResponse(id=request.id, result=task_update_event)
 
-          if artifacts:
-            for artifact in artifacts:
-              yield SendTaskStreamingResponse(
-                  id=request.id,
-                  result=TaskArtifactUpdateEvent(
-                      id=task_send_params.id,
-                      artifact=artifact,
-                  )
-              )
+          for artifact in outgoing:
+            yield SendTaskStreamingResponse(
+                id=request.id,
+                result=TaskArtifactUpdateEvent(
+                    id=task_send_params.id,
+                    artifact=artifact,
+                )
+            )
           if is_task_complete:
             yield SendTaskStreamingResponse(
               id=request.id,
@@ -168,8 +238,15 @@ class AgentTaskManager(InMemoryTaskManager):
             )
 
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        previous = await self.store.get(request.params.id)
         await self.upsert_task(request.params)
-        return await self._invoke(request)
+        try:
+            return await self._invoke(request)
+        except InvokePoolFullError:
+            # Turned away before running: the server answers 429 and the
+            # caller retries, so leave no trace of this attempt.
+            await self.restore_task(request.params, previous)
+            raise
     
     async def on_send_task_subscribe(
         self, request: SendTaskStreamingRequest
@@ -177,45 +254,80 @@ class AgentTaskManager(InMemoryTaskManager):
         await self.upsert_task(request.params)
         return self._stream_generator(request)
     
-    async def _update_store(
-        self, task_id: str, status: TaskStatus, artifacts: list[Artifact]
-    ) -> Task:
-        async with self.lock:
-            try:
-                task = self.tasks[task_id]
-            except KeyError:
-                logger.error(f"Task {task_id} not found for updating the task")
-                raise ValueError(f"Task {task_id} not found")
-            task.status = status
-            if artifacts is not None:
-                if task.artifacts is None:
-                    task.artifacts = []
-                task.artifacts.extend(artifacts)
-            return task
-    
     async def _invoke(self, request: SendTaskRequest) -> SendTaskResponse:
         task_send_params: TaskSendParams = request.params
         query = self._get_user_query(task_send_params)
         try:
-            result = self.agent.invoke(query, task_send_params.sessionId)
+            result = await self._run_invoke(query, task_send_params)
+        except InvokePoolFullError:
+            raise
         except Exception as e:
             logger.error(f"Error invoking agent: {e}")
             raise ValueError(f"Error invoking agent: {e}")
         parts = [{"type": "text", "text": result}]
         task_state = TaskState.INPUT_REQUIRED if "MISSING_INFO:" in result else TaskState.COMPLETED
-        task = Task(
-            ...,
-            artifacts=[],
-        )
-        await self._update_store(
+        task = await self._update_store(
             task_send_params.id,
             TaskStatus(
                 state=task_state, message=Message(role=self.agent._agent.name, parts=parts)
             ),
             [Artifact(parts=parts)],
         )
-        return SendTaskResponse(id=request.id, result=task)
+        return SendTaskResponse(
+            id=request.id,
+            result=self.append_task_history(task, task_send_params.historyLength),
+        )
     
+    async def _run_invoke(self, query: str, task_send_params: TaskSendParams) -> str:
+        session_id = task_send_params.sessionId
+        # agent.invoke blocks until the run finishes, so keep it off the event loop
+        if not self._coalescable(task_send_params):
+            return await self.invoke_pool.run(self.agent.invoke, query, session_id)
+
+        async def source():
+            yield await self.invoke_pool.run(self.agent.invoke, query, session_id)
+        key = ("invoke", normalize_query(query))
+        results = [r async for r in self.singleflight.subscribe(key, session_id, source)]
+        return results[0]
+
+    def _agent_stream(self, query: str, task_send_params: TaskSendParams) -> AsyncIterable[Dict[str, Any]]:
+        session_id = task_send_params.sessionId
+        if not self._coalescable(task_send_params):
+            return self.agent.stream(query, session_id)
+        key = ("stream", normalize_query(query))
+        return self.singleflight.subscribe(
+            key, session_id, lambda: self.agent.stream(query, session_id)
+        )
+
+    def _coalescable(self, task_send_params: TaskSendParams) -> bool:
+        """Only requests that start a new session can share a run; anything
+        else depends on what was said before in its own session."""
+        return self.singleflight is not None and self._get_session(task_send_params.sessionId) is None
+
+    def _get_session(self, session_id: str):
+        return self.agent._runner.session_service.get_session(
+            app_name=self.agent._agent.name, user_id=self.agent._user_id, session_id=session_id
+        )
+
+    def _share_session(self, source_id: str, target_ids: list[str]):
+        """Gives the sessions that joined a shared run the history it left
+        in the first caller's session, so their follow-ups have context."""
+        service = self.agent._runner.session_service
+        source = self._get_session(source_id)
+        if source is None:
+            return
+        for target_id in target_ids:
+            if target_id == source_id or self._get_session(target_id) is not None:
+                continue
+            target = service.create_session(
+                app_name=self.agent._agent.name,
+                user_id=self.agent._user_id,
+                state={},
+                session_id=target_id,
+            )
+            for event in source.events:
+                service.append_event(target, event)
+
     def _get_user_query(self, task_send_params: TaskSendParams) -> str:
         part = task_send_params.message.parts[0]
         if not isinstance(part, TextPart):
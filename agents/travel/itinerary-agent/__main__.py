@@ -1,4 +1,6 @@
 from server.server import A2AServer
+from server.task_store import SQLiteTaskStore
+from server.admission import AdmissionPolicy
 from a2a_types import AgentCard, AgentCapabilities, AgentSkill
 from .task_manager import AgentTaskManager
 from .agent import Agent
@@ -18,10 +20,14 @@ logger = logging.getLogger(__name__)
 @click.command()
 @click.option("--host", default="localhost")
 @click.option("--port", default=10004)
-def main(host, port):
-    asyncio.run(async_main(host, port))
+@click.option("--task-db", default=None, help="SQLite file for durable task storage (in-memory if omitted).")
+@click.option("--coalesce", is_flag=True, help="Let identical first-turn requests in flight at once share one agent run.")
+@click.option("--max-in-flight", default=16, help="Tasks run at once before new ones queue (0 disables admission control).")
+@click.option("--max-pending", default=32, help="Tasks that may queue before new ones are rejected with 429.")
+def main(host, port, task_db, coalesce, max_in_flight, max_pending):
+    asyncio.run(async_main(host, port, task_db, coalesce, max_in_flight, max_pending))
 
-async def async_main(host, port):
+async def async_main(host, port, task_db, coalesce, max_in_flight, max_pending):
     
   # Load config from JSON file
     config_path = os.path.join(os.path.dirname(__file__), 'agent_config.json')
@@ -57,9 +63,16 @@ async def async_main(host, port):
     agent = await Agent.create()
     server = A2AServer(
         agent_card=agent_card,
-        task_manager=AgentTaskManager(agent=agent),
+        task_manager=AgentTaskManager(
+            agent=agent,
+            store=SQLiteTaskStore(task_db) if task_db else None,
+            coalesce=coalesce,
+        ),
         host=host,
         port=port,
+        admission_policy=AdmissionPolicy(
+            max_in_flight=max_in_flight or None, max_pending=max_pending
+        ),
     )
     config = uvicorn.Config(server.app, host=host, port=port)
     server = uvicorn.Server(config)
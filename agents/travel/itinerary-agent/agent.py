@@ -4,6 +4,7 @@ from google.adk.artifacts import InMemoryArtifactService
 from google.adk.sessions import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.genai import types
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from typing import Dict, Any, AsyncIterable
 import os
 import json
@@ -87,8 +88,16 @@ class Agent:
                     session_id=session_id,
                 )
             async for event in self._runner.run_async(
-                user_id=self._user_id, session_id=session.id, new_message=content
+                user_id=self._user_id, session_id=session.id, new_message=content,
+                run_config=RunConfig(streaming_mode=StreamingMode.SSE),
             ):
+                if event.partial:
+                    # Token deltas; the aggregated text arrives again in the final event
+                    if event.content and event.content.parts:
+                        text = "".join(p.text for p in event.content.parts if p.text)
+                        if text:
+                            yield {"is_task_complete": False, "chunk": text}
+                    continue
                 if event.is_final_response():
                     response = ""
                     if (
@@ -0,0 +1,173 @@
+import asyncio
+import time
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Hashable
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"  # discard the oldest queued item
+    COALESCE = "coalesce"        # replace a queued item with the same key, else drop oldest
+    BLOCK = "block"              # make the publisher wait for room
+
+
+def default_coalesce_key(item: Any) -> Hashable | None:
+    """Items about the same task and of the same type supersede each other."""
+    if isinstance(item, dict) and item.get("task_id"):
+        return (item.get("type"), item["task_id"])
+    return None
+
+
+class Subscription:
+    """A bounded queue receiving every item published under one key."""
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        key: str,
+        maxsize: int,
+        policy: OverflowPolicy,
+        coalesce_key: Callable[[Any], Hashable | None],
+    ):
+        self.bus = bus
+        self.key = key
+        self.maxsize = maxsize
+        self.policy = policy
+        self._coalesce_key = coalesce_key
+        self._entries: deque[list] = deque()  # [coalesce key, item, enqueued at]
+        self._by_key: dict[Hashable, list] = {}
+        self._readable = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self.closed = False
+        self.stats = {"delivered": 0, "dropped": 0, "coalesced": 0,
+                      "lag_seconds_total": 0.0, "lag_seconds_max": 0.0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def lag(self) -> float:
+        """Age in seconds of the oldest undelivered item."""
+        if not self._entries:
+            return 0.0
+        return time.monotonic() - self._entries[0][2]
+
+    async def put(self, item: Any):
+        if self.closed:
+            return
+        key = self._coalesce_key(item) if self.policy == OverflowPolicy.COALESCE else None
+        if key is not None and key in self._by_key:
+            # Keep the queue position, deliver only the newest version.
+            self._by_key[key][1] = item
+            self.stats["coalesced"] += 1
+            return
+        while len(self._entries) >= self.maxsize:
+            if self.policy == OverflowPolicy.BLOCK:
+                self._writable.clear()
+                await self._writable.wait()
+                if self.closed:
+                    return
+            else:
+                self._pop()
+                self.stats["dropped"] += 1
+        entry = [key, item, time.monotonic()]
+        self._entries.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        self._readable.set()
+
+    async def get(self) -> Any:
+        while not self._entries:
+            self._readable.clear()
+            await self._readable.wait()
+        _, item, enqueued_at = self._pop()
+        lag = time.monotonic() - enqueued_at
+        self.stats["delivered"] += 1
+        self.stats["lag_seconds_total"] += lag
+        if lag > self.stats["lag_seconds_max"]:
+            self.stats["lag_seconds_max"] = lag
+        return item
+
+    def _pop(self) -> list:
+        entry = self._entries.popleft()
+        if entry[0] is not None and self._by_key.get(entry[0]) is entry:
+            del self._by_key[entry[0]]
+        self._writable.set()
+        return entry
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        return await self.get()
+
+    def close(self):
+        self.closed = True
+        self._writable.set()
+        self.bus._unsubscribe(self)
+
+
+class EventBus:
+    """Pub/sub keyed by conversation id.
+
+    Every subscriber of a key gets its own bounded queue, so two browser
+    sessions never steal each other's items and a slow session only ever
+    slows down publishers of its own conversation.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST,
+        coalesce_key: Callable[[Any], Hashable | None] = default_coalesce_key,
+    ):
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce_key = coalesce_key
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self.published = 0
+        self.undelivered = 0  # published under a key nobody subscribed to
+
+    def subscribe(
+        self,
+        key: str,
+        maxsize: int | None = None,
+        policy: OverflowPolicy | None = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            self, key, maxsize or self.maxsize, policy or self.policy, self.coalesce_key
+        )
+        self._subscribers.setdefault(key, set()).add(subscription)
+        return subscription
+
+    async def publish(self, key: str, item: Any):
+        self.published += 1
+        subscribers = self._subscribers.get(key)
+        if not subscribers:
+            self.undelivered += 1
+            return
+        for subscription in list(subscribers):
+            await subscription.put(item)
+
+    def _unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            del self._subscribers[subscription.key]
+
+    def metrics(self) -> dict[str, Any]:
+        """Totals plus queue depth, lag and drop counts across subscribers."""
+        subscriptions = [s for subs in self._subscribers.values() for s in subs]
+        return {
+            "published": self.published,
+            "undelivered": self.undelivered,
+            "keys": len(self._subscribers),
+            "subscribers": len(subscriptions),
+            "queued": sum(len(s) for s in subscriptions),
+            "max_lag_seconds": max((s.lag for s in subscriptions), default=0.0),
+            "dropped": sum(s.stats["dropped"] for s in subscriptions),
+            "coalesced": sum(s.stats["coalesced"] for s in subscriptions),
+        }
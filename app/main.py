@@ -5,12 +5,16 @@ from pathlib import Path
 
 from fastapi import FastAPI, WebSocket, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
+from fastapi.encoders import jsonable_encoder
 
 from server.host_agent.adk_host_manager import ADKHostManager
+from server.host_agent.host_events import HostEvent
 from a2a_types import Message, TextPart
-from server.host_agent.utils import get_agent_card
-from app.task_queue import task_queue
+from server.host_agent.utils import get_agent_card, card_resolver
+from app.task_queue import event_bus
+from app.turn_scheduler import TurnScheduler, TurnPolicy
+from server.metrics import REGISTRY, CONTENT_TYPE, Sample, stats_samples
 
 # FastAPI 앱 인스턴스 생성
 app = FastAPI()
@@ -27,9 +31,59 @@ if not api_key:
 # ADK Host Manager 인스턴스 생성 (에이전트 관리)
 host_manager = ADKHostManager(api_key)
 
+# 대화별 턴 스케줄링 정책: queue(순서대로 실행) 또는 supersede(새 메시지가 진행 중인 턴을 취소)
+TURN_POLICY = TurnPolicy(os.environ.get("TURN_POLICY", TurnPolicy.QUEUE.value))
+MAX_QUEUED_TURNS = int(os.environ.get("MAX_QUEUED_TURNS", "8"))
+
 # 에이전트 정보 저장용 리스트
 agent_infos = []
 
+# /metrics용: 연결 중인 웹소켓의 턴 스케줄러와, 끊긴 연결의 누적 턴 카운터
+schedulers: set[TurnScheduler] = set()
+closed_turn_stats = {"started": 0, "completed": 0, "cancelled": 0, "failed": 0, "rejected": 0}
+
+# 단조 증가하는 누적값은 Prometheus counter(_total)로, 나머지는 gauge로 내보낸다
+HOST_COUNTERS = (
+    # 프롬프트 / 토큰 누적
+    "prompt_builds", "prompt_build_seconds", "model_calls",
+    "input_tokens", "cached_input_tokens", "output_tokens",
+    # 결과 캐시
+    "hits", "misses", "stores", "bypassed", "continuations", "expired", "evicted",
+    # 검증
+    "checked", "validated", "skipped_trusted", "failed",
+    # 원격 에이전트: 분산, 쿼터, 재시도, 서킷 브레이커
+    "sent", "affinity_hits", "affinity_moves",
+    "admitted", "queued", "rejected", "timed_out", "wait_seconds",
+    "retries", "opened",
+)
+EVENT_BUS_COUNTERS = ("published", "undelivered")
+TURN_COUNTERS = ("started", "completed", "cancelled", "failed", "rejected")
+
+def collect_metrics():
+    # 호스트 매니저 / 이벤트 버스 / 턴 스케줄러 상태를 스크랩 시점에 읽는다
+    yield from stats_samples(
+        "host", host_manager.metrics(),
+        label_maps={"agents": "agent", "replicas": "replica"},
+        counters=HOST_COUNTERS,
+    )
+    yield from stats_samples("host_event_bus", event_bus.metrics(), counters=EVENT_BUS_COUNTERS)
+    turns = dict(closed_turn_stats)
+    for scheduler in schedulers:
+        for key, value in scheduler.stats.items():
+            turns[key] += value
+    yield from stats_samples("host_turns", turns, counters=TURN_COUNTERS)
+    yield Sample("host_turns_queued", {}, sum(len(s) for s in schedulers))
+    yield Sample("host_turns_running", {}, sum(1 for s in schedulers if s.busy))
+    yield Sample("host_websockets", {}, len(schedulers))
+
+REGISTRY.register_collector(collect_metrics)
+
+# 종료 시 원격 에이전트 커넥션 풀과 카드 리졸버 정리
+@app.on_event("shutdown")
+async def shutdown():
+    await host_manager.close()
+    await card_resolver.close()
+
 # 루트 엔드포인트: index.html 반환
 @app.get("/")
 async def root():
@@ -42,10 +96,10 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
     print(f"Client #{session_id} connected")
     conversation = host_manager.create_conversation()
     print(f"Created conversation: {conversation.conversation_id}")
+    subscription = event_bus.subscribe(conversation.conversation_id)
 
     async def send_task_results():
-        while True:
-            item = await task_queue.get()
+        async for item in subscription:
             # If the item is a dict with 'type', treat as new protocol
             if isinstance(item, dict) and 'type' in item:
                 if item['type'] == 'request':
@@ -89,6 +143,17 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                             "taskId": getattr(task, 'id', None)
                         }
                     }))
+                elif item['type'] == 'correction':
+                    # 이미 전달된 답변이 사후 검증에서 기준 점수 미달로 판정된 경우
+                    await websocket.send_text(json.dumps({
+                        "type": "message",
+                        "source": "system",
+                        "content": {
+                            "text": f"[Validation score {item['score']} for {item['agent_name']}] {item['text']}",
+                            "role": "validator",
+                            "taskId": item.get('task_id')
+                        }
+                    }))
                 continue
             # Legacy: handle as task
             task = item
@@ -118,12 +183,43 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
 
     send_task_task = asyncio.create_task(send_task_results())
 
+    async def send_system(text: str):
+        await websocket.send_text(json.dumps({
+            "type": "message",
+            "source": "system",
+            "content": {
+                "text": text,
+                "role": "system"
+            }
+        }))
+
+    # 한 턴(호스트 에이전트 실행) 처리. 스케줄러가 별도 태스크로 실행한다.
+    async def run_turn(user_input: str):
+        # 등록된 에이전트 목록이 바뀐 경우에만 동기화 (평소에는 no-op)
+        await host_manager.sync_agents([agent['url'] for agent in agent_infos])
+
+        # Message 객체 생성 시 TextPart 직렬화
+        message = Message(
+            parts=[{"text": user_input}],
+            role="user",
+            metadata={"conversation_id": conversation.conversation_id}
+        )
+        # 호스트 이벤트를 생성되는 즉시 전달 (부분 텍스트, 도구 호출, 원격 태스크 갱신, 최종 답변)
+        async for event in host_manager.stream_message(message):
+            await websocket.send_text(json.dumps(host_event_packet(event)))
+
+    scheduler = TurnScheduler(run_turn, TURN_POLICY, MAX_QUEUED_TURNS)
+    schedulers.add(scheduler)
+
     try:
+        # 리더 루프: 턴 실행 중에도 새 메시지, 중지 명령, 연결 종료를 바로 받는다
         while True:
             user_input = await websocket.receive_text()
-            for agent_url in [agent['url'] for agent in agent_infos]:
-                host_manager.register_agent(agent_url)
-            
+            if is_stop_command(user_input):
+                cancelled = scheduler.stop()
+                await send_system(f"[Stopped {cancelled} turn(s)]" if cancelled else "[Nothing to stop]")
+                continue
+
             # 유저 메시지 전송
             await websocket.send_text(json.dumps({
                 "type": "message",
@@ -133,47 +229,80 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                     "role": "user"
                 }
             }))
-
-            # Message 객체 생성 시 TextPart 직렬화
-            message = Message(
-                parts=[{"text": user_input}],
-                role="user",
-                metadata={"conversation_id": conversation.conversation_id}
-            )
-            await host_manager.process_message(message)
-            
-            # 에이전트 메시지 처리
-            agent_messages = [
-                m for m in host_manager._messages
-                if m.role != "user" and m.metadata and m.metadata.get("conversation_id") == conversation.conversation_id
-            ]
-            if agent_messages:
-                last_agent_msg = agent_messages[-1]
-                part = last_agent_msg.parts[0]
-                text = part["text"] if isinstance(part, dict) and "text" in part else (part.text if hasattr(part, "text") else str(part))
-                await websocket.send_text(json.dumps({
-                    "type": "message",
-                    "source": "host_agent",
-                    "content": {
-                        "text": text,
-                        "role": last_agent_msg.role
-                    }
-                }))
-            else:
-                await websocket.send_text(json.dumps({
-                    "type": "message",
-                    "source": "system",
-                    "content": {
-                        "text": "[No agent response yet]",
-                        "role": "system"
-                    }
-                }))
+            if not scheduler.submit(user_input):
+                await send_system("[Too many pending messages, please wait for the current answer]")
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        # 연결이 끊기면 진행 중인 턴과 원격 태스크를 즉시 취소해 슬롯을 반납
+        await scheduler.close()
+        schedulers.discard(scheduler)
+        for key, value in scheduler.stats.items():
+            closed_turn_stats[key] += value
         send_task_task.cancel()
+        subscription.close()
         print(f"Client #{session_id} disconnected")
 
+def host_event_packet(event: HostEvent) -> dict:
+    # 호스트 이벤트를 웹소켓 패킷으로 변환
+    if event.type == "text_delta":
+        return {
+            "type": "delta",
+            "source": "host_agent",
+            "content": {"text": event.text, "role": "host_agent"}
+        }
+    if event.type == "tool_call":
+        return {
+            "type": "tool_call",
+            "source": "host_agent",
+            "content": {"name": event.name, "args": jsonable_encoder(event.args)}
+        }
+    if event.type == "task_update":
+        return {
+            "type": "task_update",
+            "source": "task",
+            "content": {
+                "taskId": event.task_id,
+                "role": event.agent_name,
+                "state": event.state.value if event.state else None,
+                "text": event.text,
+                "append": event.append,
+                "final": event.final
+            }
+        }
+    message = event.message
+    if message and message.parts:
+        part = message.parts[0]
+        text = part.text if hasattr(part, "text") else str(part)
+        return {
+            "type": "message",
+            "source": "host_agent",
+            "content": {"text": text, "role": message.role, "usage": event.usage}
+        }
+    return {
+        "type": "message",
+        "source": "system",
+        "content": {"text": "[No agent response yet]", "role": "system"}
+    }
+
+def is_stop_command(text: str) -> bool:
+    # "/stop" 입력 또는 {"type": "stop"} 제어 프레임
+    if text.strip() == "/stop":
+        return True
+    if text.startswith("{"):
+        try:
+            return json.loads(text).get("type") == "stop"
+        except (ValueError, AttributeError):
+            return False
+    return False
+
+# Prometheus 텍스트 형식의 메트릭 (A2A_METRICS=0이면 비활성화)
+@app.get("/metrics")
+async def metrics():
+    if not REGISTRY.enabled:
+        return Response(status_code=404)
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/agents")
 async def get_agents():
     return {"agents": agent_infos}
@@ -183,10 +312,11 @@ async def add_agent(request: Request):
     data = await request.json()
     url = data.get("url")
     if url not in [agent['url'] for agent in agent_infos]:
-        card = get_agent_card(url)
+        card = await get_agent_card(url)
         if card:
             name = card.model_dump().get('name')
             agent_infos.append({"name": name, "url": url})
+            host_manager.register_agent_card(url, card)
             return {"success": True, "agents": agent_infos}
         else:
             return {"fail": False, "error": "Invalid or unreachable agent URL"}
@@ -201,6 +331,7 @@ async def delete_agent(request: Request):
     agent_infos[:] = [agent for agent in agent_infos if agent["url"] != url]
     after_count = len(agent_infos)
     if before_count > after_count:
+        await host_manager.sync_agents([agent['url'] for agent in agent_infos])
         return {"success": True, "agents": agent_infos}
     else:
         return {"fail": False, "error": "Agent not found"}
@@ -209,7 +340,7 @@ async def delete_agent(request: Request):
 async def agent_card_preview(request: Request):
     data = await request.json()
     url = data.get("url")
-    card = get_agent_card(url)
+    card = await get_agent_card(url)
     if card:
         return JSONResponse(content=card.model_dump())
     else:
@@ -26,6 +26,7 @@ export function displayMessage(data) {
   const { source, content } = data;
   if (!content || !content.text) return;
   const messagesDiv = document.getElementById('messages');
+  finishHostDrafts(messagesDiv, source);
   const messageDiv = document.createElement('div');
   if (source === 'host_request' || source === 'host_agent') {
     messageDiv.className = 'message host-request left-align host-message';
@@ -77,6 +78,44 @@ export function displayMessage(data) {
   messagesDiv.scrollTop = messagesDiv.scrollHeight;
 }
 
+// 스트리밍 중인 호스트 답변 조각을 이어 붙여 표시
+export function appendDelta(data) {
+  const { content } = data;
+  if (!content || !content.text) return;
+  const messagesDiv = document.getElementById('messages');
+  let messageDiv = messagesDiv.querySelector('.message.host-draft.streaming');
+  if (!messageDiv) {
+    messageDiv = document.createElement('div');
+    messageDiv.className = 'message host-request left-align host-message host-draft streaming';
+    messageDiv.dataset.source = 'host_agent';
+    messageDiv.innerHTML = `
+      <div class="message-header host-message-header">
+        <div class="header-content">
+          <span>Host Agent</span>
+        </div>
+      </div>
+      <div class="message-content" style="display: block;"></div>
+    `;
+    messagesDiv.appendChild(messageDiv);
+  }
+  // textContent는 HTML로 해석되지 않으므로 별도 이스케이프가 필요 없다
+  messageDiv.querySelector('.message-content').textContent += content.text.replace(/\u0336/g, "");
+  messagesDiv.scrollTop = messagesDiv.scrollHeight;
+}
+
+// 최종 답변이 오면 임시 조각을 지우고, 다른 메시지가 끼어들면 조각을 마감한다
+function finishHostDrafts(messagesDiv, source) {
+  messagesDiv.querySelectorAll('.message.host-draft').forEach(draft => {
+    if (source === 'host_agent') {
+      draft.remove();
+    } else if (source === 'system') {
+      draft.classList.remove('host-draft', 'streaming');
+    } else {
+      draft.classList.remove('streaming');
+    }
+  });
+}
+
 export function toggleMessage(button) {
   const messageDiv = button.closest('.message');
   const content = messageDiv.querySelector('.message-content');
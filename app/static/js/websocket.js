@@ -1,5 +1,7 @@
 // websocket.js: WebSocket 연결 및 핸들러 관련 함수
 
+import { appendDelta } from './messages.js';
+
 export function addWebSocketHandlers(ws, ws_url, addSubmitHandler, displayMessage, removeMessagesPlaceholder, updateMessageVisibility) {
   ws.onopen = function () {
     document.getElementById("sendButton").disabled = false;
@@ -11,6 +13,8 @@ export function addWebSocketHandlers(ws, ws_url, addSubmitHandler, displayMessag
     const packet = JSON.parse(event.data);
     if (packet.type === 'message' && packet.source !== 'user') {
         displayMessage(packet);
+    } else if (packet.type === 'delta') {
+        appendDelta(packet);
     } else if (!packet.type && packet.role !== 'user') {
         const message = document.createElement("p");
         message.className = packet.role || "agent";
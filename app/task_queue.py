@@ -1,2 +1,4 @@
-import asyncio
-task_queue = asyncio.Queue()
\ No newline at end of file
+from app.event_bus import EventBus
+
+# 대화(conversation_id)별로 구독하는 이벤트 버스. 웹소켓마다 자기 대화의 큐만 받는다.
+event_bus = EventBus()
@@ -0,0 +1,102 @@
+import asyncio
+import logging
+from collections import deque
+from enum import Enum
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class TurnPolicy(str, Enum):
+    QUEUE = "queue"          # run turns one after another
+    SUPERSEDE = "supersede"  # a new turn cancels the running one and anything queued
+
+
+class TurnScheduler:
+    """Runs the turns of one conversation one at a time, off the socket reader.
+
+    The websocket reader only submits turns, so it keeps reading while a turn
+    runs and can react to a stop command or a disconnect right away.
+    Cancelling a turn cancels its task, which propagates into the ADK run
+    and closes any remote A2A requests it has open.
+    """
+
+    def __init__(
+        self,
+        run_turn: Callable[[Any], Awaitable[None]],
+        policy: TurnPolicy = TurnPolicy.QUEUE,
+        max_queued: int = 8,
+    ):
+        self._run_turn = run_turn
+        self.policy = policy
+        self.max_queued = max_queued
+        self._queue: deque = deque()
+        self._wakeup = asyncio.Event()
+        self._current: asyncio.Task | None = None
+        self._worker: asyncio.Task | None = None
+        self.closed = False
+        self.stats = {"started": 0, "completed": 0, "cancelled": 0,
+                      "failed": 0, "rejected": 0}
+
+    @property
+    def busy(self) -> bool:
+        return self._current is not None
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def submit(self, turn: Any) -> bool:
+        """Schedules a turn. Returns False if it was rejected."""
+        if self.closed:
+            return False
+        if self.policy == TurnPolicy.SUPERSEDE:
+            self.stop()
+        elif len(self._queue) >= self.max_queued:
+            self.stats["rejected"] += 1
+            return False
+        self._queue.append(turn)
+        self._wakeup.set()
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        return True
+
+    def stop(self) -> int:
+        """Cancels the running turn and drops queued ones. Returns how many."""
+        cancelled = len(self._queue)
+        self._queue.clear()
+        if self._current is not None and not self._current.done():
+            self._current.cancel()
+            cancelled += 1
+        self.stats["cancelled"] += cancelled
+        return cancelled
+
+    async def close(self):
+        """Cancels everything and waits until the running turn has unwound."""
+        self.closed = True
+        current = self._current
+        self.stop()
+        pending = [t for t in (self._worker, current) if t is not None]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self):
+        while True:
+            while not self._queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            turn = self._queue.popleft()
+            current = asyncio.create_task(self._run_turn(turn))
+            self._current = current
+            self.stats["started"] += 1
+            try:
+                await asyncio.wait({current})
+            finally:
+                self._current = None
+            if current.cancelled():
+                continue  # counted by stop()
+            if current.exception() is not None:
+                self.stats["failed"] += 1
+                logger.error(f"Turn failed: {current.exception()}")
+            else:
+                self.stats["completed"] += 1
@@ -0,0 +1,94 @@
+"""500 concurrent websocket sessions on the conversation event bus.
+
+Each simulated session subscribes to its own conversation id, like
+`websocket_endpoint`, and a publisher per conversation emits request and
+response items, like `HostAgent._dispatch_task`. Sessions yield once per
+item, like a websocket send, so bursts outrun them and the per-session
+queue (`MAXSIZE`, smaller than a burst) overflows. Runs once per overflow
+policy, checks that every session only receives its own items, in order
+per task, and reports throughput, drops, coalescing and delivery lag.
+
+    uv run -m benchmarks.bench_event_bus
+"""
+import asyncio
+import time
+import uuid
+
+from app.event_bus import EventBus, OverflowPolicy
+
+SESSIONS = 500
+ITEMS_PER_SESSION = 200
+MAXSIZE = 32            # per-session queue, well below the burst size
+UPDATES_PER_TASK = 10   # consecutive items about the same task (coalescable)
+END = "end"
+
+
+async def session(bus: EventBus, conversation_id: str, received: dict[str, list]) -> dict:
+    subscription = bus.subscribe(conversation_id)
+    items = received[conversation_id]
+    try:
+        while (item := await subscription.get())["type"] != END:
+            items.append(item)
+            await asyncio.sleep(0)  # the websocket send
+    finally:
+        subscription.close()
+    return subscription.stats
+
+
+async def publisher(bus: EventBus, conversation_id: str):
+    for i in range(ITEMS_PER_SESSION):
+        await bus.publish(conversation_id, {
+            "type": "response" if i % 2 else "request",
+            "task_id": f"{conversation_id}-{i // UPDATES_PER_TASK}",
+            "conversation": conversation_id,
+            "seq": i,
+        })
+        if i % 10 == 0:
+            await asyncio.sleep(0)
+    # Newest item, so neither dropping the oldest nor coalescing can lose it
+    await bus.publish(conversation_id, {"type": END, "conversation": conversation_id})
+
+
+async def run(policy: OverflowPolicy):
+    bus = EventBus(maxsize=MAXSIZE, policy=policy)
+    conversations = [uuid.uuid4().hex for _ in range(SESSIONS)]
+    received: dict[str, list] = {c: [] for c in conversations}
+
+    sessions = [asyncio.create_task(session(bus, c, received)) for c in conversations]
+    await asyncio.sleep(0)  # let every session subscribe
+    start = time.perf_counter()
+    await asyncio.gather(*(publisher(bus, c) for c in conversations))
+    stats = await asyncio.gather(*sessions)
+    elapsed = time.perf_counter() - start
+
+    misrouted = sum(1 for c, items in received.items() for item in items if item["conversation"] != c)
+    # Coalescing moves a newer update into an older slot, so order is only
+    # guaranteed between items about the same task and of the same type.
+    out_of_order = 0
+    for items in received.values():
+        last_seq: dict[tuple, int] = {}
+        for item in items:
+            key = (item["type"], item["task_id"])
+            out_of_order += item["seq"] <= last_seq.get(key, -1)
+            last_seq[key] = item["seq"]
+    published = SESSIONS * ITEMS_PER_SESSION
+    delivered = sum(len(items) for items in received.values())
+    dropped = sum(s["dropped"] for s in stats)
+    coalesced = sum(s["coalesced"] for s in stats)
+    # Every delivered item (and each session's end marker) counts towards lag.
+    mean_lag = sum(s["lag_seconds_total"] for s in stats) / sum(s["delivered"] for s in stats)
+    max_lag = max(s["lag_seconds_max"] for s in stats)
+    print(f"[{policy.value}] elapsed={elapsed:.2f}s ({published / elapsed:,.0f} items/s) "
+          f"misrouted={misrouted} out_of_order={out_of_order}")
+    print(f"  delivered={delivered}/{published} dropped={dropped} coalesced={coalesced} "
+          f"lag mean={mean_lag * 1e3:.2f}ms max={max_lag * 1e3:.2f}ms")
+
+
+async def main():
+    print(f"sessions={SESSIONS} items/session={ITEMS_PER_SESSION} maxsize={MAXSIZE}")
+    for policy in OverflowPolicy:
+        await run(policy)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Per-update cost of the host state store as the number of known tasks grows.
+
+Simulates the lookups `ADKHostManager.task_callback` performs for every
+streaming update (find task, update it, resolve its conversation) and compares
+the indexed `HostStateStore` with the previous list-scan approach.
+
+    uv run -m benchmarks.bench_host_state
+"""
+import time
+import uuid
+
+from a2a_types import Conversation, Task, TaskState, TaskStatus
+from server.host_agent.state_store import HostStateStore
+
+SIZES = [1_000, 10_000, 100_000]
+UPDATES = 2_000
+LINEAR_UPDATES = 200
+CONVERSATIONS = 100
+
+
+def make_task(conversation_id: str) -> Task:
+    return Task(
+        id=uuid.uuid4().hex,
+        sessionId=conversation_id,
+        status=TaskStatus(state=TaskState.SUBMITTED),
+        metadata={"conversation_id": conversation_id},
+    )
+
+
+def bench_indexed(tasks: list[Task], conversations: list[Conversation]) -> float:
+    store = HostStateStore()
+    for c in conversations:
+        store.add_conversation(c)
+    for t in tasks:
+        store.add_task(t)
+    probes = tasks[-UPDATES:]
+    start = time.perf_counter()
+    for t in probes:
+        current = store.get_task(t.id)
+        current.status = TaskStatus(state=TaskState.WORKING)
+        store.update_task(current)
+        store.get_conversation(current.sessionId)
+    return (time.perf_counter() - start) / len(probes)
+
+
+def bench_linear(tasks: list[Task], conversations: list[Conversation]) -> float:
+    probes = tasks[-LINEAR_UPDATES:]
+    start = time.perf_counter()
+    for t in probes:
+        current = next(filter(lambda x: x.id == t.id, tasks), None)
+        current.status = TaskStatus(state=TaskState.WORKING)
+        for i, x in enumerate(tasks):
+            if x.id == current.id:
+                tasks[i] = current
+                break
+        next(filter(lambda c: c.conversation_id == current.sessionId, conversations), None)
+    return (time.perf_counter() - start) / len(probes)
+
+
+def main():
+    conversations = [
+        Conversation(conversation_id=uuid.uuid4().hex, is_active=True)
+        for _ in range(CONVERSATIONS)
+    ]
+    print(f"{'tasks':>8} {'indexed (us/update)':>20} {'linear (us/update)':>20}")
+    for size in SIZES:
+        tasks = [make_task(conversations[i % CONVERSATIONS].conversation_id) for i in range(size)]
+        indexed = bench_indexed(tasks, conversations)
+        linear = bench_linear(tasks, conversations)
+        print(f"{size:>8} {indexed * 1e6:>20.2f} {linear * 1e6:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""tasks/send throughput as a function of the invoke pool size.
+
+Each request runs a blocking call that stands in for `agent.invoke` (a
+synchronous ADK run waiting on the LLM). Alongside, a probe measures how
+long the event loop takes to answer a no-op, standing in for tasks/get
+polls and agent-card fetches that must stay responsive.
+
+    uv run -m benchmarks.bench_invoke_pool
+"""
+import asyncio
+import time
+
+from server.invoke_pool import InvokePool
+
+REQUESTS = 64
+CALL_SECONDS = 0.05
+POOL_SIZES = [1, 2, 4, 8, 16]
+
+
+def blocking_invoke(query: str) -> str:
+    time.sleep(CALL_SECONDS)
+    return query
+
+
+async def probe_latency(stop: asyncio.Event, samples: list[float]):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0)
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(0.005)
+
+
+async def run(pool_size: int) -> tuple[float, float]:
+    pool = InvokePool(max_workers=pool_size, max_queue=REQUESTS)
+    stop = asyncio.Event()
+    samples: list[float] = []
+    probe = asyncio.create_task(probe_latency(stop, samples))
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.run(blocking_invoke, str(i)) for i in range(REQUESTS)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe
+    pool.shutdown()
+    return REQUESTS / elapsed, max(samples) if samples else 0.0
+
+
+async def main():
+    print(f"{'pool size':>10} {'req/s':>10} {'max loop stall (ms)':>20}")
+    for size in POOL_SIZES:
+        throughput, stall = await run(size)
+        print(f"{size:>10} {throughput:>10.1f} {stall * 1e3:>20.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,115 @@
+"""Offline accuracy and latency of the skill routing index.
+
+Builds agent cards from every `agents/**/agent_config.json` the same way the
+agents' `__main__` does, then routes each skill example leave-one-out (the
+example itself is removed from its card first) and reports top-1 accuracy,
+top-k recall and how often, and how correctly, the direct-dispatch
+threshold would fire, with the host's `min_score` applied the way
+`HostAgent.direct_route` does. Latency is measured on the real cards and on the same
+cards replicated to a few hundred agents.
+
+    uv run -m benchmarks.bench_routing
+"""
+import glob
+import json
+import os
+import time
+
+from a2a_types import AgentCapabilities, AgentCard, AgentSkill
+from server.host_agent.routing import RoutingIndex
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOP_K = 3
+THRESHOLDS = [0.0, 0.3, 0.5, 0.6, 0.8]
+FLEET_SIZES = [10, 100, 500]
+HOST_CONFIG = os.path.join(ROOT, "server", "host_agent", "agent_config.json")
+LATENCY_QUERIES = 2_000
+
+
+def load_cards() -> list[AgentCard]:
+    cards = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "agents", "**", "agent_config.json"), recursive=True)):
+        with open(path) as f:
+            config = json.load(f)
+        skill = config.get("skill", {})
+        card = config.get("agent_card", {})
+        cards.append(AgentCard(
+            name=card.get("name", "Default Agent"),
+            description=card.get("description", ""),
+            url="http://localhost/",
+            version=card.get("version", "1.0.0"),
+            capabilities=AgentCapabilities(**card.get("capabilities", {})),
+            skills=[AgentSkill(
+                id=skill.get("id", "default-skill-id"),
+                name=skill.get("name", "Default Skill Name"),
+                description=skill.get("description", ""),
+                examples=skill.get("examples", []),
+            )],
+        ))
+    return cards
+
+
+def load_min_score() -> float:
+    with open(HOST_CONFIG) as f:
+        return json.load(f)["host_agent"].get("routing", {}).get("min_score", 0.0)
+
+
+def without_example(cards: list[AgentCard], example: str) -> list[AgentCard]:
+    result = []
+    for card in cards:
+        skills = [
+            s.model_copy(update={"examples": [e for e in s.examples or [] if e != example]})
+            for s in card.skills
+        ]
+        result.append(card.model_copy(update={"skills": skills}))
+    return result
+
+
+def accuracy(cards: list[AgentCard], min_score: float):
+    cases = [(card.name, e) for card in cards for s in card.skills for e in s.examples or []]
+    top1 = recall = 0
+    fired = {t: 0 for t in THRESHOLDS}
+    fired_ok = {t: 0 for t in THRESHOLDS}
+    for expected, example in cases:
+        index = RoutingIndex()
+        index.build(without_example(cards, example))
+        matches = index.route(example, TOP_K, min_score)
+        names = [m.agent_name for m in matches]
+        top1 += bool(names) and names[0] == expected
+        recall += expected in names
+        for threshold in THRESHOLDS:
+            if (matches and matches[0].confidence >= threshold and
+                    matches[0].score >= min_score):
+                fired[threshold] += 1
+                fired_ok[threshold] += names[0] == expected
+    n = len(cases)
+    print(f"agents={len(cards)} examples={n} (leave-one-out) min_score={min_score}")
+    print(f"top-1 accuracy={top1 / n:.0%} top-{TOP_K} recall={recall / n:.0%}")
+    for threshold in THRESHOLDS:
+        precision = fired_ok[threshold] / fired[threshold] if fired[threshold] else 0.0
+        print(f"  direct_threshold={threshold:.1f}: dispatches {fired[threshold]}/{n}, "
+              f"correct {precision:.0%}")
+
+
+def latency(cards: list[AgentCard]):
+    queries = [e for card in cards for s in card.skills for e in s.examples or []]
+    for size in FLEET_SIZES:
+        fleet = [
+            card.model_copy(update={"name": f"{card.name} #{i}"})
+            for i in range(size // len(cards) + 1) for card in cards
+        ][:size]
+        start = time.perf_counter()
+        index = RoutingIndex()
+        index.build(fleet)
+        build = time.perf_counter() - start
+        start = time.perf_counter()
+        for i in range(LATENCY_QUERIES):
+            index.route(queries[i % len(queries)], TOP_K)
+        per_query = (time.perf_counter() - start) / LATENCY_QUERIES
+        print(f"agents={size:4d} build={build * 1e3:7.2f}ms route={per_query * 1e6:7.1f}us/query")
+
+
+if __name__ == "__main__":
+    cards = load_cards()
+    accuracy(cards, load_min_score())
+    latency(cards)
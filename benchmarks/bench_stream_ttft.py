@@ -0,0 +1,69 @@
+"""Time to first token reaching the host, with and without chunked artifacts.
+
+A fake LLM emits TOKENS tokens, one every TOKEN_INTERVAL seconds. Without
+chunking the answer is one artifact sent after the last token (the previous
+behaviour); with chunking, ArtifactChunker sends append chunks as the
+coalescing limits allow. The receiving side reassembles them the way
+ADKHostManager.process_artifact_event does and checks the text is intact.
+
+    uv run -m benchmarks.bench_stream_ttft
+"""
+import asyncio
+import time
+
+from a2a_types import Artifact, TextPart
+from server.artifact_chunker import ArtifactChunker, ArtifactChunking
+
+TOKENS = 200
+TOKEN_INTERVAL = 0.01
+
+
+async def llm_tokens():
+    for i in range(TOKENS):
+        await asyncio.sleep(TOKEN_INTERVAL)
+        yield f"tok{i} "
+
+
+async def whole_artifact():
+    text = "".join([t async for t in llm_tokens()])
+    yield Artifact(name="agent", parts=[TextPart(text=text)])
+
+
+async def chunked_artifact(chunking: ArtifactChunking):
+    chunker = ArtifactChunker("agent", chunking)
+    async for token in llm_tokens():
+        chunk = chunker.feed(token)
+        if chunk:
+            yield chunk
+    yield chunker.finish()
+
+
+async def measure(stream) -> tuple[float, float, int, str]:
+    start = time.perf_counter()
+    first = None
+    events = 0
+    text = ""
+    async for artifact in stream:
+        if first is None:
+            first = time.perf_counter() - start
+        events += 1
+        text += artifact.parts[0].text
+    return first, time.perf_counter() - start, events, text
+
+
+async def main():
+    expected = "".join(f"tok{i} " for i in range(TOKENS))
+    cases = [
+        ("whole artifact", whole_artifact()),
+        ("every token", chunked_artifact(ArtifactChunking(max_bytes=0, max_delay=0))),
+        ("256 B / 50 ms", chunked_artifact(ArtifactChunking())),
+        ("1 KiB / 250 ms", chunked_artifact(ArtifactChunking(max_bytes=1024, max_delay=0.25))),
+    ]
+    print(f"{'mode':>16} {'TTFT (ms)':>10} {'total (ms)':>11} {'events':>7} {'intact':>7}")
+    for name, stream in cases:
+        first, total, events, text = await measure(stream)
+        print(f"{name:>16} {first * 1e3:>10.1f} {total * 1e3:>11.1f} {events:>7} {str(text == expected):>7}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,74 @@
+"""Throughput of InMemoryTaskManager backends under concurrent tasks/send load.
+
+Each simulated tasks/send does what AgentTaskManager does around the agent
+call: upsert the task, mark it working, then complete it with an artifact.
+
+    uv run -m benchmarks.bench_task_store
+"""
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+from a2a_types import (
+    Artifact, Message, SendTaskRequest, SendTaskResponse, TaskSendParams,
+    TaskState, TaskStatus, TextPart,
+)
+from server.task_manager import InMemoryTaskManager
+from server.task_store import InMemoryTaskStore, SQLiteTaskStore
+
+REQUESTS = 20_000
+CONCURRENCY = [1, 16, 128]
+
+
+class EchoTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
+        params = request.params
+        await self.upsert_task(params)
+        await self._update_store(params.id, TaskStatus(state=TaskState.WORKING), None)
+        parts = [TextPart(text="ok " * 64)]
+        task = await self._update_store(
+            params.id,
+            TaskStatus(state=TaskState.COMPLETED, message=Message(role="agent", parts=parts)),
+            [Artifact(parts=parts)],
+        )
+        return SendTaskResponse(id=request.id, result=task)
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def make_request() -> SendTaskRequest:
+    return SendTaskRequest(params=TaskSendParams(
+        id=uuid.uuid4().hex,
+        message=Message(role="user", parts=[TextPart(text="find a hotel in Tokyo")]),
+    ))
+
+
+async def run(manager: InMemoryTaskManager, concurrency: int) -> float:
+    requests = [make_request() for _ in range(REQUESTS)]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(request):
+        async with semaphore:
+            await manager.on_send_task(request)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(r) for r in requests))
+    await manager.close()
+    return REQUESTS / (time.perf_counter() - start)
+
+
+async def main():
+    print(f"{'concurrency':>12} {'memory (req/s)':>16} {'sqlite (req/s)':>16}")
+    for concurrency in CONCURRENCY:
+        memory = await run(EchoTaskManager(store=InMemoryTaskStore()), concurrency)
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteTaskStore(os.path.join(tmp, "tasks.db"))
+            sqlite = await run(EchoTaskManager(store=store), concurrency)
+        print(f"{concurrency:>12} {memory:>16.0f} {sqlite:>16.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
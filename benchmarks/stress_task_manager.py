@@ -0,0 +1,98 @@
+"""Stress InMemoryTaskManager with concurrent streaming writers and pollers.
+
+Every streaming task publishes UPDATES status updates, each carrying its
+sequence number and one new artifact, like `_stream_generator` does. Pollers
+read tasks continuously and check that every snapshot is consistent: the
+number of artifacts always equals the sequence number in the status. At the
+end every task must be complete with all of its artifacts. Lock wait time
+comes from the manager's own `lock_stats`.
+
+    uv run -m benchmarks.stress_task_manager
+"""
+import asyncio
+import random
+import time
+import uuid
+
+from a2a_types import (
+    Artifact, GetTaskRequest, Message, TaskQueryParams, TaskSendParams,
+    TaskState, TaskStatus, TextPart,
+)
+from server.task_manager import InMemoryTaskManager
+from server.task_retention import TaskRetentionPolicy
+
+STREAMS = 500
+UPDATES = 20
+POLLERS = 200
+POLLS_PER_POLLER = 200
+
+
+class StressTaskManager(InMemoryTaskManager):
+    async def on_send_task(self, request):
+        raise NotImplementedError
+
+    async def on_send_task_subscribe(self, request):
+        raise NotImplementedError
+
+
+def status(seq: int, state: TaskState) -> TaskStatus:
+    return TaskStatus(state=state, message=Message(role="agent", parts=[TextPart(text=str(seq))]))
+
+
+async def stream(manager: InMemoryTaskManager, task_id: str):
+    await manager.upsert_task(TaskSendParams(
+        id=task_id, message=Message(role="user", parts=[TextPart(text="plan a trip")]),
+    ))
+    for seq in range(1, UPDATES + 1):
+        state = TaskState.COMPLETED if seq == UPDATES else TaskState.WORKING
+        artifact = Artifact(parts=[TextPart(text=f"chunk {seq}")], index=seq)
+        await manager._update_store(task_id, status(seq, state), [artifact])
+        await asyncio.sleep(random.random() * 0.002)
+
+
+async def poll(manager: InMemoryTaskManager, task_ids: list[str], errors: list[str]):
+    for _ in range(POLLS_PER_POLLER):
+        task_id = random.choice(task_ids)
+        response = await manager.on_get_task(
+            GetTaskRequest(params=TaskQueryParams(id=task_id, historyLength=1))
+        )
+        task = response.result
+        if task is not None and task.status.message:
+            seq = int(task.status.message.parts[0].text)
+            if len(task.artifacts or []) != seq:
+                errors.append(f"{task_id}: status {seq} with {len(task.artifacts)} artifacts")
+        await asyncio.sleep(0)
+
+
+async def main():
+    manager = StressTaskManager(retention_policy=TaskRetentionPolicy(
+        max_tasks=None, terminal_ttl=None, input_required_ttl=None, max_history=None,
+        max_artifact_bytes=None,
+    ))
+    task_ids = [uuid.uuid4().hex for _ in range(STREAMS)]
+    errors: list[str] = []
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(stream(manager, t) for t in task_ids),
+        *(poll(manager, task_ids, errors) for _ in range(POLLERS)),
+    )
+    elapsed = time.perf_counter() - start
+
+    for task_id in task_ids:
+        task = manager.tasks[task_id]
+        if task.status.state != TaskState.COMPLETED or len(task.artifacts) != UPDATES:
+            errors.append(f"{task_id}: ended {task.status.state} with {len(task.artifacts)} artifacts")
+
+    stats = manager.lock_stats
+    mean_wait = stats["wait_seconds"] / max(stats["acquisitions"], 1)
+    print(f"streams={STREAMS} updates/stream={UPDATES} pollers={POLLERS} elapsed={elapsed:.2f}s")
+    print(f"lock acquisitions={stats['acquisitions']} "
+          f"mean wait={mean_wait * 1e6:.1f}us max wait={stats['max_wait_seconds'] * 1e3:.2f}ms")
+    print(f"consistency errors={len(errors)}")
+    for error in errors[:10]:
+        print("  " + error)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,20 +1,140 @@
+import asyncio
+import re
+import time
 import httpx
 from a2a_types import (
     AgentCard,
+    A2AClientHTTPError,
     A2AClientJSONError,
 )
 import json
 
+import logging
+logger = logging.getLogger(__name__)
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+class _CacheEntry:
+    __slots__ = ("card", "error", "etag", "last_modified", "expires_at")
+
+    def __init__(self, card=None, error=None, etag=None, last_modified=None, expires_at=0.0):
+        self.card: AgentCard | None = card
+        self.error: Exception | None = error
+        self.etag: str | None = etag
+        self.last_modified: str | None = last_modified
+        self.expires_at: float = expires_at
+
 class A2ACardResolver:
-    def __init__(self, base_url, agent_card_path="/.well-known/agent.json"):
-        self.base_url = base_url.rstrip("/")
+    """Fetches agent cards asynchronously over a shared connection pool.
+
+    Cards are cached for `ttl` seconds (or the server's Cache-Control
+    max-age). Once stale they are revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged card costs a 304. Failures are cached
+    for `negative_ttl` seconds so an unreachable URL is not retried on
+    every call, and concurrent lookups of the same URL share one request.
+    """
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        agent_card_path: str = "/.well-known/agent.json",
+        ttl: float = 300.0,
+        negative_ttl: float = 30.0,
+        timeout: float = 10.0,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
+        self.base_url = base_url.rstrip("/") if base_url else None
         self.agent_card_path = agent_card_path.lstrip("/")
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.timeout = timeout
+        self._client = httpx_client
+        self._owns_client = httpx_client is None
+        self._cache: dict[str, _CacheEntry] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def get_agent_card(self, base_url: str | None = None) -> AgentCard:
+        url = self._card_url(base_url or self.base_url)
+        entry = self._cache.get(url)
+        if entry and entry.expires_at > time.monotonic():
+            if entry.error is not None:
+                raise entry.error
+            return entry.card
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url, entry))
+            self._inflight[url] = future
+            future.add_done_callback(lambda _: self._inflight.pop(url, None))
+        return await asyncio.shield(future)
 
-    def get_agent_card(self) -> AgentCard:
-        with httpx.Client() as client:
-            response = client.get(self.base_url + "/" + self.agent_card_path)
+    async def resolve_many(self, base_urls: list[str]) -> dict[str, AgentCard | Exception]:
+        """Resolves several agents concurrently; failures are returned, not raised."""
+        results = await asyncio.gather(
+            *(self.get_agent_card(url) for url in base_urls), return_exceptions=True
+        )
+        return dict(zip(base_urls, results))
+
+    def invalidate(self, base_url: str | None = None):
+        if base_url is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._card_url(base_url), None)
+
+    async def close(self):
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    def _card_url(self, base_url: str | None) -> str:
+        if not base_url:
+            raise ValueError("Must provide a base_url")
+        return base_url.rstrip("/") + "/" + self.agent_card_path
+
+    async def _fetch(self, url: str, entry: _CacheEntry | None) -> AgentCard:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._owns_client = True
+        headers = {}
+        if entry and entry.card is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        try:
+            response = await self._client.get(url, headers=headers)
+            if response.status_code == 304 and entry and entry.card is not None:
+                entry.expires_at = time.monotonic() + self._max_age(response)
+                return entry.card
             response.raise_for_status()
             try:
-                return AgentCard(**response.json())
+                card = AgentCard(**response.json())
             except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
\ No newline at end of file
+                raise A2AClientJSONError(str(e)) from e
+        except httpx.HTTPStatusError as e:
+            self._remember_error(url, A2AClientHTTPError(e.response.status_code, str(e)))
+            raise self._cache[url].error from e
+        except httpx.RequestError as e:
+            self._remember_error(url, A2AClientHTTPError(503, f"{url} unreachable: {e}"))
+            raise self._cache[url].error from e
+        except Exception as e:
+            self._remember_error(url, e)
+            raise
+        self._cache[url] = _CacheEntry(
+            card=card,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
+            expires_at=time.monotonic() + self._max_age(response),
+        )
+        return card
+
+    def _remember_error(self, url: str, error: Exception):
+        logger.warning(f"Failed to resolve agent card {url}: {error}")
+        self._cache[url] = _CacheEntry(
+            error=error, expires_at=time.monotonic() + self.negative_ttl
+        )
+
+    def _max_age(self, response: httpx.Response) -> float:
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        if match:
+            return min(float(match.group(1)), self.ttl)
+        return self.ttl
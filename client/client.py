@@ -1,5 +1,6 @@
 import httpx
 import json
+import time
 from typing import Any, AsyncIterable
 from a2a_types import (
     AgentCard, SendTaskRequest, SendTaskResponse,
@@ -8,28 +9,86 @@ from a2a_types import (
     JSONRPCRequest, JSONRPCResponse, SendTaskStreamingResponse,
     SendTaskStreamingRequest
 )
-from httpx_sse import connect_sse, SSEError
+from httpx_sse import aconnect_sse, SSEError
+from server.metrics import REGISTRY
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Each client talks to a single agent, so these limits are per remote host.
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+# Streams may stay silent while the remote LLM works, so reads never time out.
+DEFAULT_STREAM_TIMEOUT = httpx.Timeout(10.0, read=None)
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "a2a_client_request_seconds",
+    "Time until a JSON-RPC response (to the last event for streams)", ["method", "outcome"])
+FIRST_EVENT_SECONDS = REGISTRY.histogram(
+    "a2a_client_first_event_seconds", "Time from sending a task to its first SSE event")
+SSE_EVENTS = REGISTRY.counter("a2a_client_sse_events_total", "SSE events received")
+
 class A2AClient:
-    def __init__(self, agent_card: AgentCard = None, url: str = None):
+    def __init__(
+        self,
+        agent_card: AgentCard = None,
+        url: str = None,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        stream_timeout: httpx.Timeout = DEFAULT_STREAM_TIMEOUT,
+        limits: httpx.Limits = DEFAULT_LIMITS,
+        httpx_client: httpx.AsyncClient | None = None,
+    ):
         if agent_card:
             self.url = agent_card.url
         elif url:
             self.url = url
         else:
             raise ValueError("Must provide either agent_card or url")
-    
+        self.timeout = timeout
+        self.stream_timeout = stream_timeout
+        self.limits = limits
+        # A caller-provided client is shared and therefore never closed here.
+        self._client = httpx_client
+        self._owns_client = httpx_client is None
+
+    @property
+    def is_open(self) -> bool:
+        return self._client is not None and not self._client.is_closed
+
+    async def open(self) -> "A2AClient":
+        """Creates the underlying connection pool if it is not open yet."""
+        if not self.is_open:
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=self.limits)
+            self._owns_client = True
+        return self
+
+    async def close(self):
+        """Closes the connection pool. The client can be reopened later."""
+        if self._client is not None and self._owns_client:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> "A2AClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        if not self.is_open:
+            await self.open()
+        return self._client
+
     async def send_task(self, payload: dict[str, Any]) -> SendTaskResponse:
         request = SendTaskRequest(params=payload)
         return SendTaskResponse(**await self._send_request(request))
-    
+
     async def send_task_streaming(
         self, payload: dict[str, Any]
         ) -> AsyncIterable[SendTaskStreamingResponse]:
-        
+
         """
         Send a task and receive streaming updates using SSE.
         Args:
@@ -38,41 +97,78 @@ class A2AClient:
             An async iterable of SendTaskStreamingResponse objects
         """
         request = SendTaskStreamingRequest(params=payload)
-        
-        with httpx.Client(timeout=None) as client:
-                with connect_sse(
-                    client, "POST", self.url, json=request.model_dump()
-                ) as event_source:
-                    try:
-                        for sse in event_source.iter_sse():
-                            yield SendTaskStreamingResponse(**json.loads(sse.data))
-                    except SSEError as e:
-                        # Fallback for non-streaming responses
-                        if "application/json" in str(e):
-                            logger.warning("Server returned JSON instead of SSE. Falling back to non-streaming.")
-                            response = await self.send_task(payload)
-                            yield SendTaskStreamingResponse(
-                                id=response.id,
-                                result={
-                                    "is_task_complete": True,
-                                    "require_user_input": False,
-                                    "content": response.result.status.message.parts[0].text if response.result and response.result.status and response.result.status.message and response.result.status.message.parts else "",
-                                }
-                            )
-    
-    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
-        async with httpx.AsyncClient() as client:
+        client = await self._get_client()
+        started = time.perf_counter()
+        events = 0
+        outcome = "error"
+
+        async with aconnect_sse(
+            client, "POST", self.url,
+            json=request.model_dump(), timeout=self.stream_timeout
+        ) as event_source:
             try:
-                response = await client.post(
-                    self.url, json=request.model_dump(), timeout=60
-                )
-                response.raise_for_status()
-                return response.json()
+                event_source.response.raise_for_status()
+                async for sse in event_source.aiter_sse():
+                    if not events:
+                        FIRST_EVENT_SECONDS.observe(time.perf_counter() - started)
+                    events += 1
+                    yield SendTaskStreamingResponse(**json.loads(sse.data))
+                outcome = "ok"
+            except SSEError as e:
+                # Fallback for non-streaming responses
+                if "application/json" in str(e):
+                    logger.warning("Server returned JSON instead of SSE. Falling back to non-streaming.")
+                    response = await self.send_task(payload)
+                    yield SendTaskStreamingResponse(
+                        id=response.id,
+                        result={
+                            "is_task_complete": True,
+                            "require_user_input": False,
+                            "content": response.result.status.message.parts[0].text if response.result and response.result.status and response.result.status.message and response.result.status.message.parts else "",
+                        }
+                    )
             except httpx.HTTPStatusError as e:
                 raise A2AClientHTTPError(e.response.status_code, str(e)) from e
-            except json.JSONDecodeError as e:
-                raise A2AClientJSONError(str(e)) from e
-            
+            except GeneratorExit:
+                outcome = "ok"  # the caller stopped reading after the final event
+                raise
+            finally:
+                SSE_EVENTS.inc(events)
+                REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, outcome)
+
+    async def _send_request(self, request: JSONRPCRequest) -> dict[str, Any]:
+        client = await self._get_client()
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = await client.post(self.url, json=request.model_dump())
+            response.raise_for_status()
+            result = response.json()
+            outcome = "ok"
+            return result
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+        finally:
+            REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, outcome)
+
+    async def get_agent_card(
+        self, path: str = "/.well-known/agent.json", timeout: float | None = None
+    ) -> AgentCard:
+        """Fetches this agent's card over the pooled connection (e.g. as a health check)."""
+        client = await self._get_client()
+        try:
+            response = await client.get(
+                self.url.rstrip("/") + path, timeout=timeout or self.timeout
+            )
+            response.raise_for_status()
+            return AgentCard(**response.json())
+        except httpx.HTTPStatusError as e:
+            raise A2AClientHTTPError(e.response.status_code, str(e)) from e
+        except json.JSONDecodeError as e:
+            raise A2AClientJSONError(str(e)) from e
+
     async def get_task(self, payload: dict[str, Any]) -> GetTaskResponse:
         request = GetTaskRequest(params=payload)
         return GetTaskResponse(**await self._send_request(request))
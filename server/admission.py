@@ -0,0 +1,103 @@
+from typing import Any, AsyncIterable, AsyncIterator
+from pydantic import BaseModel
+from server.slot_queue import SlotQueue, SlotQueueFull, SlotWaitTimeout
+
+class AdmissionPolicy(BaseModel):
+    """Limits on the tasks an agent server runs at once.
+
+    `max_in_flight=None` disables admission control. A request over the
+    limit waits in a queue of at most `max_pending` requests for at most
+    `pending_timeout` seconds, then is rejected with HTTP 429 and a
+    `Retry-After` of `retry_after` seconds.
+    """
+    max_in_flight: int | None = 16
+    max_pending: int = 32
+    pending_timeout: float = 10.0
+    retry_after: int = 2
+
+class AdmissionRejectedError(Exception):
+    """Raised when a task cannot be admitted; the server answers 429."""
+    pass
+
+class AdmissionControl:
+    """Admits tasks/send and tasks/sendSubscribe up to the policy limits.
+
+    A slot is held for the whole run: until the response is ready for
+    tasks/send, until the last event is sent for tasks/sendSubscribe.
+    Freed slots go straight to the longest-waiting request.
+    """
+
+    def __init__(self, policy: AdmissionPolicy | None = None):
+        self.policy = policy or AdmissionPolicy()
+        self._slots = SlotQueue(
+            self.policy.max_in_flight, self.policy.max_pending, self.policy.pending_timeout
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.policy.max_in_flight is not None
+
+    @property
+    def in_flight(self) -> int:
+        return self._slots.active
+
+    @property
+    def pending(self) -> int:
+        return self._slots.waiting
+
+    async def acquire(self):
+        try:
+            await self._slots.acquire()
+        except SlotQueueFull as e:
+            raise AdmissionRejectedError(
+                f"{self.in_flight} tasks running and {self.pending} waiting"
+            ) from e
+        except SlotWaitTimeout as e:
+            raise AdmissionRejectedError(
+                f"No task slot freed up within {self.policy.pending_timeout}s"
+            ) from e
+
+    def release(self):
+        self._slots.release()
+
+    def metrics(self) -> dict:
+        stats = self._slots.stats
+        return {
+            "admitted": stats["admitted"],
+            "queued": stats["queued"],
+            "rejected_full": stats["rejected"],
+            "rejected_timeout": stats["timed_out"],
+            "max_in_flight_seen": stats["max_active"],
+            "wait_seconds": stats["wait_seconds"],
+            "in_flight": self.in_flight,
+            "pending": self.pending,
+            "max_in_flight": self.policy.max_in_flight,
+            "max_pending": self.policy.max_pending,
+        }
+
+class AdmittedStream:
+    """Holds an admission slot until the stream it wraps ends.
+
+    The slot is also given back if the stream is dropped without ever
+    being iterated, e.g. when the client left before the response started.
+    """
+
+    def __init__(self, stream: AsyncIterable[Any], admission: AdmissionControl):
+        self._stream = stream
+        self._admission = admission
+        self._released = False
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        try:
+            async for item in self._stream:
+                yield item
+        finally:
+            self.release()
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._admission.release()
+
+    def __del__(self):
+        self.release()
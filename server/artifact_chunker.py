@@ -0,0 +1,74 @@
+import time
+from pydantic import BaseModel
+from a2a_types import Artifact, TextPart
+
+class ArtifactChunking(BaseModel):
+    """When to flush streamed text as an artifact chunk.
+
+    A chunk is sent once `max_bytes` of text are buffered or `max_delay`
+    seconds have passed since the previous chunk, whichever comes first.
+    Setting both to 0 sends every token as it arrives.
+    """
+    max_bytes: int = 256
+    max_delay: float = 0.05
+
+class ArtifactChunker:
+    """Turns incremental LLM text into A2A artifact append chunks.
+
+    The first chunk has `append=False, lastChunk=False`, later ones
+    `append=True`, and `finish` sends the remainder with `lastChunk=True`,
+    which is how receivers know the artifact is complete. `artifact` is
+    what they end up with, for storing the same artifact in the task.
+    """
+
+    def __init__(self, name: str, chunking: ArtifactChunking | None = None, index: int = 0):
+        self.name = name
+        self.index = index
+        self.chunking = chunking or ArtifactChunking()
+        self._buffer: list[str] = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        self._sent: list[str] = []
+        self.started = False
+
+    def feed(self, text: str) -> Artifact | None:
+        """Buffers `text`; returns a chunk when the coalescing limits are hit."""
+        if not text:
+            return None
+        self._buffer.append(text)
+        self._buffered_bytes += len(text.encode())
+        if (self._buffered_bytes >= self.chunking.max_bytes or
+                time.monotonic() - self._last_flush >= self.chunking.max_delay):
+            return self._flush(last_chunk=False)
+        return None
+
+    def finish(self) -> Artifact | None:
+        """Closes the artifact. Returns None if nothing was ever streamed."""
+        if not self.started and not self._buffer:
+            return None
+        return self._flush(last_chunk=True)
+
+    def artifact(self) -> Artifact:
+        """The whole artifact as reassembled from the chunks sent so far."""
+        return Artifact(
+            name=self.name,
+            parts=[TextPart(text="".join(self._sent))],
+            index=self.index,
+            append=False,
+        )
+
+    def _flush(self, last_chunk: bool) -> Artifact:
+        text = "".join(self._buffer)
+        self._sent.append(text)
+        artifact = Artifact(
+            name=self.name,
+            parts=[TextPart(text=text)],
+            index=self.index,
+            append=self.started,
+            lastChunk=last_chunk,
+        )
+        self.started = True
+        self._buffer = []
+        self._buffered_bytes = 0
+        self._last_flush = time.monotonic()
+        return artifact
@@ -27,14 +27,15 @@ def main(agent):
     print(f"Using API key: {api_key}")
     
     host_manager = ADKHostManager(api_key)
-    for agent_url in agent:
-        try:
-            host_manager.register_agent(agent_url)
-        except Exception as e:
-            print(f"[Agent Register Error] {agent_url}: {e}")
-            return  
     # Test scenario
     async def test_scenario():
+        for agent_url in agent:
+            try:
+                await host_manager.register_agent(agent_url)
+            except Exception as e:
+                print(f"[Agent Register Error] {agent_url}: {e}")
+                return
+
         # Create conversation
         conversation = host_manager.create_conversation()
         print(f"Created conversation: {conversation.conversation_id}")
@@ -54,7 +55,7 @@ def main(agent):
 
             # Print last agent message(s)
             print("Messages so far:")
-            for m in host_manager._messages:
+            for m in host_manager.messages:
                 print(f"- {m.parts[0].text if m.parts else '[no parts]'} (role: {m.role})")
     
     # Run the test scenario
@@ -1,7 +1,9 @@
+import asyncio
 import datetime
 import json
 import os
-from typing import Tuple, Optional
+import time
+from typing import AsyncIterator, Callable, Tuple, Optional
 import uuid
 from a2a_types import (
     Message,
@@ -24,15 +26,40 @@ from .remote_agent_connection import (
     TaskCallbackArg,
 )
 from .utils import get_agent_card
+from server.metrics import REGISTRY
 from .application_manager import ApplicationManager
+from .agent_registry import AgentRegistry
+from .state_store import HostStateStore
+from .host_events import (
+    HostEvent,
+    HostFinalMessage,
+    HostTextDelta,
+    HostToolCall,
+    RemoteTaskUpdate,
+)
 from google.adk import Runner
 from google.adk.sessions.in_memory_session_service import InMemorySessionService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events.event import Event as ADKEvent
 from google.adk.events.event_actions import EventActions as ADKEventActions
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.genai import types
 import base64
+import logging
+logger = logging.getLogger(__name__)
+
+
+# How a reply to an agent's INPUT_REQUIRED question is routed:
+#   direct     - forward it to the agent and return the agent's answer as is
+#   synthesize - forward it, then let the host LLM phrase the answer
+#   off        - always run a full host LLM turn
+FOLLOW_UP_ROUTING_MODES = ('direct', 'synthesize', 'off')
+
+TURN_SECONDS = REGISTRY.histogram(
+    "host_turn_seconds", "Time of a whole host turn", ["outcome"])
+TURN_FIRST_EVENT_SECONDS = REGISTRY.histogram(
+    "host_turn_first_event_seconds", "Time until a host turn emitted its first event")
 
 
 class ADKHostManager(ApplicationManager):
@@ -41,32 +68,38 @@ class ADKHostManager(ApplicationManager):
   This implements the interface of the ApplicationManager to plug into
   the AgentServer.
   """
-  _conversations: list[Conversation]
-  _messages: list[Message]
-  _tasks: list[Task]
+  _store: HostStateStore
   _events: dict[str, Event]
-  _pending_message_ids: list[str]
-  _agents: list[AgentCard]
+  _pending_message_ids: dict[str, None]
+  _registry: AgentRegistry
   _task_map: dict[str, str]
 
   def __init__(self, api_key: str = ""):
-    self._conversations = []
-    self._messages = []
-    self._tasks = []
+    self._store = HostStateStore()
     self._events = {}
-    self._pending_message_ids = []
-    self._agents = []
+    self._pending_message_ids = {}
+    self._turn_streams: dict[str | None, asyncio.Queue] = {}
     self._artifact_chunks = {}
     self._session_service = InMemorySessionService()
     self._artifact_service = InMemoryArtifactService()
     self._memory_service = InMemoryMemoryService()
     self._host_agent = HostAgent([], self.task_callback)
+    self._registry = AgentRegistry(self._host_agent)
     self.user_id = "adk_host_manager"
     self.app_name = "A2A"
     self.api_key = api_key
     self._initialize_host()
     self._task_map = {}
     self._next_id = {} 
+    self._task_agents: dict[str, str] = {}
+    # conversation -> tasks waiting for the user's answer, oldest first
+    self._input_required: dict[str | None, dict[str, None]] = {}
+    self.follow_up_routing = self._host_agent.host_agent_config.get(
+        'follow_up_routing', 'direct')
+    if self.follow_up_routing not in FOLLOW_UP_ROUTING_MODES:
+      raise ValueError(
+          f"follow_up_routing must be one of {FOLLOW_UP_ROUTING_MODES}, "
+          f"got {self.follow_up_routing!r}")
 
   def _initialize_host(self):
     agent = self._host_agent.create_agent()
@@ -84,7 +117,7 @@ class ADKHostManager(ApplicationManager):
         user_id=self.user_id)
     conversation_id = session.id
     c = Conversation(conversation_id=conversation_id, is_active=True)
-    self._conversations.append(c)
+    self._store.add_conversation(c)
     return c
 
   def sanitize_message(self, message: Message) -> Message:
@@ -103,10 +136,53 @@ class ADKHostManager(ApplicationManager):
     return message
 
   async def process_message(self, message: Message):
-    self._messages.append(message)
+    """Runs a turn to completion; see `stream_message` for the events."""
+    async for _ in self.stream_message(message):
+      pass
+
+  async def stream_message(self, message: Message) -> AsyncIterator[HostEvent]:
+    """Runs a turn, yielding events as soon as they happen.
+
+    Yields partial host text, the host's tool calls and updates of remote
+    tasks started during the turn, and finally a `HostFinalMessage`. Closing
+    the generator early cancels the turn.
+    """
+    conversation_id = (
+        message.metadata['conversation_id']
+        if message.metadata and 'conversation_id' in message.metadata
+        else None
+    )
+    queue: asyncio.Queue = asyncio.Queue()
+    self._turn_streams[conversation_id] = queue
+    started = time.perf_counter()
+    first_event = True
+    outcome = "error"
+    turn = asyncio.create_task(self._run_turn(message, queue.put_nowait))
+    turn.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+      while (event := await queue.get()) is not None:
+        if first_event:
+          first_event = False
+          TURN_FIRST_EVENT_SECONDS.observe(time.perf_counter() - started)
+        yield event
+      turn.result()
+      outcome = "ok"
+    except (asyncio.CancelledError, GeneratorExit):
+      outcome = "cancelled"
+      raise
+    finally:
+      TURN_SECONDS.observe(time.perf_counter() - started, outcome)
+      if self._turn_streams.get(conversation_id) is queue:
+        del self._turn_streams[conversation_id]
+      if not turn.done():
+        turn.cancel()
+        await asyncio.gather(turn, return_exceptions=True)
+
+  async def _run_turn(self, message: Message, emit: Callable[[HostEvent], None]):
+    self._store.add_message(message)
     message_id = get_message_id(message)
     if message_id:
-      self._pending_message_ids.append(message_id)
+      self._pending_message_ids[message_id] = None
     conversation_id = (
         message.metadata['conversation_id']
         if 'conversation_id' in message.metadata
@@ -140,12 +216,29 @@ class ADKHostManager(ApplicationManager):
     
     if (last_message_id and
         last_message_id in self._task_map and
-        task_still_open(next(
-            filter(
-                lambda x: x.id == self._task_map[last_message_id],
-                self._tasks),
-            None))):
+        task_still_open(self._store.get_task(self._task_map[last_message_id]))):
           state_update['task_id'] = self._task_map[last_message_id]
+
+    # A reply to an agent's question can go straight back to that agent.
+    follow_up = self._follow_up_target(conversation_id, state_update.get('task_id'))
+    direct = False
+    question = None
+    if follow_up:
+      waiting = self._store.get_task(follow_up[0])
+      question = parts_text(waiting.status.message.parts) if waiting.status.message else None
+    if follow_up:
+      state_update['task_id'] = follow_up[0]
+      state_update['candidate_agents'] = None
+      direct = self.follow_up_routing == 'direct'
+    else:
+      # Otherwise only the best matching agents are shown to the host LLM,
+      # and a clear winner gets the message without an LLM call.
+      matches = self._host_agent.route(message_text(message))
+      state_update['candidate_agents'] = [m.agent_name for m in matches] or None
+      agent_name = self._host_agent.direct_route(matches)
+      if agent_name:
+        follow_up = (str(uuid.uuid4()), agent_name)
+        direct = True
   
     # Need to upsert session state now, only way is to append an event.
     self._session_service.append_event(session, ADKEvent(
@@ -154,32 +247,47 @@ class ADKHostManager(ApplicationManager):
         invocation_id=ADKEvent.new_id(),
         actions=ADKEventActions(state_delta=state_update),
     ))
-    
-    # Process events and get the final event
-    events = []
-    # message from user
-    async for event in self._host_runner.run_async(
-        user_id=self.user_id,
-        session_id=conversation_id,
-        new_message=self.adk_content_from_message(message)
-    ):
-      self.add_event(Event(
-          id=event.id,
-          actor=event.author,
-          content=self.adk_content_to_message(event.content, conversation_id),
-          timestamp=event.timestamp,
-      ))
-      events.append(event)
-    # event from agent
-    
-    # Get the final event if any events were processed
-    if events:
-      final_event = events[-1]
-    
+
     response: Message | None = None
+    new_message = self.adk_content_from_message(message)
+    try:
+      follow_up_task = None
+      rejected = None
+      if follow_up:
+        follow_up_task = await self._forward_to_agent(message, *follow_up, state_update)
+      if follow_up_task and direct:
+        rejected = await self._validate_direct(
+            message, follow_up[1], follow_up_task, state_update, question)
+      if follow_up_task and direct and rejected is None:
+        # The agent's answer is the turn's answer; no host LLM call at all.
+        response = Message(role='model', parts=follow_up_parts(follow_up_task))
+        self._record_follow_up(session, new_message, response, follow_up[1], follow_up_task)
+      else:
+        if follow_up_task:
+          reply = json.dumps([p.model_dump(exclude_none=True) for p in follow_up_parts(follow_up_task)])
+          if rejected is not None:
+            # The validator turned the direct answer down; the host LLM takes over.
+            note = (f"[Validation] {rejected}\n"
+                    "The validator rejected this reply. Answer the user with a better "
+                    "suited agent, or explain what is missing.")
+          else:
+            # Only let the host LLM phrase the answer the agent already gave.
+            note = "Relay this reply to the user. Do not send the message to an agent again."
+          new_message.parts.append(types.Part.from_text(text=(
+              f"[{follow_up[1]} already received the message above and replied]\n"
+              f"{reply}\n{note}"
+          )))
+        final_event = await self._run_host(conversation_id, new_message, emit)
+    except asyncio.CancelledError:
+      # The turn was abandoned; the message is no longer pending.
+      self._pending_message_ids.pop(message_id, None)
+      raise
+    # event from agent
+
     if final_event:
       final_event.content.role = 'model'
       response = self.adk_content_to_message(final_event.content, conversation_id)
+    if response:
       last_message_id = get_message_id(message)
       new_message_id = ""
       if last_message_id and last_message_id in self._next_id:
@@ -192,22 +300,168 @@ class ADKHostManager(ApplicationManager):
           **{'last_message_id': last_message_id,
             'message_id': new_message_id}
       }
-      self._messages.append(response)
+      self._store.add_message(response)
 
     if conversation:
       conversation.messages.append(response)
     # Only remove message_id if it exists in the list
-    if message_id and message_id in self._pending_message_ids:
-      self._pending_message_ids.remove(message_id)
+    self._pending_message_ids.pop(message_id, None)
+    usage = None
+    if final_event:
+      usage = self._host_agent.prompt_stats.pop_turn(final_event.invocation_id)
+    emit(HostFinalMessage(conversation_id=conversation_id, message=response, usage=usage))
+
+  async def _run_host(
+      self,
+      conversation_id: str,
+      new_message: types.Content,
+      emit: Callable[[HostEvent], None]) -> ADKEvent | None:
+    """Runs the host LLM on `new_message` and returns its final event."""
+    final_event = None
+    async for event in self._host_runner.run_async(
+        user_id=self.user_id,
+        session_id=conversation_id,
+        new_message=new_message,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+    ):
+      if event.partial:
+        # Partial text is only forwarded; the aggregated event follows.
+        if event.content and event.content.parts:
+          text = "".join(p.text for p in event.content.parts if p.text)
+          if text:
+            emit(HostTextDelta(conversation_id=conversation_id, text=text))
+        continue
+      self.add_event(Event(
+          id=event.id,
+          actor=event.author,
+          content=self.adk_content_to_message(event.content, conversation_id),
+          timestamp=event.timestamp,
+      ))
+      for call in event.get_function_calls():
+        emit(HostToolCall(
+            conversation_id=conversation_id,
+            name=call.name,
+            args=call.args or {},
+        ))
+      final_event = event
+    return final_event
+
+  def _follow_up_target(
+      self,
+      conversation_id: str | None,
+      task_id: str | None) -> Tuple[str, str] | None:
+    """Returns (task id, agent name) of the task waiting for this reply."""
+    if self.follow_up_routing == 'off':
+      return None
+    if not task_id:
+      waiting = self._input_required.get(conversation_id, {})
+      if len(waiting) != 1:
+        return None  # several agents asked; the host LLM picks who gets the answer
+      task_id = next(iter(waiting))
+    task = self._store.get_task(task_id)
+    agent_name = self._task_agents.get(task_id)
+    if (not task or task.status.state != TaskState.INPUT_REQUIRED or
+        agent_name not in self._host_agent.remote_agent_connections):
+      return None
+    return task_id, agent_name
+
+  async def _forward_to_agent(
+      self,
+      message: Message,
+      task_id: str,
+      agent_name: str,
+      state: dict) -> Task | None:
+    """Sends the user's message to one agent directly; None means use the LLM."""
+    text = message_text(message)
+    try:
+      task = await self._host_agent.send_direct(agent_name, text, task_id, state)
+    except Exception as e:
+      logger.warning(f"Direct send to {agent_name} failed, falling back to the host: {e}")
+      return None
+    if task.status.state in (TaskState.CANCELED, TaskState.FAILED):
+      return None
+    return task
+
+  async def _validate_direct(
+      self,
+      message: Message,
+      agent_name: str,
+      task: Task,
+      state: dict,
+      question: str | None = None) -> str | None:
+    """Applies the validation policy to an answer that skipped the host LLM.
+
+    `question` is what the agent asked when the message is the user's reply
+    to it; the validator needs it to make sense of a reply like "2 adults".
+    Returns the verdict if the validator rejected the answer, so the host
+    LLM can handle the turn instead; post-hoc validation never blocks.
+    """
+    user_request = message_text(message)
+    if question:
+      user_request = f"{agent_name} asked: {question}\nThe user replied: {user_request}"
+    try:
+      outcome = await self._host_agent.validate_answer(
+          agent_name, user_request, task, follow_up_parts(task), state)
+    except Exception as e:
+      logger.warning(f"Validation of {agent_name}'s direct answer failed: {e}")
+      return None
+    if self._host_agent.failed_validation(outcome):
+      return outcome[1]
+    return None
+
+  def _record_follow_up(
+      self,
+      session,
+      new_message: types.Content,
+      response: Message,
+      agent_name: str,
+      task: Task):
+    """Adds a direct exchange to the ADK session so later turns see it."""
+    self._session_service.append_event(session, ADKEvent(
+        id=ADKEvent.new_id(),
+        author="user",
+        invocation_id=ADKEvent.new_id(),
+        content=new_message,
+    ))
+    content = self.adk_content_from_message(response)
+    self._session_service.append_event(session, ADKEvent(
+        id=ADKEvent.new_id(),
+        author="host_agent",
+        invocation_id=ADKEvent.new_id(),
+        content=content,
+        actions=ADKEventActions(state_delta={
+            'agent': agent_name,
+            'session_active': task_still_open(task),
+        }),
+    ))
+
+  def _track_task(self, task: TaskCallbackArg, agent_card: AgentCard):
+    """Remembers which agent owns a task and which task awaits user input."""
+    self._task_agents[task.id] = agent_card.name
+    status = getattr(task, "status", None)
+    if status is None:
+      return
+    conversation_id = self._task_conversation_id(task)
+    waiting = self._input_required.get(conversation_id)
+    if status.state == TaskState.INPUT_REQUIRED:
+      self._input_required.setdefault(conversation_id, {})[task.id] = None
+    elif waiting and task.id in waiting:
+      del waiting[task.id]
+      if not waiting:
+        del self._input_required[conversation_id]
+
+  def _task_conversation_id(self, task: TaskCallbackArg) -> str | None:
+    conversation_id = get_conversation_id(task)
+    if conversation_id is None:
+      known = self._store.get_task(task.id)
+      conversation_id = known.sessionId if known else getattr(task, "sessionId", None)
+    return conversation_id
 
   def add_task(self, task: Task):
-    self._tasks.append(task)
+    self._store.add_task(task)
 
   def update_task(self, task: Task):
-    for i, t in enumerate(self._tasks):
-      if t.id == task.id:
-        self._tasks[i] = task
-        return
+    self._store.update_task(task)
 
   def task_callback(self, task: TaskCallbackArg, agent_card: AgentCard):
     if task is None:
@@ -225,6 +479,8 @@ class ADKHostManager(ApplicationManager):
       return temp_task
       
     self.emit_event(task, agent_card)
+    self._track_task(task, agent_card)
+    self.emit_task_update(task, agent_card)
     if isinstance(task, TaskStatusUpdateEvent):
       current_task = self.add_or_get_task(task)
       current_task.status = task.status
@@ -239,7 +495,7 @@ class ADKHostManager(ApplicationManager):
       self.update_task(current_task)
       return current_task
     # Otherwise this is a Task, either new or updated
-    elif not any(filter(lambda x: x.id == task.id, self._tasks)):
+    elif not self._store.has_task(task.id):
       self.attach_message_to_task(getattr(task.status, "message", None), task.id)
       self.insert_id_trace(getattr(task.status, "message", None))
       self.add_task(task)
@@ -294,6 +550,29 @@ class ADKHostManager(ApplicationManager):
         timestamp=datetime.datetime.now(datetime.timezone.utc).timestamp(),
     ))
 
+  def emit_task_update(self, task: TaskCallbackArg, agent_card: AgentCard):
+    """Forwards a remote task update to the turn streaming in its conversation."""
+    if not self._turn_streams:
+      return
+    conversation_id = self._task_conversation_id(task)
+    queue = self._turn_streams.get(conversation_id)
+    if queue is None:
+      return
+    update = RemoteTaskUpdate(
+        conversation_id=conversation_id,
+        task_id=task.id,
+        agent_name=agent_card.name,
+    )
+    if isinstance(task, TaskArtifactUpdateEvent):
+      update.text = parts_text(task.artifact.parts)
+      update.append = bool(task.artifact.append)
+    else:
+      update.state = task.status.state
+      if task.status.message:
+        update.text = parts_text(task.status.message.parts)
+      update.final = bool(getattr(task, "final", False))
+    queue.put_nowait(update)
+
   def attach_message_to_task(self, message: Message | None, task_id: str):
     if message and message.metadata and 'message_id' in message.metadata:
       self._task_map[message.metadata['message_id']] = task_id
@@ -322,7 +601,7 @@ class ADKHostManager(ApplicationManager):
       print("Message id already in history", get_message_id(task.status.message), task.history)
 
   def add_or_get_task(self, task: TaskCallbackArg):
-    current_task = next(filter(lambda x: x.id == task.id, self._tasks), None)
+    current_task = self._store.get_task(task.id)
     if not current_task:
       conversation_id = None
       if task.metadata and 'conversation_id' in task.metadata:
@@ -341,6 +620,7 @@ class ADKHostManager(ApplicationManager):
 
   def process_artifact_event(self, current_task:Task, task_update_event: TaskArtifactUpdateEvent):
     artifact = task_update_event.artifact
+    chunks = self._artifact_chunks.setdefault(task_update_event.id, {})
     if not artifact.append:
       #received the first chunk or entire payload for an artifact
       if artifact.lastChunk is None or artifact.lastChunk:
@@ -350,18 +630,25 @@ class ADKHostManager(ApplicationManager):
           current_task.artifacts = []
         current_task.artifacts.append(artifact)
       else:
-        #this is a chunk of an artifact, stash it in temp store for assemling
-        if not task_update_event.id in self._artifact_chunks:
-              self._artifact_chunks[task_update_event.id] = {}
-        self._artifact_chunks[task_update_event.id][artifact.index] = artifact
+        #this is a chunk of an artifact, stash a copy in temp store for assembling
+        chunks[artifact.index] = artifact.model_copy(update={'parts': list(artifact.parts)})
     else:
         # we received an append chunk, add to the existing temp artifact
-        current_temp_artifact = self._artifact_chunks[task_update_event.id][artifact.index]
-        # TODO handle if current_temp_artifact is missing
-        current_temp_artifact.parts.extend(artifact.parts)
+        current_temp_artifact = chunks.get(artifact.index)
+        if current_temp_artifact is None:
+          # the opening chunk was missed, start assembling from this one
+          current_temp_artifact = artifact.model_copy(update={'parts': []})
+          chunks[artifact.index] = current_temp_artifact
+        append_parts(current_temp_artifact.parts, artifact.parts)
         if artifact.lastChunk:
+          current_temp_artifact.append = False
+          current_temp_artifact.lastChunk = True
+          if not current_task.artifacts:
+            current_task.artifacts = []
           current_task.artifacts.append(current_temp_artifact)
-          del self._artifact_chunks[task_update_event.id][artifact.index]
+          del chunks[artifact.index]
+    if not chunks:
+      self._artifact_chunks.pop(task_update_event.id, None)
 
   def add_event(self, event: Event):
     self._events[event.id] = event
@@ -370,18 +657,17 @@ class ADKHostManager(ApplicationManager):
       self,
       conversation_id: Optional[str]
   ) -> Optional[Conversation]:
-    if not conversation_id:
-      return None
-    return next(
-        filter(lambda c: c.conversation_id == conversation_id,
-               self._conversations), None)
+    return self._store.get_conversation(conversation_id)
+
+  def last_agent_message(self, conversation_id: str) -> Optional[Message]:
+    return self._store.last_agent_message(conversation_id)
 
   def get_pending_messages(self) -> list[Tuple[str, str]]:
     rval = []
     for message_id in self._pending_message_ids:
       if message_id in self._task_map:
         task_id = self._task_map[message_id]
-        task = next(filter(lambda x: x.id == task_id, self._tasks), None)
+        task = self._store.get_task(task_id)
         if not task:
           rval.append((message_id, ""))
         elif task.history and task.history[-1].parts:
@@ -396,31 +682,66 @@ class ADKHostManager(ApplicationManager):
         rval.append((message_id, ""))
     return rval
 
-  def register_agent(self, url):
-    agent_data = get_agent_card(url)
-    if not agent_data.url:
-      agent_data.url = url
-    self._agents.append(agent_data)
-    self._host_agent.register_agent_card(agent_data)
-    # Now update the host agent definition
-    self._initialize_host()
+  async def register_agent(self, url):
+    if url in self._registry:
+      return
+    agent_data = await get_agent_card(url)
+    if agent_data is None:
+      raise ValueError(f"Unable to fetch agent card from {url}")
+    self._registry.add(url, agent_data)
+
+  def register_agent_card(self, url: str, card: AgentCard) -> bool:
+    """Registers a card the caller already fetched."""
+    return self._registry.add(url, card)
+
+  async def sync_agents(self, urls: list[str]) -> bool:
+    """Brings the registered agents in line with `urls`.
+
+    Only new URLs are fetched (concurrently) and only removed URLs are
+    dropped; when nothing changed this is a set comparison.
+    """
+    return await self._registry.sync(urls)
+
+  async def close(self):
+    """Closes the pooled connections to every remote agent."""
+    await self._host_agent.close()
 
   @property
   def agents(self) -> list[AgentCard]:
-    return self._agents
+    return self._registry.cards
 
   @property
   def conversations(self) -> list[Conversation]:
-    return self._conversations
+    return self._store.conversations
 
   @property
   def tasks(self) -> list[Task]:
-    return self._tasks
+    return self._store.tasks
+
+  @property
+  def messages(self) -> list[Message]:
+    return self._store.messages
 
   @property
   def events(self) -> list[Event]:
     return sorted(self._events.values(), key=lambda x: x.timestamp)
 
+  def metrics(self) -> dict:
+    """Store sizes, prompt token totals, result cache, validation and
+    remote agent counters, for the `/metrics` endpoint."""
+    host = self._host_agent
+    return {
+        "conversations": len(self._store.conversations),
+        "tasks": len(self._store.tasks),
+        "messages": len(self._store.messages),
+        "events": len(self._events),
+        "active_turns": len(self._turn_streams),
+        "prompt": host.prompt_stats.totals,
+        "result_cache": host.result_cache.metrics() if host.result_cache else {},
+        "validation": host.validation_stats,
+        "remote": {"agents": host.remote_agent_stats},
+    }
+
   def adk_content_from_message(self, message: Message) -> types.Content:
     parts: list[types.Part] = []
     for part in message.parts:
@@ -496,6 +817,14 @@ class ADKHostManager(ApplicationManager):
       parts.append(DataPart(data=part.function_response.model_dump()))
     return parts
 
+def append_parts(target: list[Part], parts: list[Part]):
+  """Appends streamed parts, joining consecutive text into one TextPart."""
+  for part in parts:
+    if (part.type == "text" and target and target[-1].type == "text"):
+      target[-1] = TextPart(text=target[-1].text + part.text)
+    else:
+      target.append(part)
+
 def get_message_id(m: Message | None) -> str  | None:
   if not m or not m.metadata or 'message_id' not in m.metadata:
     return None
@@ -506,6 +835,20 @@ def get_last_message_id(m: Message | None) -> str | None:
     return None
   return m.metadata['last_message_id']
 
+def follow_up_parts(task: Task) -> list[Part]:
+  """The agent's answer: its artifacts, or the question it asked."""
+  parts = [p for a in task.artifacts or [] for p in a.parts]
+  if not parts and task.status.message:
+    parts = list(task.status.message.parts)
+  return parts
+
+def message_text(message: Message) -> str:
+  return "\n".join(p.text for p in message.parts if isinstance(p, TextPart))
+
+def parts_text(parts: list[Part]) -> str | None:
+  texts = [p.text for p in parts if isinstance(p, TextPart)]
+  return "".join(texts) if texts else None
+
 def get_conversation_id(
     t: (Task |
         TaskStatusUpdateEvent |
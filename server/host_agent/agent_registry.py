@@ -0,0 +1,76 @@
+import asyncio
+from typing import Iterable
+from a2a_types import AgentCard
+from .host_agent import HostAgent
+from .utils import card_resolver
+
+
+class AgentRegistry:
+  """Keeps the host agent's remote agents in sync with a desired set of URLs.
+
+  The host agent's instruction and tools read its card/connection maps on
+  every model call, so adding or removing an agent only has to update those
+  maps; the ADK Agent and Runner are never rebuilt. URLs whose cards share
+  a name are registered as replicas of one agent.
+  """
+
+  def __init__(self, host_agent: HostAgent):
+    self._host_agent = host_agent
+    self._cards: dict[str, AgentCard] = {}
+    self._lock = asyncio.Lock()
+    self.version = 0
+
+  @property
+  def cards(self) -> list[AgentCard]:
+    return list(self._cards.values())
+
+  def __contains__(self, url: str) -> bool:
+    return url in self._cards
+
+  async def sync(self, urls: Iterable[str]) -> bool:
+    """Registers new URLs and drops missing ones. Returns True on change."""
+    desired = list(dict.fromkeys(urls))
+    if self._cards.keys() == set(desired):
+      return False
+    async with self._lock:
+      desired_set = set(desired)
+      added = [url for url in desired if url not in self._cards]
+      removed = [url for url in self._cards if url not in desired_set]
+      cards = await card_resolver.resolve_many(added)
+      changed = False
+      for url in removed:
+        await self._remove(url)
+        changed = True
+      for url, card in cards.items():
+        if isinstance(card, BaseException) or card is None:
+          print(f"[Agent Register Error] {url}: {card}")
+          continue
+        self._add(url, card)
+        changed = True
+      if changed:
+        self.version += 1
+      return changed
+
+  def add(self, url: str, card: AgentCard) -> bool:
+    """Registers an already fetched card. Returns False if already present."""
+    if url in self._cards:
+      return False
+    self._add(url, card)
+    self.version += 1
+    return True
+
+  def _add(self, url: str, card: AgentCard):
+    if not card.url:
+      card.url = url
+    self._cards[url] = card
+    replaced = self._host_agent.register_agent_card(card)
+    if replaced:
+      asyncio.get_running_loop().create_task(replaced.close())
+
+  async def _remove(self, url: str):
+    card = self._cards.pop(url)
+    if any(c.url == card.url for c in self._cards.values()):
+      return  # another registered URL resolved to the same replica
+    connection = self._host_agent.unregister_agent_card(card.name, card.url)
+    if connection:
+      await connection.close()
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
+from typing import AsyncIterator
 from a2a_types import Message, Task, AgentCard, Conversation, Event
+from .host_events import HostEvent
 
 class ApplicationManager(ABC):
 
@@ -16,7 +18,11 @@ class ApplicationManager(ABC):
     pass
 
   @abstractmethod
-  def register_agent(self, url: str):
+  def stream_message(self, message: Message) -> AsyncIterator[HostEvent]:
+    pass
+
+  @abstractmethod
+  async def register_agent(self, url: str):
     pass
 
   @abstractmethod
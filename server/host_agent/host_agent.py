@@ -1,28 +1,52 @@
 import os
 import json
 import uuid
+import asyncio
+import time
+from collections import OrderedDict
 from typing import List
 from google.adk import Agent
 from google.adk.agents.readonly_context import ReadonlyContext
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.tools.tool_context import ToolContext
-from google.adk.tools import agent_tool
 from .remote_agent_connection import ( RemoteAgentConnections, TaskUpdateCallback)
+from .routing import RoutingIndex, RouteMatch
+from .validation import ValidationPolicy, Validator
+from .prompts import HOST_INSTRUCTION, VALIDATOR_INSTRUCTION, PromptStats
+from .result_cache import ResultCache
+from .resilience import CircuitBreaker, RetryPolicy
+from .replica_pool import ReplicaPool
+from .quota import AgentQuota, AgentOverloadedError
+from server.metrics import REGISTRY
 from a2a_types import (
     AgentCard,
     Message,
+    Task,
     TaskState,
     TaskSendParams,
+    TaskStatus,
+    TaskStatusUpdateEvent,
     TextPart,
 )
-from client import A2ACardResolver
 from dotenv import load_dotenv
-from app.task_queue import task_queue
+from app.task_queue import event_bus
 from google.adk.agents import LlmAgent
 from google.adk.models.lite_llm import LiteLlm
+import logging
+logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+DEFAULT_FAN_OUT_TIMEOUT = 120.0
+DEFAULT_ROUTING_TOP_K = 3
+# Compiled prompt prefixes kept per agent-set version (one per candidate set).
+MAX_COMPILED_INSTRUCTIONS = 256
+# LiteLLM providers whose prompt caching needs explicit cache_control marks.
+CACHE_CONTROL_MODEL_PREFIXES = ("anthropic/", "bedrock/", "vertex_ai/claude")
+
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "host_llm_call_seconds", "Time of one LLM call by the host or the validator", ["agent"])
+
 class HostAgent:
   """The host agent.
 
@@ -32,7 +56,7 @@ class HostAgent:
 
   def __init__(
       self,
-      remote_agent_addresses: List[str],
+      remote_agent_cards: List[AgentCard],
       task_callback: TaskUpdateCallback | None = None
   ):
     
@@ -48,154 +72,226 @@ class HostAgent:
     self.host_agent_config = self.config['host_agent']
     self.validator_agent_config = self.config['validator_agent']
     
+    self.routing_config = self.host_agent_config.get('routing', {})
+    self.routing_index = RoutingIndex()
+    self._routing_version = -1
+    self.agents_version = 0
+    self._card_lines: dict[str, str] = {}
+    self._compiled: OrderedDict[tuple, str] = OrderedDict()
+    self.prompt_stats = PromptStats()
+    self.result_cache = ResultCache.from_config(self.host_agent_config.get('result_cache'))
+    self.resilience_config = self.host_agent_config.get('resilience', {})
+    self.retry_policy = RetryPolicy.from_config(self.resilience_config.get('retry'))
+    self.load_balancing_config = self.host_agent_config.get('load_balancing', {})
+    
     self.task_callback = task_callback
-    self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
+    # One pool per agent name; several URLs serving the same card name are
+    # replicas of that agent.
+    self.remote_agent_connections: dict[str, ReplicaPool] = {}
     self.cards: dict[str, AgentCard] = {}
-    for address in remote_agent_addresses:
-      card_resolver = A2ACardResolver(address)
-      card = card_resolver.get_agent_card()
-      remote_connection = RemoteAgentConnections(card)
-      self.remote_agent_connections[card.name] = remote_connection
-      self.cards[card.name] = card
-    agent_info = []
-    for ra in self.list_remote_agents():
-      agent_info.append(json.dumps(ra))
-    self.agents = '\n'.join(agent_info)
+    # Cards are resolved by the caller (see AgentRegistry) so that no
+    # blocking network call happens in the constructor.
+    for card in remote_agent_cards:
+      self.register_agent_card(card)
     # Create validator agent instance for this host agent
-    model_name = self.validator_agent_config['model']
-    if model_name.startswith('gemini'):
-      model = model_name
-    else:
-      model = LiteLlm(model=model_name)
+    model = self._build_model(self.validator_agent_config['model'])
     self.validator_agent = LlmAgent(
         name="ValidatorAgent",
         description="Evaluates whether an agent's response properly addresses the user's request. If not, identifies a more appropriate agent from the available list for task reassignment.",
         model=model,
         instruction=self.root_varify_instruction,
+        before_model_callback=self.validator_before_model_callback,
+        after_model_callback=self.validator_after_model_callback,
         tools=[self.send_task,
                self.list_remote_agents]
     )
+    self.validation_policy = ValidationPolicy(self.host_agent_config.get('validation'))
+    self.validator = Validator(self.validator_agent, self.validation_policy)
+    self._background: set[asyncio.Task] = set()
+    # (agent, invocation_id) -> start of the LLM call in flight
+    self._llm_started: dict[tuple[str, str], float] = {}
     
 
   def root_varify_instruction(self, context: ReadonlyContext) -> str:
+    started = time.perf_counter()
     current_agent = self.check_state(context)
-    return f"""
-            You are a validator agent responsible for evaluating whether a response from an agent properly addresses the user's request. Your job is to score the response on a 100-point scale based on how well it meets the user's needs, then determine if re-delegation is needed.
-            You will be given:
-
-            - The original user request
-            - The response from a specific agent
-            - The name of the responding agent
+    prefix = self._compiled_instruction('validator', None)
+    instruction = f"{prefix}          Current agent: {current_agent['active_agent']}\n"
+    self.prompt_stats.record_build(None, started)
+    return instruction
+    
+  def register_agent_card(self, card: AgentCard) -> RemoteAgentConnections | None:
+    """Adds `card.url` as a replica of `card.name`.
 
-            Your tasks:
-            1. Analyze whether the response fully and appropriately addresses the user's request.
-            
-            - Be specific in your reasoning.
-            - Consider both the content and intent of the user's request.
-            - Evaluate the quality, completeness, relevance, and clarity of the response.
-            - Give a score from 0 to 100 based on how well the response meets the request.
-            
-            2. If the response scores below 80 points:
+    Returns the connection it replaced (same URL registered again), which
+    the caller should close.
+    """
+    remote_connection = RemoteAgentConnections(
+        card,
+        self.retry_policy,
+        CircuitBreaker.from_config(self.resilience_config.get('circuit_breaker')),
+    )
+    pool = self.remote_agent_connections.get(card.name)
+    if pool is None:
+      pool = ReplicaPool.from_config(
+          card.name,
+          self.load_balancing_config,
+          AgentQuota.from_config(card.name, self.host_agent_config.get('concurrency')),
+          self.result_cache,
+      )
+      self.remote_agent_connections[card.name] = pool
+    replaced = pool.add(remote_connection)
+    known = self.cards.get(card.name)
+    if (len(pool) > 1 and replaced is None and known is not None and
+        known.model_dump(exclude={'url'}) == card.model_dump(exclude={'url'})):
+      return None  # another replica of a known agent; the prompts stay the same
+    self.cards[card.name] = card
+    self._card_lines[card.name] = json.dumps(
+        {"name": card.name, "description": card.description})
+    self._agents_changed()
+    return replaced
 
-            - Identify which agent would be more suitable to handle the request.
-            - Clearly state the following format:
-              ```
-              Response is NOT appropriate. Score: <score>. Suggested agent: <agent name>
-              ```
-            - Use the send_task tool to re-delegate the request to the appropriate agent.
-            - Summarize the necessary improvements clearly and pass them along to the reassigned agent.
-            - When re-delegating, briefly and clearly instruct the new agent on the specific improvements that need to be made
+  def unregister_agent_card(
+      self,
+      agent_name: str,
+      url: str | None = None) -> RemoteAgentConnections | ReplicaPool | None:
+    """Removes one replica (`url`) or the whole agent; returns what to close."""
+    pool = self.remote_agent_connections.get(agent_name)
+    if pool is not None and url is not None and len(pool) > 1:
+      return pool.remove(url)
+    connection = self.remote_agent_connections.pop(agent_name, None)
+    self.cards.pop(agent_name, None)
+    self._card_lines.pop(agent_name, None)
+    if self.result_cache:
+      self.result_cache.invalidate(agent_name)
+    self._agents_changed()
+    return connection
+
+  async def close(self):
+    for task in list(self._background):
+      task.cancel()
+    await asyncio.gather(*self._background, return_exceptions=True)
+    for connection in self.remote_agent_connections.values():
+      await connection.close()
+
+  def _agents_changed(self):
+    # Prompts and the routing index are rebuilt lazily for the new version.
+    self.agents_version += 1
+    self._compiled.clear()
+
+  @property
+  def agents(self) -> str:
+    """One JSON line per registered agent, as shown in the prompts."""
+    return self._compiled_instruction('agents', None)
+
+  def _compiled_instruction(self, kind: str, names: list[str] | None) -> str:
+    """Builds a prompt part once per agent-set version (and candidate set)."""
+    key = (kind, tuple(names) if names else None)
+    compiled = self._compiled.get(key)
+    if compiled is not None:
+      self._compiled.move_to_end(key)
+      return compiled
+    if kind == 'agents':
+      compiled = '\n'.join(self._card_lines.values())
+    elif kind == 'validator':
+      compiled = f"{VALIDATOR_INSTRUCTION}          Agents: {self.agents}\n"
+    else:
+      # Only a candidate subset needs the hint; otherwise every agent is listed.
+      preselected = (
+          "      The agents below were preselected for this message. If none of them fits, call list_remote_agents to see every agent.\n"
+          if names and not self._card_lines.keys() <= set(names) else "")
+      compiled = f"{HOST_INSTRUCTION}{preselected}      Agents: {self.agents_block(names)}\n"
+    self._compiled[key] = compiled
+    if len(self._compiled) > MAX_COMPILED_INSTRUCTIONS:
+      self._compiled.popitem(last=False)
+    return compiled
+
+  def route(self, query: str) -> list[RouteMatch]:
+    """Candidate agents for `query` from the skill index, best first."""
+    if not self.routing_config.get('enabled', True):
+      return []
+    if self._routing_version != self.agents_version:
+      self.routing_index.build(self.cards.values())
+      self._routing_version = self.agents_version
+    return self.routing_index.route(
+        query,
+        self.routing_config.get('top_k', DEFAULT_ROUTING_TOP_K),
+        self.routing_config.get('min_score', 0.0))
+
+  def direct_route(self, matches: list[RouteMatch]) -> str | None:
+    """The agent to dispatch to without the LLM, if one clearly stands out."""
+    threshold = self.routing_config.get('direct_threshold')
+    if threshold is None or not matches:
+      return None
+    best = matches[0]
+    if not self.is_available(best.agent_name):
+      return None  # let the LLM pick among the agents that are up
+    if (best.confidence >= threshold and
+        best.score >= self.routing_config.get('min_score', 0.0)):
+      return best.agent_name
+    return None
+
+  def is_available(self, agent_name: str) -> bool:
+    """False while the circuit breakers of all the agent's replicas are open."""
+    pool = self.remote_agent_connections.get(agent_name)
+    return pool is not None and pool.available
+
+  @property
+  def remote_agent_stats(self) -> dict:
+    """Per agent: balancing counters, and load, health, retries and
+    circuit breaker state of each replica."""
+    return {
+        name: pool.metrics()
+        for name, pool in self.remote_agent_connections.items()
+    }
 
-            3. If the response scores 80 points or above:
+  def agents_block(self, names: list[str] | None) -> str:
+    """The `Agents:` block of the prompt, limited to `names` if given."""
+    if not names:
+      return self.agents
+    return '\n'.join(
+        self._card_lines[name] for name in names if name in self._card_lines)
 
-            - Return the response as is, including the score in this format:
-            - Response is appropriate. Score: <score> <response>
-            
-          Judging agent suitability:
-            - Evaluate if the correct agent has been selected for the task based on the content and intent of the request.
-            - If the response is not appropriate for the task, use send_task to assign it to a more suitable agent.
-            - If additional improvements are needed, ask the appropriate agent to address only the necessary revisions when re-delegating.
-
-          Constraints:
-            - Keep your output structured and concise for easy parsing by the delegator.
-            - Do not attempt to solve or modify the user's original request yourself.
-            - Use list_remote_agents to view available agents if needed for reassignment.
-
-          Agents: {self.agents}
-          Current agent: {current_agent['active_agent']}
-"""
-    
-  def register_agent_card(self, card: AgentCard):
-    remote_connection = RemoteAgentConnections(card)
-    self.remote_agent_connections[card.name] = remote_connection
-    self.cards[card.name] = card
-    agent_info = []
-    for ra in self.list_remote_agents():
-      agent_info.append(json.dumps(ra))
-    self.agents = '\n'.join(agent_info)
+  def _build_model(self, model_name: str):
+    if model_name.startswith('gemini'):
+      # Gemini caches repeated prompt prefixes implicitly; the instructions
+      # keep their static part first so it is a stable prefix.
+      return model_name
+    if (self.host_agent_config.get('prompt_caching', True) and
+        model_name.startswith(CACHE_CONTROL_MODEL_PREFIXES)):
+      # These providers only cache what is explicitly marked.
+      return LiteLlm(
+          model=model_name,
+          cache_control_injection_points=[{"location": "message", "role": "system"}],
+      )
+    # OpenAI caches long prompt prefixes automatically.
+    return LiteLlm(model=model_name)
 
   def create_agent(self) -> Agent:
-    model_name = self.host_agent_config['model']
-    if model_name.startswith('gemini'):
-      model = model_name
-    else:
-      model = LiteLlm(model=model_name)
+    model = self._build_model(self.host_agent_config['model'])
     return Agent(
         model=model,
         name="host_agent",
         instruction=self.root_instruction,
         before_model_callback=self.before_model_callback,
+        after_model_callback=self.after_model_callback,
         description=(
             "This agent orchestrates the decomposition of the user request into tasks that can be performed by the child agents."
         ),
         tools=[
             self.list_remote_agents,
             self.send_task,
-            agent_tool.AgentTool(agent=self.validator_agent)
+            self.send_tasks,
         ],
     )
 
   def root_instruction(self, context: ReadonlyContext) -> str:
+    started = time.perf_counter()
     current_agent = self.check_state(context)
-    return f"""
-            You are the host agent responsible for coordinating user communication across multiple expert agents in a multi-agent system.
-
-            Discovery:
-            - You can use `list_remote_agents` to list the available remote agents you can use to delegate the task.
-
-            Execution:
-            - For actionable tasks, you can use `create_task` to assign tasks to remote agents to perform. Be sure to include the remote agent name when you respond to the user.
-
-            Your role:
-            - Please synthesize the responses from each agent and clearly provide the relevant information so that the next agent can use it.
-            - Act as the primary interface with the user.
-            - Break down user input into sub-requests (if needed) and delegate to the appropriate agents via the delegator.
-            - Use agent_tool.AgentTool(agent=self.validator_agent) to verify responses from agents. If a response fails validation, provide feedback and request revisions from the original agent.
-            - Deliver validated responses to the user in a natural, cohesive manner.
-
-            Key responsibilities:
-            - Relay agent-generated questions to the user without altering, repeating, or paraphrasing them.
-            - Avoid asking the user for information already requested by an agent.
-            - Do not ask the user which agent is appropriate — this is handled internally.
-            - Reuse existing context to prevent redundant questions.
-            - Once all required information is collected, submit the full input to the appropriate agent and deliver the validated result.
-            - If the response from an agent does not meet the user's needs or fails validation, you must re-delegate the task to the appropriate agent with specific instructions for improvement.
-            - If the user input is unclear or ambiguous, ask clarifying questions before delegating tasks to agents. Avoid making assumptions about the user's intent.
-            - Ensure that all delegated tasks are monitored for progress and completion. If needed, follow up with the responsible agent to ensure timely responses.
-            - Prioritize responses that are most relevant to the user’s query, ensuring that the task is not only complete but meets the user’s expectations.
-            - If an error occurs during task execution (e.g., an agent fails to respond or provide valid information), address the issue immediately and work with the relevant agents to correct the issue.
-            - Once a response is delivered to the user, confirm if the user’s needs have been met and ask if further assistance is required.
-
-            Constraints:
-            - Do not make assumptions, inferences, or generate new content on your own; if additional information is needed, explicitly request it from the user.
-            - Do not think on your own, always rely on self.validator_agent responses.
-            - Maintain a clean and structured conversation flow.
-
-            Tools available: list_remote_agents, send_task, agent_tool.AgentTool(agent=self.validator_agent)
-
-      Agents: {self.agents}
-      Current agent: {current_agent['active_agent']}
-"""
+    prefix = self._compiled_instruction('host', context.state.get('candidate_agents'))
+    instruction = f"{prefix}      Current agent: {current_agent['active_agent']}\n"
+    self.prompt_stats.record_build(context.invocation_id, started)
+    return instruction
 
             
   def check_state(self, context: ReadonlyContext):
@@ -213,6 +309,34 @@ class HostAgent:
       if 'session_id' not in state:
         state['session_id'] = str(uuid.uuid4())
       state['session_active'] = True
+    self._llm_call_started("host", callback_context)
+
+  def after_model_callback(self, callback_context: CallbackContext, llm_response):
+    if not llm_response.partial:
+      self._llm_call_done("host", callback_context)
+      self.prompt_stats.record_usage(
+          callback_context.invocation_id, llm_response.usage_metadata)
+
+  def validator_before_model_callback(self, callback_context: CallbackContext, llm_request):
+    self._llm_call_started("validator", callback_context)
+
+  def validator_after_model_callback(self, callback_context: CallbackContext, llm_response):
+    if not llm_response.partial:
+      self._llm_call_done("validator", callback_context)
+      self.prompt_stats.record_usage(None, llm_response.usage_metadata)
+
+  def _llm_call_started(self, agent: str, callback_context: CallbackContext):
+    if not REGISTRY.enabled:
+      return
+    self._llm_started[(agent, callback_context.invocation_id)] = time.perf_counter()
+    if len(self._llm_started) > MAX_COMPILED_INSTRUCTIONS:
+      # A call that raised never reaches the after callback.
+      del self._llm_started[next(iter(self._llm_started))]
+
+  def _llm_call_done(self, agent: str, callback_context: CallbackContext):
+    started = self._llm_started.pop((agent, callback_context.invocation_id), None)
+    if started is not None:
+      LLM_CALL_SECONDS.observe(time.perf_counter() - started, agent)
 
   def list_remote_agents(self):
     """List the available remote agents you can use to delegate the task."""
@@ -221,6 +345,8 @@ class HostAgent:
 
     remote_agent_info = []
     for card in self.cards.values():
+      if not self.is_available(card.name):
+        continue  # failing right now; it comes back once its breaker closes
       remote_agent_info.append(
           {"name": card.name, "description": card.description}
       )
@@ -249,12 +375,234 @@ class HostAgent:
     state = tool_context.state
     state['agent'] = agent_name
     
+    # Resume the task this agent asked a question in, if any
+    task_id = (state.get('input_required_tasks', {}).get(agent_name) or
+               state.get('task_id') or
+               str(uuid.uuid4()))
+    
+    try:
+        try:
+          task = await self._dispatch_task(agent_name, message, task_id, state)
+        except AgentOverloadedError as e:
+          # Tell the model instead of failing the turn, so it can wait or reroute
+          return [TextPart(text=f"[Overloaded] {e}")]
+        
+        # Update session state
+        state['session_active'] = task.status.state not in [
+            TaskState.COMPLETED,
+            TaskState.CANCELED,
+            TaskState.FAILED,
+            TaskState.UNKNOWN,
+        ]
+        remember_input_required(state, {task.id: (agent_name, task)})
+        
+        # Handle task status
+        if task.status.state == TaskState.INPUT_REQUIRED:
+            tool_context.actions.skip_summarization = True
+            tool_context.actions.escalate = True
+            return []
+        elif task.status.state in [TaskState.CANCELED, TaskState.FAILED]:
+            raise ValueError(f"Task {task_id} {task.status.state.lower()}")
+        
+        parts = task_response_parts(task)
+        verdict = await self._validate(agent_name, message, task, parts, tool_context)
+        if verdict:
+          parts.append(TextPart(text=verdict))
+        return parts
+        
+    except Exception as e:
+        print(f"Error in send_task: {e}")
+        raise
+
+  async def send_tasks(
+      self,
+      agent_names: list[str],
+      messages: list[str],
+      tool_context: ToolContext):
+    """Sends several independent tasks to remote agents at the same time.
+
+    Use this instead of calling send_task repeatedly when the user request
+    has parts that different agents can work on independently.
+
+    Args:
+      agent_names: The agent to send each task to.
+      messages: The message of each task, in the same order as agent_names.
+      tool_context: The tool context this method runs in.
+
+    Returns:
+      One result per task, in the same order, with the agent name, the task
+      id, the final task state and either the response parts or an error.
+    """
+    if len(agent_names) != len(messages):
+      raise ValueError("agent_names and messages must have the same length")
+    state = tool_context.state
+    timeout = self.host_agent_config.get('fan_out_timeout', DEFAULT_FAN_OUT_TIMEOUT)
+    state['agent'] = ', '.join(agent_names)
+    # A waiting task resumes with the first sub-task for its agent only;
+    # further sub-tasks for that agent are new tasks, never the same one.
+    waiting = dict(state.get('input_required_tasks', {}))
+    task_ids = [waiting.pop(name, None) or str(uuid.uuid4()) for name in agent_names]
+
+    async def run(agent_name: str, message: str, task_id: str):
+      if agent_name not in self.remote_agent_connections:
+        raise ValueError(f"Agent {agent_name} not found")
+      # Each sub-task gets its own message id, so replies map to their task.
+      return await asyncio.wait_for(
+          self._dispatch_task(agent_name, message, task_id, state, str(uuid.uuid4())),
+          timeout=timeout,
+      )
+
+    outcomes = await asyncio.gather(
+        *(run(*args) for args in zip(agent_names, messages, task_ids)),
+        return_exceptions=True,
+    )
+
+    results = []
+    validations = []
+    finished: dict[str, tuple[str, Task]] = {}
+    for agent_name, message, task_id, outcome in zip(agent_names, messages, task_ids, outcomes):
+      result = {"agent_name": agent_name, "task_id": task_id}
+      if isinstance(outcome, asyncio.TimeoutError):
+        result.update(state=TaskState.FAILED, error=f"Timed out after {timeout}s")
+      elif isinstance(outcome, BaseException):
+        result.update(state=TaskState.FAILED, error=str(outcome))
+      else:
+        finished[task_id] = (agent_name, outcome)
+        result.update(state=outcome.status.state, parts=task_response_parts(outcome))
+        if outcome.status.state == TaskState.COMPLETED:
+          validations.append(self._validate_result(result, message, outcome, tool_context))
+      results.append(result)
+    await asyncio.gather(*validations)
+    remember_input_required(state, finished)
+    state['session_active'] = any(
+        r['state'] == TaskState.INPUT_REQUIRED for r in results
+    )
+    return results
+
+  @property
+  def validation_stats(self) -> dict:
+    """Policy counters plus the running score of every validated agent."""
+    return {
+        **self.validation_policy.stats,
+        "mode": self.validation_policy.mode.value,
+        "agents": self.validation_policy.scores.snapshot(),
+    }
+
+  async def _validate_result(self, result: dict, message: str, task: Task, tool_context: ToolContext):
+    verdict = await self._validate(result['agent_name'], message, task, result['parts'], tool_context)
+    if verdict:
+      result['validation'] = verdict
+
+  async def _validate(
+      self,
+      agent_name: str,
+      message: str,
+      task: Task,
+      parts: list,
+      tool_context: ToolContext) -> str | None:
+    """Validates a delegated answer if the policy asks for it.
+
+    Returns the verdict to hand back to the host LLM, or None when the
+    answer was not validated or is validated in the background.
+    """
+    user_request = message
+    user_content = getattr(tool_context, 'user_content', None)
+    if user_content and user_content.parts:
+      user_request = "\n".join(p.text for p in user_content.parts if p.text) or message
+    outcome = await self.validate_answer(agent_name, user_request, task, parts, tool_context.state)
+    if outcome is None or not outcome[1]:
+      return None
+    return f"[Validation] {outcome[1]}"
+
+  async def validate_answer(
+      self,
+      agent_name: str,
+      user_request: str,
+      task: Task,
+      parts: list,
+      state) -> tuple[int | None, str] | None:
+    """Runs the validation policy on an answer, with or without the host LLM.
+
+    Returns the validator's (score, verdict), or None when the answer was
+    not validated or is validated in the background.
+    """
+    if state.get('validating'):
+      return None  # a re-delegation made by the validator itself
+    response_text = "\n".join(
+        p.text if isinstance(p, TextPart) else json.dumps(p.model_dump(exclude_none=True))
+        for p in parts)
+    if not self.validation_policy.should_validate(agent_name, response_text):
+      return None
+    seed = {k: state[k] for k in ('session_id', 'input_message_metadata') if k in state}
+    if self.validation_policy.background:
+      job = asyncio.create_task(
+          self._validate_post_hoc(user_request, agent_name, response_text, seed, task.id))
+      self._background.add(job)
+      job.add_done_callback(self._background.discard)
+      return None
+    return await self.validator.validate(user_request, agent_name, response_text, seed)
+
+  def failed_validation(self, outcome: tuple[int | None, str] | None) -> bool:
+    """Whether the validator scored an answer below `pass_score`."""
+    return (outcome is not None and outcome[0] is not None and
+            outcome[0] < self.validation_policy.pass_score)
+
+  async def _validate_post_hoc(
+      self,
+      user_request: str,
+      agent_name: str,
+      response_text: str,
+      seed: dict,
+      task_id: str):
+    """Validates an answer the user already has; publishes a correction if it fails."""
+    try:
+      score, verdict = await self.validator.validate(
+          user_request, agent_name, response_text, seed)
+    except Exception as e:
+      logger.warning(f"Background validation of {agent_name} failed: {e}")
+      return
+    if score is not None and score < self.validation_policy.pass_score and 'session_id' in seed:
+      await event_bus.publish(seed['session_id'], {
+          "type": "correction",
+          "task_id": task_id,
+          "agent_name": agent_name,
+          "score": score,
+          "text": verdict,
+          "session_id": seed['session_id'],
+      })
+
+  async def send_direct(
+      self,
+      agent_name: str,
+      message: str,
+      task_id: str,
+      state: dict) -> Task:
+    """Sends a user's message to one agent without going through the LLM.
+
+    Used by the host manager for replies to INPUT_REQUIRED tasks and for
+    messages the routing index matches with high confidence; `state` carries
+    the same session keys the tools read.
+    """
+    if agent_name not in self.remote_agent_connections:
+      raise ValueError(f"Agent {agent_name} not found")
+    return await self._dispatch_task(agent_name, message, task_id, state)
+
+  async def _dispatch_task(
+      self,
+      agent_name: str,
+      message: str,
+      task_id: str,
+      state,
+      message_id: str | None = None) -> Task:
+    """Sends one task to a remote agent and mirrors it to the conversation bus.
+
+    `message_id` replaces the id of the user's message, for fan-out
+    sub-tasks that must not share one.
+    """
     client = self.remote_agent_connections[agent_name]
     if not client:
       raise ValueError(f"Client not available for {agent_name}")
     
-    # Generate task ID and session ID
-    task_id = state.get('task_id', str(uuid.uuid4()))
     session_id = state.get('session_id', str(uuid.uuid4()))
     
     # Prepare message metadata
@@ -264,6 +612,9 @@ class HostAgent:
     }
     if 'input_message_metadata' in state:
         metadata.update(**state['input_message_metadata'])
+    if message_id:
+        metadata['parent_message_id'] = metadata['message_id']
+        metadata['message_id'] = message_id
     
     # Create task request
     request = TaskSendParams(
@@ -278,54 +629,65 @@ class HostAgent:
         metadata={'conversation_id': session_id},
     )
     
+    # Send the request as a message to the conversation's subscribers (for chat display)
+    await event_bus.publish(session_id, {
+        "type": "request",
+        "request": request,
+        "task_id": task_id,
+        "session_id": session_id
+    })
+
+    # Send task and get response
     try:
-        # Send task and get response
-        # Send the request as a message to the queue (for chat display)
-        await task_queue.put({
-            "type": "request",
-            "request": request,
-            "task_id": task_id,
-            "session_id": session_id
-        })
-
-        # Send task and get response
-        task = await client.send_task(request, self.task_callback)
-
-        # Send the response as a message to the queue (for chat display)
-        await task_queue.put({
-            "type": "response",
-            "task": task,
-            "task_id": task_id,
-            "session_id": session_id
-        })
-        
-        # Update session state
-        state['session_active'] = task.status.state not in [
-            TaskState.COMPLETED,
-            TaskState.CANCELED,
-            TaskState.FAILED,
-            TaskState.UNKNOWN,
-        ]
-        
-        # Handle task status
-        if task.status.state == TaskState.INPUT_REQUIRED:
-            tool_context.actions.skip_summarization = True
-            tool_context.actions.escalate = True
-            return []
-        elif task.status.state in [TaskState.CANCELED, TaskState.FAILED]:
-            raise ValueError(f"Task {task_id} {task.status.state.lower()}")
-        
-        # Collect and return response parts
-        response = []
-        if task.status.message and task.status.message.parts:
-            response.extend(task.status.message.parts)
-        if task.artifacts:
-            for artifact in task.artifacts:
-                if artifact.parts:
-                    response.extend(artifact.parts)
-        return response
-        
-    except Exception as e:
-        print(f"Error in send_task: {e}")
-        raise
-
+      task = await client.send_task(request, self.task_callback)
+    except asyncio.CancelledError:
+      # The turn was abandoned. Closing the request stops the remote run;
+      # record the task as canceled so it does not stay WORKING forever.
+      if self.task_callback:
+        self.task_callback(TaskStatusUpdateEvent(
+            id=task_id,
+            status=TaskStatus(state=TaskState.CANCELED),
+            final=True,
+        ), client.card)
+      raise
+    if task is None:
+      raise ValueError(f"No task returned from {agent_name}")
+
+    # Send the response as a message to the conversation's subscribers (for chat display)
+    await event_bus.publish(session_id, {
+        "type": "response",
+        "task": task,
+        "task_id": task_id,
+        "session_id": session_id
+    })
+    return task
+
+
+def remember_input_required(state, tasks: dict[str, tuple[str, Task]]):
+  """Keeps `input_required_tasks` (agent name -> task id) in session state.
+
+  `tasks` maps the id of each finished task to its agent name and task. A
+  task waiting for the user's answer stays listed, so send_task and
+  send_tasks resume it instead of starting a new task for that agent; if
+  several tasks of one agent wait, the one listed first is kept.
+  """
+  waiting = dict(state.get('input_required_tasks', {}))
+  for task_id, (agent_name, task) in tasks.items():
+    if task.status.state != TaskState.INPUT_REQUIRED and waiting.get(agent_name) == task_id:
+      del waiting[agent_name]
+  for task_id, (agent_name, task) in tasks.items():
+    if task.status.state == TaskState.INPUT_REQUIRED:
+      waiting.setdefault(agent_name, task_id)
+  state['input_required_tasks'] = waiting
+
+
+def task_response_parts(task: Task) -> list:
+  """Collects the parts of the status message and all artifacts of a task."""
+  response = []
+  if task.status.message and task.status.message.parts:
+    response.extend(task.status.message.parts)
+  if task.artifacts:
+    for artifact in task.artifacts:
+      if artifact.parts:
+        response.extend(artifact.parts)
+  return response
@@ -0,0 +1,41 @@
+from typing import Any, Literal, Union
+from pydantic import BaseModel
+from a2a_types import Message, TaskState
+
+
+class HostTextDelta(BaseModel):
+  """A piece of the host agent's answer, as the model produces it."""
+  type: Literal["text_delta"] = "text_delta"
+  conversation_id: str | None = None
+  text: str
+
+
+class HostToolCall(BaseModel):
+  """The host agent called one of its tools (e.g. send_task)."""
+  type: Literal["tool_call"] = "tool_call"
+  conversation_id: str | None = None
+  name: str
+  args: dict[str, Any] = {}
+
+
+class RemoteTaskUpdate(BaseModel):
+  """A status or artifact update from a remote agent's task."""
+  type: Literal["task_update"] = "task_update"
+  conversation_id: str | None = None
+  task_id: str
+  agent_name: str
+  state: TaskState | None = None
+  text: str | None = None
+  append: bool = False
+  final: bool = False
+
+
+class HostFinalMessage(BaseModel):
+  """The host agent's complete answer; always the last event of a turn."""
+  type: Literal["final"] = "final"
+  conversation_id: str | None = None
+  message: Message | None = None
+  usage: dict[str, float] | None = None  # prompt build time and tokens of the turn
+
+
+HostEvent = Union[HostTextDelta, HostToolCall, RemoteTaskUpdate, HostFinalMessage]
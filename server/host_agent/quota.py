@@ -0,0 +1,106 @@
+from contextlib import asynccontextmanager
+from typing import Any
+from server.metrics import REGISTRY
+from server.slot_queue import SlotQueue, SlotQueueFull, SlotWaitTimeout
+
+QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "host_agent_queue_wait_seconds", "Time tasks waited for a slot of an agent's quota", ["agent"])
+
+
+class AgentOverloadedError(Exception):
+  """Raised when an agent's wait queue is full or the wait timed out."""
+  pass
+
+
+class AgentQuota:
+  """Limits how many tasks the host runs on one remote agent at a time.
+
+  Up to `max_concurrent` tasks per replica run at once; up to `max_queue`
+  more wait, first come first served, for at most `wait_timeout` seconds.
+  Anything beyond that fails right away with AgentOverloadedError, which
+  the host LLM sees instead of a slow answer.
+  """
+
+  def __init__(
+      self,
+      name: str,
+      max_concurrent: int = 8,
+      max_queue: int = 16,
+      wait_timeout: float = 30.0,
+  ):
+    self.name = name
+    self.max_concurrent = max_concurrent
+    self.max_queue = max_queue
+    self.wait_timeout = wait_timeout
+    self.replicas = 1
+    self._slots = SlotQueue(
+        max_concurrent, max_queue, wait_timeout,
+        on_wait=lambda waited: QUEUE_WAIT_SECONDS.observe(waited, name))
+
+  @classmethod
+  def from_config(cls, name: str, config: dict | None) -> "AgentQuota":
+    """Builds the quota from `host_agent.concurrency`, with per-agent overrides."""
+    config = config or {}
+    overrides = config.get("agents", {}).get(name, {})
+    def get(key, default):
+      return overrides.get(key, config.get(key, default))
+    return cls(
+        name,
+        max_concurrent=get("max_concurrent", 8),
+        max_queue=get("max_queue", 16),
+        wait_timeout=get("wait_timeout", 30.0),
+    )
+
+  @property
+  def capacity(self) -> int:
+    return self.max_concurrent * max(self.replicas, 1)
+
+  @property
+  def active(self) -> int:
+    return self._slots.active
+
+  @property
+  def waiting(self) -> int:
+    return self._slots.waiting
+
+  def set_replicas(self, replicas: int):
+    self.replicas = replicas
+    self._slots.capacity = self.capacity
+
+  @asynccontextmanager
+  async def slot(self):
+    await self.acquire()
+    try:
+      yield
+    finally:
+      self.release()
+
+  async def acquire(self):
+    try:
+      await self._slots.acquire()
+    except SlotQueueFull as e:
+      raise AgentOverloadedError(
+          f"Agent {self.name} is overloaded ({self.active} tasks running, "
+          f"{self.waiting} waiting); try again later or use another agent") from e
+    except SlotWaitTimeout as e:
+      raise AgentOverloadedError(
+          f"Agent {self.name} is overloaded: no slot freed up within "
+          f"{self.wait_timeout}s; try again later or use another agent") from e
+
+  def release(self):
+    self._slots.release()
+
+  def metrics(self) -> dict[str, Any]:
+    stats = self._slots.stats
+    return {
+        "admitted": stats["admitted"],
+        "queued": stats["queued"],
+        "rejected": stats["rejected"],
+        "timed_out": stats["timed_out"],
+        "wait_seconds": stats["wait_seconds"],
+        "max_wait_seconds": stats["max_wait_seconds"],
+        "active": self.active,
+        "waiting": self.waiting,
+        "capacity": self.capacity,
+        "avg_wait_seconds": self._slots.average_wait,
+    }
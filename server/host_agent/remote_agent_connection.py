@@ -1,3 +1,4 @@
+import asyncio
 from typing import Callable
 import uuid
 from a2a_types import (
@@ -10,6 +11,8 @@ from a2a_types import (
     TaskState,
 )
 from client import A2AClient
+from .resilience import (
+    CircuitBreaker, CircuitOpenError, RetryPolicy, is_agent_failure, is_retryable, retry_after)
 
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
@@ -17,9 +20,17 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
   """A class to hold the connections to the remote agents."""
 
-  def __init__(self, agent_card: AgentCard):
+  def __init__(
+      self,
+      agent_card: AgentCard,
+      retry_policy: RetryPolicy | None = None,
+      breaker: CircuitBreaker | None = None,
+  ):
     self.agent_client = A2AClient(agent_card)
     self.card = agent_card
+    self.retry_policy = retry_policy or RetryPolicy()
+    self.breaker = breaker or CircuitBreaker()
+    self.stats = {"retries": 0}
 
     self.conversation_name = None
     self.conversation = None
@@ -28,10 +39,78 @@ class RemoteAgentConnections:
   def get_agent(self) -> AgentCard:
     return self.card
 
+  async def close(self):
+    await self.agent_client.close()
+
   async def send_task(
       self,
       request: TaskSendParams,
       task_callback: TaskUpdateCallback | None,
+  ) -> Task | None:
+    """Sends the task, retrying transient failures with backoff.
+
+    A streaming task is only retried if the failure came before its first
+    event; after that the caller has already seen part of the answer.
+    """
+    attempt = 1
+    while True:
+      if not self.breaker.allow():
+        raise CircuitOpenError(
+            f"Agent {self.card.name} is temporarily unavailable, try another agent or later")
+      progress = {"events": 0}
+      try:
+        task = await self._send_task(request, task_callback, progress)
+      except asyncio.CancelledError:
+        self.breaker.abandon()
+        raise
+      except Exception as e:
+        self.breaker.record(not is_agent_failure(e))
+        if (not is_retryable(e) or progress["events"] or
+            attempt >= self.retry_policy.max_attempts):
+          raise
+        self.stats["retries"] += 1
+        await asyncio.sleep(self.retry_policy.delay(attempt, retry_after(e)))
+        attempt += 1
+        continue
+      self.breaker.record(True)
+      return task
+
+  def replay(
+      self,
+      cached: Task,
+      request: TaskSendParams,
+      task_callback: TaskUpdateCallback | None,
+  ) -> Task:
+    """Turns a cached result into a fresh task for this request.
+
+    It goes through task_callback like a non-streaming response would, so
+    the host state and the UI cannot tell it apart from a live answer.
+    """
+    task = cached.model_copy(deep=True, update={
+        "id": request.id,
+        "sessionId": request.sessionId,
+        "history": [request.message],
+        "metadata": None,
+    })
+    merge_metadata(task, request)
+    if task.status.message:
+      task.status.message.metadata = None
+      merge_metadata(task.status.message, request.message)
+      m = task.status.message
+      if not m.metadata:
+        m.metadata = {}
+      if 'message_id' in m.metadata:
+        m.metadata['last_message_id'] = m.metadata['message_id']
+      m.metadata['message_id'] = str(uuid.uuid4())
+    if task_callback:
+      task_callback(task, self.card)
+    return task
+
+  async def _send_task(
+      self,
+      request: TaskSendParams,
+      task_callback: TaskUpdateCallback | None,
+      progress: dict | None = None,
   ) -> Task | None:
     if self.card.capabilities.streaming:
       task = None
@@ -47,6 +126,8 @@ class RemoteAgentConnections:
         ), self.card)
         
       async for response in self.agent_client.send_task_streaming(request.model_dump()):
+        if progress is not None:
+          progress["events"] += 1
         merge_metadata(response.result, request)
         if (hasattr(response.result, 'status') and
             hasattr(response.result.status, 'message') and
@@ -0,0 +1,267 @@
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any
+from a2a_types import AgentCard, Task, TaskSendParams
+from .remote_agent_connection import RemoteAgentConnections, TaskUpdateCallback
+from .resilience import CircuitOpenError
+from .quota import AgentQuota
+from .result_cache import ResultCache
+from server.metrics import REGISTRY
+import logging
+logger = logging.getLogger(__name__)
+
+REMOTE_TASK_SECONDS = REGISTRY.histogram(
+    "host_remote_task_seconds", "Round trip of a task to a remote agent", ["agent", "outcome"])
+
+
+class BalancingPolicy(str, Enum):
+  LEAST_OUTSTANDING = "least_outstanding"  # fewest tasks in flight
+  POWER_OF_TWO = "power_of_two"            # the less busy of two random replicas
+  EWMA = "ewma"                            # lowest smoothed latency, weighted by load
+
+
+class Replica:
+  """One process serving an agent, with the load and health the pool tracks."""
+
+  def __init__(self, connection: RemoteAgentConnections):
+    self.connection = connection
+    self.outstanding = 0
+    self.latency: float | None = None  # EWMA of task round trips, in seconds
+    self.healthy = True
+    self.failed_checks = 0
+
+  @property
+  def url(self) -> str:
+    return self.connection.card.url
+
+  @property
+  def usable(self) -> bool:
+    return self.healthy and self.connection.breaker.available
+
+  def cost(self) -> float:
+    # Unmeasured replicas cost nothing, so each one gets tried early.
+    return (self.latency or 0.0) * (self.outstanding + 1)
+
+  def snapshot(self) -> dict[str, Any]:
+    return {
+        "outstanding": self.outstanding,
+        "latency": round(self.latency, 4) if self.latency is not None else None,
+        "healthy": self.healthy,
+        **self.connection.stats,
+        "breaker": self.connection.breaker.snapshot(),
+    }
+
+
+class ReplicaPool:
+  """All replicas registered under one agent name.
+
+  Sends each task to one replica chosen by `policy`, among those that pass
+  their health check and whose circuit breaker is not open. A sessionId
+  sticks to the replica that served it first, because that replica's ADK
+  session service holds the conversation; it only moves if that replica
+  goes down. With more than one replica, every agent card is fetched every
+  `health_check_interval` seconds and a replica failing `unhealthy_after`
+  checks in a row is taken out until a check passes again. All tasks to
+  the agent first take a slot of its AgentQuota, which grows with the
+  number of replicas; answers found in the result cache do not need one.
+  """
+
+  def __init__(
+      self,
+      name: str,
+      policy: BalancingPolicy = BalancingPolicy.LEAST_OUTSTANDING,
+      health_check_interval: float = 10.0,
+      health_check_timeout: float = 2.0,
+      unhealthy_after: int = 2,
+      max_affinity_sessions: int = 10000,
+      ewma_alpha: float = 0.3,
+      quota: AgentQuota | None = None,
+      result_cache: ResultCache | None = None,
+  ):
+    self.name = name
+    self.policy = policy
+    self.health_check_interval = health_check_interval
+    self.health_check_timeout = health_check_timeout
+    self.unhealthy_after = unhealthy_after
+    self.max_affinity_sessions = max_affinity_sessions
+    self.ewma_alpha = ewma_alpha
+    self.quota = quota or AgentQuota(name)
+    self.result_cache = result_cache
+    self.replicas: dict[str, Replica] = {}
+    self._affinity: OrderedDict[str, str] = OrderedDict()  # sessionId -> replica url
+    self._health_task: asyncio.Task | None = None
+    self.stats = {"sent": 0, "affinity_hits": 0, "affinity_moves": 0}
+
+  @classmethod
+  def from_config(
+      cls,
+      name: str,
+      config: dict | None,
+      quota: AgentQuota | None = None,
+      result_cache: ResultCache | None = None) -> "ReplicaPool":
+    config = config or {}
+    return cls(
+        name,
+        policy=BalancingPolicy(config.get("policy", BalancingPolicy.LEAST_OUTSTANDING.value)),
+        health_check_interval=config.get("health_check_interval", 10.0),
+        health_check_timeout=config.get("health_check_timeout", 2.0),
+        unhealthy_after=config.get("unhealthy_after", 2),
+        max_affinity_sessions=config.get("max_affinity_sessions", 10000),
+        ewma_alpha=config.get("ewma_alpha", 0.3),
+        quota=quota,
+        result_cache=result_cache,
+    )
+
+  def __len__(self) -> int:
+    return len(self.replicas)
+
+  @property
+  def card(self) -> AgentCard:
+    return next(iter(self.replicas.values())).connection.card
+
+  def get_agent(self) -> AgentCard:
+    return self.card
+
+  @property
+  def available(self) -> bool:
+    return any(r.connection.breaker.available for r in self.replicas.values())
+
+  def add(self, connection: RemoteAgentConnections) -> RemoteAgentConnections | None:
+    """Adds a replica; returns the connection it replaces, if any."""
+    previous = self.replicas.get(connection.card.url)
+    self.replicas[connection.card.url] = Replica(connection)
+    self.quota.set_replicas(len(self.replicas))
+    return previous.connection if previous else None
+
+  def remove(self, url: str) -> RemoteAgentConnections | None:
+    replica = self.replicas.pop(url, None)
+    if replica is None:
+      return None
+    for session_id in [s for s, u in self._affinity.items() if u == url]:
+      del self._affinity[session_id]
+    self.quota.set_replicas(len(self.replicas))
+    return replica.connection
+
+  async def close(self):
+    if self._health_task is not None:
+      self._health_task.cancel()
+      self._health_task = None
+    for replica in list(self.replicas.values()):
+      await replica.connection.close()
+
+  async def send_task(
+      self,
+      request: TaskSendParams,
+      task_callback: TaskUpdateCallback | None,
+  ) -> Task | None:
+    key = None
+    if self.result_cache:
+      key = self.result_cache.key(self.card, request)
+      cached = self.result_cache.get(key) if key is not None else None
+      if cached is not None:
+        # The agent never sees this task, so its session is not started.
+        self.result_cache.replayed(self.card, request, cached)
+        return self.replicas[self.card.url].connection.replay(cached, request, task_callback)
+      request = self.result_cache.catch_up(self.card, request)
+      self.result_cache.track(self.card, request)
+    task = await self._send_live(request, task_callback)
+    if key is not None:
+      self.result_cache.put(key, task)
+    return task
+
+  async def _send_live(
+      self,
+      request: TaskSendParams,
+      task_callback: TaskUpdateCallback | None,
+  ) -> Task | None:
+    self._ensure_health_checks()
+    async with self.quota.slot():
+      replica = self.pick(request.sessionId)
+      replica.outstanding += 1
+      self.stats["sent"] += 1
+      started = time.monotonic()
+      outcome = "error"
+      try:
+        task = await replica.connection.send_task(request, task_callback)
+        outcome = "ok"
+      finally:
+        replica.outstanding -= 1
+        REMOTE_TASK_SECONDS.observe(time.monotonic() - started, self.name, outcome)
+    elapsed = time.monotonic() - started
+    replica.latency = (
+        elapsed if replica.latency is None
+        else self.ewma_alpha * elapsed + (1 - self.ewma_alpha) * replica.latency)
+    return task
+
+  def pick(self, session_id: str | None) -> Replica:
+    """The replica for a task of `session_id`, honouring session affinity."""
+    if session_id:
+      url = self._affinity.get(session_id)
+      replica = self.replicas.get(url) if url else None
+      if replica is not None and replica.usable:
+        self._affinity.move_to_end(session_id)
+        self.stats["affinity_hits"] += 1
+        return replica
+      if replica is not None:
+        self.stats["affinity_moves"] += 1
+    candidates = [r for r in self.replicas.values() if r.usable]
+    if not candidates:
+      # Health checks can lag behind; a closed breaker is the better signal.
+      candidates = [r for r in self.replicas.values() if r.connection.breaker.available]
+    if not candidates:
+      raise CircuitOpenError(
+          f"Agent {self.name} is temporarily unavailable, try another agent or later")
+    replica = self._choose(candidates)
+    if session_id:
+      self._affinity[session_id] = replica.url
+      self._affinity.move_to_end(session_id)
+      while len(self._affinity) > self.max_affinity_sessions:
+        self._affinity.popitem(last=False)
+    return replica
+
+  def _choose(self, candidates: list[Replica]) -> Replica:
+    if len(candidates) == 1:
+      return candidates[0]
+    if self.policy == BalancingPolicy.POWER_OF_TWO:
+      a, b = random.sample(candidates, 2)
+      return a if a.outstanding <= b.outstanding else b
+    random.shuffle(candidates)  # break ties evenly
+    if self.policy == BalancingPolicy.EWMA:
+      return min(candidates, key=Replica.cost)
+    return min(candidates, key=lambda r: r.outstanding)
+
+  def _ensure_health_checks(self):
+    if (self._health_task is None and len(self.replicas) > 1 and
+        self.health_check_interval > 0):
+      self._health_task = asyncio.create_task(self._check_health_loop())
+
+  async def _check_health_loop(self):
+    while True:
+      await asyncio.sleep(self.health_check_interval)
+      await asyncio.gather(*(self._check(r) for r in list(self.replicas.values())))
+
+  async def _check(self, replica: Replica):
+    try:
+      await replica.connection.agent_client.get_agent_card(timeout=self.health_check_timeout)
+    except Exception as e:
+      replica.failed_checks += 1
+      if replica.healthy and replica.failed_checks >= self.unhealthy_after:
+        replica.healthy = False
+        logger.warning(f"{self.name} replica {replica.url} is down: {e}")
+      return
+    if not replica.healthy:
+      logger.info(f"{self.name} replica {replica.url} is back")
+    replica.failed_checks = 0
+    replica.healthy = True
+
+  def metrics(self) -> dict[str, Any]:
+    return {
+        **self.stats,
+        "policy": self.policy.value,
+        "sessions": len(self._affinity),
+        "quota": self.quota.metrics(),
+        "replicas": {url: r.snapshot() for url, r in self.replicas.items()},
+    }
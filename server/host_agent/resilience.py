@@ -0,0 +1,193 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from collections import deque
+from enum import Enum
+from typing import Any
+import httpx
+from a2a_types import A2AClientHTTPError
+
+
+class CircuitOpenError(Exception):
+  """Raised instead of calling an agent whose circuit breaker is open."""
+  pass
+
+
+def http_status(error: BaseException) -> int | None:
+  if isinstance(error, A2AClientHTTPError) and error.args and isinstance(error.args[0], int):
+    return error.args[0]
+  return None
+
+
+def retry_after(error: BaseException) -> float | None:
+  """Seconds the server asked us to wait (`Retry-After`), if it said so.
+
+  The client raises A2AClientHTTPError from the httpx error, which still
+  holds the response and its headers.
+  """
+  cause = error.__cause__ if isinstance(error, A2AClientHTTPError) else error
+  if not isinstance(cause, httpx.HTTPStatusError):
+    return None
+  value = cause.response.headers.get("Retry-After")
+  if not value:
+    return None
+  try:
+    return max(float(value), 0.0)
+  except ValueError:
+    pass
+  try:
+    return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+  except (TypeError, ValueError):
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+  """Errors after which the same task can safely be sent again.
+
+  A connect error means the request never reached the agent; a 5xx means
+  the agent did not take it, and a 429 that its admission control shed it
+  before starting. Either way the retry reuses the task id, which the
+  agent's task manager upserts, so nothing runs twice under two ids.
+  """
+  if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+    return True
+  status = http_status(error)
+  return status is not None and (status >= 500 or status == 429)
+
+
+def is_agent_failure(error: BaseException) -> bool:
+  """Whether an error says something about the agent's health.
+
+  4xx responses are the caller's fault and do not count against the agent;
+  neither does a 429, which only says the agent is busy.
+  """
+  status = http_status(error)
+  return status is None or status >= 500
+
+
+class RetryPolicy:
+  """Exponential backoff with full jitter."""
+
+  def __init__(self, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 2.0):
+    self.max_attempts = max_attempts
+    self.base_delay = base_delay
+    self.max_delay = max_delay
+
+  @classmethod
+  def from_config(cls, config: dict | None) -> "RetryPolicy":
+    config = config or {}
+    return cls(
+        max_attempts=config.get("max_attempts", 3),
+        base_delay=config.get("base_delay", 0.2),
+        max_delay=config.get("max_delay", 2.0),
+    )
+
+  def delay(self, attempt: int, retry_after: float | None = None) -> float:
+    """Seconds to wait before retry number `attempt` (1-based).
+
+    A server's `Retry-After` wins over the backoff, capped at `max_delay`.
+    """
+    if retry_after is not None:
+      return min(retry_after, self.max_delay)
+    return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class BreakerState(str, Enum):
+  CLOSED = "closed"        # calls go through
+  OPEN = "open"            # calls fail fast until `open_seconds` have passed
+  HALF_OPEN = "half_open"  # one probe call decides whether to close again
+
+
+class CircuitBreaker:
+  """Per-agent breaker driven by the error rate of the last `window` seconds.
+
+  It opens once at least `min_calls` calls were made in the window and
+  `failure_rate` of them failed. After `open_seconds` a single probe is let
+  through; its outcome closes the breaker or opens it for another period.
+  """
+
+  def __init__(
+      self,
+      window: float = 60.0,
+      min_calls: int = 5,
+      failure_rate: float = 0.5,
+      open_seconds: float = 30.0,
+  ):
+    self.window = window
+    self.min_calls = min_calls
+    self.failure_rate = failure_rate
+    self.open_seconds = open_seconds
+    self.state = BreakerState.CLOSED
+    self._outcomes: deque[tuple[float, bool]] = deque()
+    self._opened_at = 0.0
+    self._probing = False
+    self.stats = {"opened": 0, "rejected": 0}
+
+  @classmethod
+  def from_config(cls, config: dict | None) -> "CircuitBreaker":
+    config = config or {}
+    return cls(
+        window=config.get("window", 60.0),
+        min_calls=config.get("min_calls", 5),
+        failure_rate=config.get("failure_rate", 0.5),
+        open_seconds=config.get("open_seconds", 30.0),
+    )
+
+  @property
+  def available(self) -> bool:
+    """False while open and not yet due for a probe."""
+    return (self.state != BreakerState.OPEN or
+            time.monotonic() - self._opened_at >= self.open_seconds)
+
+  def allow(self) -> bool:
+    """Whether a call may go out now; counts the call as the probe if half-open."""
+    if self.state == BreakerState.OPEN and self.available:
+      self.state = BreakerState.HALF_OPEN
+      self._probing = False
+    if self.state == BreakerState.CLOSED:
+      return True
+    if self.state == BreakerState.HALF_OPEN and not self._probing:
+      self._probing = True
+      return True
+    self.stats["rejected"] += 1
+    return False
+
+  def abandon(self):
+    """The call `allow` let through was cancelled; it says nothing either way."""
+    if self.state == BreakerState.HALF_OPEN:
+      self._probing = False
+
+  def record(self, ok: bool):
+    now = time.monotonic()
+    if self.state == BreakerState.OPEN:
+      return  # a call from before the breaker opened
+    if self.state == BreakerState.HALF_OPEN:
+      self._probing = False
+      if ok:
+        self.state = BreakerState.CLOSED
+        self._outcomes.clear()
+      else:
+        self._open(now)
+      return
+    self._outcomes.append((now, ok))
+    while self._outcomes and self._outcomes[0][0] < now - self.window:
+      self._outcomes.popleft()
+    failures = sum(1 for _, success in self._outcomes if not success)
+    if (len(self._outcomes) >= self.min_calls and
+        failures / len(self._outcomes) >= self.failure_rate):
+      self._open(now)
+
+  def snapshot(self) -> dict[str, Any]:
+    failures = sum(1 for _, ok in self._outcomes if not ok)
+    return {
+        **self.stats,
+        "state": self.state.value,
+        "calls": len(self._outcomes),
+        "failures": failures,
+    }
+
+  def _open(self, now: float):
+    self.state = BreakerState.OPEN
+    self._opened_at = now
+    self._outcomes.clear()
+    self.stats["opened"] += 1
@@ -0,0 +1,176 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+from a2a_types import AgentCard, Task, TaskSendParams, TaskState, TextPart
+from server.singleflight import normalize_query
+
+
+class ResultCache:
+  """LRU cache of completed remote-agent tasks.
+
+  Keyed by (agent name, agent version, normalized message text, selected
+  metadata). Only COMPLETED results are stored, so questions an agent asks
+  back (INPUT_REQUIRED) and failures are always sent again.
+
+  Only the first task of a session with an agent is looked up. A reply to
+  a task, or any later message of the same session, means something only
+  in its conversation ("yes", "2 adults") and has to reach the agent so
+  that its session records the turn. A hit never reaches the agent, so the
+  exchanges replayed in a session are kept and the next message of that
+  session carries them (`catch_up`), giving the agent the context it missed.
+  """
+
+  def __init__(
+      self,
+      ttl: float = 300.0,
+      max_entries: int = 1024,
+      agent_ttls: dict[str, float] | None = None,
+      metadata_keys: list[str] | None = None,
+      max_sessions: int = 10000,
+  ):
+    self.ttl = ttl
+    self.max_entries = max_entries
+    self.agent_ttls = agent_ttls or {}
+    self.metadata_keys = metadata_keys or []
+    self.max_sessions = max_sessions
+    self._entries: OrderedDict[Hashable, tuple[float, Task]] = OrderedDict()
+    # (agent name, sessionId or task id) already sent to that agent
+    self._started: OrderedDict[tuple[str, str], None] = OrderedDict()
+    # (agent name, sessionId) -> (question, answer) pairs the agent never saw
+    self._replayed: OrderedDict[tuple[str, str], list[tuple[str, str]]] = OrderedDict()
+    self.stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0,
+                  "continuations": 0, "expired": 0, "evicted": 0}
+
+  @classmethod
+  def from_config(cls, config: dict | None) -> "ResultCache | None":
+    """Builds the cache from `host_agent.result_cache`; None if disabled."""
+    if not config or not config.get("enabled", False):
+      return None
+    return cls(
+        ttl=config.get("ttl", 300.0),
+        max_entries=config.get("max_entries", 1024),
+        agent_ttls=config.get("agent_ttls"),
+        metadata_keys=config.get("metadata_keys"),
+        max_sessions=config.get("max_sessions", 10000),
+    )
+
+  def __len__(self) -> int:
+    return len(self._entries)
+
+  def key(self, card: AgentCard, request: TaskSendParams) -> Hashable | None:
+    """The cache key of a request, or None if it must not be cached."""
+    if self._ttl(card.name) <= 0:
+      return None
+    if self.continues(card, request):
+      self.stats["continuations"] += 1
+      return None
+    parts = request.message.parts
+    if not parts or not all(isinstance(p, TextPart) for p in parts):
+      return None
+    text = normalize_query(" ".join(p.text for p in parts))
+    metadata = {**(request.metadata or {}), **(request.message.metadata or {})}
+    selected = tuple((k, _freeze(metadata.get(k))) for k in self.metadata_keys)
+    return (card.name, card.version, text, selected)
+
+  def continues(self, card: AgentCard, request: TaskSendParams) -> bool:
+    """Whether the request continues a task or session the agent has seen,
+    or a session answered from the cache."""
+    if (card.name, request.id) in self._started:
+      return True
+    session = (card.name, request.sessionId)
+    return request.sessionId is not None and (session in self._started or session in self._replayed)
+
+  def track(self, card: AgentCard, request: TaskSendParams):
+    """Records that the request's task and session were sent to the agent."""
+    for ref in (request.id, request.sessionId):
+      if ref is not None:
+        self._started[(card.name, ref)] = None
+        self._started.move_to_end((card.name, ref))
+    while len(self._started) > 2 * self.max_sessions:
+      self._started.popitem(last=False)
+
+  def replayed(self, card: AgentCard, request: TaskSendParams, task: Task):
+    """Records that `task` answered the request from the cache."""
+    if request.sessionId is None:
+      return
+    session = (card.name, request.sessionId)
+    question = " ".join(p.text for p in request.message.parts if isinstance(p, TextPart))
+    self._replayed.setdefault(session, []).append((question, _answer_text(task)))
+    self._replayed.move_to_end(session)
+    while len(self._replayed) > self.max_sessions:
+      self._replayed.popitem(last=False)
+
+  def catch_up(self, card: AgentCard, request: TaskSendParams) -> TaskSendParams:
+    """The request with the exchanges replayed in its session put in front,
+    so an agent that never saw them can follow the conversation."""
+    if request.sessionId is None:
+      return request
+    exchanges = self._replayed.pop((card.name, request.sessionId), None)
+    if not exchanges:
+      return request
+    context = "\n".join(
+        f"Earlier in this conversation you were asked: {q}\nYou answered: {a}"
+        for q, a in exchanges)
+    message = request.message.model_copy(
+        update={"parts": [TextPart(text=context), *request.message.parts]})
+    return request.model_copy(update={"message": message})
+
+  def get(self, key: Hashable) -> Task | None:
+    entry = self._entries.get(key)
+    if entry is None:
+      self.stats["misses"] += 1
+      return None
+    expires_at, task = entry
+    if expires_at <= time.monotonic():
+      del self._entries[key]
+      self.stats["expired"] += 1
+      self.stats["misses"] += 1
+      return None
+    self._entries.move_to_end(key)
+    self.stats["hits"] += 1
+    return task
+
+  def put(self, key: Hashable, task: Task | None):
+    if task is None or task.status.state != TaskState.COMPLETED:
+      self.stats["bypassed"] += 1
+      return
+    self._entries[key] = (time.monotonic() + self._ttl(key[0]), task.model_copy(deep=True))
+    self._entries.move_to_end(key)
+    self.stats["stores"] += 1
+    while len(self._entries) > self.max_entries:
+      self._entries.popitem(last=False)
+      self.stats["evicted"] += 1
+
+  def invalidate(self, agent_name: str | None = None):
+    if agent_name is None:
+      self._entries.clear()
+      return
+    for key in [k for k in self._entries if k[0] == agent_name]:
+      del self._entries[key]
+
+  def metrics(self) -> dict[str, Any]:
+    lookups = self.stats["hits"] + self.stats["misses"]
+    return {
+        **self.stats,
+        "entries": len(self._entries),
+        "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+    }
+
+  def _ttl(self, agent_name: str) -> float:
+    return self.agent_ttls.get(agent_name, self.ttl)
+
+
+def _answer_text(task: Task) -> str:
+  """The text of a task's answer: its artifacts, else its status message."""
+  parts = [p for a in task.artifacts or [] for p in a.parts]
+  if not parts and task.status.message:
+    parts = task.status.message.parts
+  return "\n".join(p.text for p in parts if isinstance(p, TextPart))
+
+
+def _freeze(value: Any) -> Hashable:
+  if isinstance(value, dict):
+    return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+  if isinstance(value, list):
+    return tuple(_freeze(v) for v in value)
+  return value
@@ -0,0 +1,115 @@
+import math
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Iterable
+
+if TYPE_CHECKING:
+  from a2a_types import AgentCard
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset("""
+    a an and are as at be by can do for from get give how i in is it me my
+    near of on or please show some the this to what when where which with
+    you your
+""".split())
+
+
+def tokenize(text: str) -> list[str]:
+  """Lowercased word tokens, stopwords dropped, plural 's' stripped."""
+  tokens = []
+  for token in _TOKEN.findall(text.lower()):
+    if token in _STOPWORDS:
+      continue
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+      token = token[:-1]
+    tokens.append(token)
+  return tokens
+
+
+def card_document(card: "AgentCard") -> str:
+  """The text an agent is matched on: its card and every skill on it."""
+  texts = [card.name, card.description or ""]
+  for skill in card.skills or []:
+    texts.extend((skill.name, skill.description or ""))
+    texts.extend(skill.tags or [])
+    texts.extend(skill.examples or [])
+  return "\n".join(texts)
+
+
+class RouteMatch:
+  """A candidate agent for a query.
+
+  `confidence` is the relative margin of the best score over the runner-up,
+  or over the score floor when that is higher, so it is only high when one
+  agent clearly stands out. A lone match that barely clears the floor stays
+  low: sharing a word or two with one card is not a reason to skip the LLM.
+  """
+  __slots__ = ("agent_name", "score", "confidence")
+
+  def __init__(self, agent_name: str, score: float, confidence: float = 0.0):
+    self.agent_name = agent_name
+    self.score = score
+    self.confidence = confidence
+
+  def __repr__(self) -> str:
+    return (f"RouteMatch({self.agent_name!r}, score={self.score:.2f}, "
+            f"confidence={self.confidence:.2f})")
+
+
+class RoutingIndex:
+  """BM25 index over agent skills, used to pre-select agents for a message.
+
+  Built in process from the registered cards; scoring a query only walks
+  the postings of its own terms, so it stays well under a millisecond for
+  hundreds of agents.
+  """
+
+  def __init__(self, k1: float = 1.2, b: float = 0.75):
+    self.k1 = k1
+    self.b = b
+    self._names: list[str] = []
+    self._lengths: list[int] = []
+    self._postings: dict[str, list[tuple[int, int]]] = {}
+    self._idf: dict[str, float] = {}
+    self._avg_length = 0.0
+
+  def __len__(self) -> int:
+    return len(self._names)
+
+  def build(self, cards: Iterable["AgentCard"]):
+    self.build_documents((card.name, card_document(card)) for card in cards)
+
+  def build_documents(self, documents: Iterable[tuple[str, str]]):
+    """(agent name, text) pairs; replaces whatever was indexed before."""
+    self._names, self._lengths, self._postings = [], [], {}
+    for doc_id, (name, text) in enumerate(documents):
+      counts = Counter(tokenize(text))
+      self._names.append(name)
+      self._lengths.append(sum(counts.values()))
+      for term, tf in counts.items():
+        self._postings.setdefault(term, []).append((doc_id, tf))
+    n = len(self._names)
+    self._avg_length = sum(self._lengths) / n if n else 0.0
+    self._idf = {
+        term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+        for term, p in self._postings.items()
+    }
+
+  def route(self, query: str, top_k: int = 3, score_floor: float = 0.0) -> list[RouteMatch]:
+    """The best `top_k` agents for `query`; agents with no overlap are left out."""
+    scores: dict[int, float] = {}
+    k1, b, avg = self.k1, self.b, self._avg_length or 1.0
+    for term in set(tokenize(query)):
+      postings = self._postings.get(term)
+      if not postings:
+        continue
+      idf = self._idf[term]
+      for doc_id, tf in postings:
+        norm = k1 * (1 - b + b * self._lengths[doc_id] / avg)
+        scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:max(top_k, 2)]
+    matches = [RouteMatch(self._names[doc_id], score) for doc_id, score in ranked]
+    if matches:
+      runner_up = max(matches[1].score if len(matches) > 1 else 0.0, score_floor)
+      matches[0].confidence = max(matches[0].score - runner_up, 0.0) / matches[0].score
+    return matches[:top_k]
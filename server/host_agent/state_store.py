@@ -0,0 +1,101 @@
+from typing import Optional
+from a2a_types import Conversation, Message, Task
+
+
+class HostStateStore:
+  """Indexed in-memory state for the host manager.
+
+  Tasks, conversations and messages are kept in insertion-ordered dicts so
+  that lookups by id are O(1), while the per-conversation views preserve the
+  order in which messages and tasks arrived.
+  """
+
+  def __init__(self):
+    self._tasks: dict[str, Task] = {}
+    self._conversations: dict[str, Conversation] = {}
+    self._messages: list[Message] = []
+    self._messages_by_id: dict[str, Message] = {}
+    self._conversation_messages: dict[str, list[Message]] = {}
+
+  # Tasks
+
+  def add_task(self, task: Task):
+    self._tasks[task.id] = task
+    conversation = self.get_conversation(_conversation_id_of(task))
+    if conversation and task.id not in conversation.task_ids:
+      conversation.task_ids.append(task.id)
+
+  def get_task(self, task_id: Optional[str]) -> Optional[Task]:
+    if not task_id:
+      return None
+    return self._tasks.get(task_id)
+
+  def has_task(self, task_id: str) -> bool:
+    return task_id in self._tasks
+
+  def update_task(self, task: Task):
+    if task.id in self._tasks:
+      self._tasks[task.id] = task
+
+  def conversation_tasks(self, conversation_id: str) -> list[Task]:
+    conversation = self.get_conversation(conversation_id)
+    if not conversation:
+      return []
+    return [self._tasks[t] for t in conversation.task_ids if t in self._tasks]
+
+  # Conversations
+
+  def add_conversation(self, conversation: Conversation):
+    self._conversations[conversation.conversation_id] = conversation
+    self._conversation_messages.setdefault(conversation.conversation_id, [])
+
+  def get_conversation(
+      self,
+      conversation_id: Optional[str]
+  ) -> Optional[Conversation]:
+    if not conversation_id:
+      return None
+    return self._conversations.get(conversation_id)
+
+  # Messages
+
+  def add_message(self, message: Message):
+    self._messages.append(message)
+    if not message.metadata:
+      return
+    message_id = message.metadata.get('message_id')
+    if message_id:
+      self._messages_by_id[message_id] = message
+    conversation_id = message.metadata.get('conversation_id')
+    if conversation_id:
+      self._conversation_messages.setdefault(conversation_id, []).append(message)
+
+  def get_message(self, message_id: str) -> Optional[Message]:
+    return self._messages_by_id.get(message_id)
+
+  def conversation_messages(self, conversation_id: str) -> list[Message]:
+    return self._conversation_messages.get(conversation_id, [])
+
+  def last_agent_message(self, conversation_id: str) -> Optional[Message]:
+    for message in reversed(self.conversation_messages(conversation_id)):
+      if message.role != 'user':
+        return message
+    return None
+
+  @property
+  def tasks(self) -> list[Task]:
+    return list(self._tasks.values())
+
+  @property
+  def conversations(self) -> list[Conversation]:
+    return list(self._conversations.values())
+
+  @property
+  def messages(self) -> list[Message]:
+    return self._messages
+
+
+def _conversation_id_of(task: Task) -> Optional[str]:
+  if task.metadata and 'conversation_id' in task.metadata:
+    return task.metadata['conversation_id']
+  return task.sessionId
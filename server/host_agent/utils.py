@@ -1,13 +1,14 @@
-import requests
 from a2a_types import AgentCard
+from client import A2ACardResolver
 
-def get_agent_card(remote_agent_address: str) -> AgentCard:
+# Shared by the host manager, the registry and the UI backend so that every
+# card lookup goes through one connection pool and one cache.
+card_resolver = A2ACardResolver()
+
+async def get_agent_card(remote_agent_address: str) -> AgentCard | None:
   """Get the agent card."""
   try:
-    agent_card = requests.get(
-        f"{remote_agent_address}/.well-known/agent.json"
-    )
+    return await card_resolver.get_agent_card(remote_agent_address)
   except Exception as e:
     print(f"Error getting agent card: {e}")
     return None
-  return AgentCard(**agent_card.json())
\ No newline at end of file
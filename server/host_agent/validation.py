@@ -0,0 +1,174 @@
+import random
+import re
+import time
+import uuid
+from enum import Enum
+from typing import Any
+from google.adk import Runner
+from google.adk.agents import LlmAgent
+from google.adk.sessions.in_memory_session_service import InMemorySessionService
+from google.genai import types
+from server.metrics import REGISTRY
+
+_SCORE = re.compile(r"Score:\s*(\d{1,3})")
+
+VALIDATION_SECONDS = REGISTRY.histogram(
+    "host_validation_seconds", "Time the validator agent took per answer", ["agent"])
+
+# Phrases that suggest a remote agent was unsure or could not help.
+DEFAULT_LOW_CONFIDENCE_MARKERS = [
+    "not sure", "i think", "might", "may not", "unable to", "could not",
+    "couldn't", "can't", "cannot", "no results", "not found", "sorry",
+]
+
+
+class ValidationMode(str, Enum):
+  ALWAYS = "always"                  # validate every delegated answer
+  SAMPLED = "sampled"                # validate a random `sample_rate` share
+  LOW_CONFIDENCE = "low_confidence"  # validate short or hedging answers
+  POST_HOC = "post_hoc"              # answer now, validate in the background
+  OFF = "off"
+
+
+class AgentScores:
+  """Exponentially weighted validation score per remote agent."""
+
+  def __init__(self, alpha: float = 0.3):
+    self.alpha = alpha
+    self._scores: dict[str, float] = {}
+    self._counts: dict[str, int] = {}
+
+  def record(self, agent_name: str, score: float):
+    previous = self._scores.get(agent_name)
+    self._scores[agent_name] = (
+        score if previous is None
+        else self.alpha * score + (1 - self.alpha) * previous)
+    self._counts[agent_name] = self._counts.get(agent_name, 0) + 1
+
+  def get(self, agent_name: str) -> tuple[float | None, int]:
+    return self._scores.get(agent_name), self._counts.get(agent_name, 0)
+
+  def snapshot(self) -> dict[str, dict[str, Any]]:
+    return {
+        name: {"score": round(score, 1), "validations": self._counts[name]}
+        for name, score in self._scores.items()
+    }
+
+
+class ValidationPolicy:
+  """Decides which delegated answers go through the validator agent.
+
+  Configured by `host_agent.validation` in agent_config.json. Whatever the
+  mode (except `always`), an agent whose running score is at least
+  `trusted_score` after `trusted_after` validations is only validated at
+  `trusted_sample_rate`.
+  """
+
+  def __init__(self, config: dict | None = None):
+    config = config or {}
+    self.mode = ValidationMode(config.get("mode", ValidationMode.ALWAYS.value))
+    self.sample_rate = config.get("sample_rate", 0.2)
+    self.min_response_chars = config.get("min_response_chars", 80)
+    self.low_confidence_markers = [
+        m.lower() for m in config.get("low_confidence_markers", DEFAULT_LOW_CONFIDENCE_MARKERS)
+    ]
+    self.pass_score = config.get("pass_score", 80)
+    self.trusted_score = config.get("trusted_score", 90)
+    self.trusted_after = config.get("trusted_after", 5)
+    self.trusted_sample_rate = config.get("trusted_sample_rate", 0.05)
+    self.scores = AgentScores(config.get("ewma_alpha", 0.3))
+    self.stats = {"checked": 0, "validated": 0, "skipped_trusted": 0, "failed": 0}
+
+  @property
+  def background(self) -> bool:
+    return self.mode == ValidationMode.POST_HOC
+
+  def should_validate(self, agent_name: str, response_text: str) -> bool:
+    self.stats["checked"] += 1
+    if self.mode == ValidationMode.OFF:
+      return False
+    if self.mode == ValidationMode.ALWAYS:
+      return self._chosen()
+    score, count = self.scores.get(agent_name)
+    if score is not None and count >= self.trusted_after and score >= self.trusted_score:
+      if random.random() >= self.trusted_sample_rate:
+        self.stats["skipped_trusted"] += 1
+        return False
+      return self._chosen()
+    if self.mode == ValidationMode.SAMPLED:
+      return random.random() < self.sample_rate and self._chosen()
+    if self.mode == ValidationMode.LOW_CONFIDENCE:
+      return self.looks_low_confidence(response_text) and self._chosen()
+    return self._chosen()  # post-hoc validates everything, off the critical path
+
+  def looks_low_confidence(self, response_text: str) -> bool:
+    text = response_text.strip().lower()
+    if len(text) < self.min_response_chars:
+      return True
+    return any(marker in text for marker in self.low_confidence_markers)
+
+  def record(self, agent_name: str, score: int | None):
+    if score is None:
+      return
+    self.scores.record(agent_name, score)
+    if score < self.pass_score:
+      self.stats["failed"] += 1
+
+  def _chosen(self) -> bool:
+    self.stats["validated"] += 1
+    return True
+
+
+class Validator:
+  """Runs the validator agent outside of the host LLM's tool loop."""
+
+  def __init__(self, agent: LlmAgent, policy: ValidationPolicy):
+    self.agent = agent
+    self.policy = policy
+    self.app_name = "A2A-validator"
+    self.user_id = "host_agent"
+    self._session_service = InMemorySessionService()
+    self._runner = Runner(
+        app_name=self.app_name,
+        agent=agent,
+        session_service=self._session_service,
+    )
+
+  async def validate(
+      self,
+      user_request: str,
+      agent_name: str,
+      response_text: str,
+      state: dict) -> tuple[int | None, str]:
+    """Returns the validator's score (None if it gave none) and its verdict.
+
+    `state` seeds the validator's session so a re-delegation through its
+    send_task tool lands in the same conversation.
+    """
+    session = self._session_service.create_session(
+        app_name=self.app_name,
+        user_id=self.user_id,
+        state={**state, "validating": True, "agent": agent_name},
+        session_id=str(uuid.uuid4()),
+    )
+    content = types.Content(role="user", parts=[types.Part.from_text(text=(
+        f"User request:\n{user_request}\n\n"
+        f"Responding agent: {agent_name}\n\n"
+        f"Response:\n{response_text}"
+    ))])
+    verdict = ""
+    started = time.perf_counter()
+    try:
+      async for event in self._runner.run_async(
+          user_id=self.user_id, session_id=session.id, new_message=content
+      ):
+        if event.is_final_response() and event.content and event.content.parts:
+          verdict = "\n".join(p.text for p in event.content.parts if p.text)
+    finally:
+      VALIDATION_SECONDS.observe(time.perf_counter() - started, agent_name)
+      self._session_service.delete_session(
+          app_name=self.app_name, user_id=self.user_id, session_id=session.id)
+    match = _SCORE.search(verdict)
+    score = min(int(match.group(1)), 100) if match else None
+    self.policy.record(agent_name, score)
+    return score, verdict
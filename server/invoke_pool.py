@@ -0,0 +1,72 @@
+import asyncio
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable
+from server.admission import AdmissionRejectedError
+
+class InvokePoolFullError(AdmissionRejectedError):
+    """Raised when every worker is busy and the wait queue is full; like an
+    admission rejection, the server answers 429 with Retry-After."""
+    pass
+
+class InvokePool:
+    """Runs blocking agent calls off the event loop with bounded concurrency.
+
+    At most `max_workers` calls run at once and at most `max_queue` callers
+    wait for a slot; beyond that `run` fails fast with InvokePoolFullError.
+    If the awaiting caller is cancelled (e.g. the client disconnected), a
+    call that has not started is dropped; one that has started keeps its
+    slot until it returns, so the limit always reflects real work.
+
+    A custom executor may be passed (e.g. a ProcessPoolExecutor), in which
+    case the function and its arguments must be picklable.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        max_queue: int = 32,
+        executor: Executor | None = None,
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="agent-invoke"
+        )
+        self._slots: asyncio.Semaphore | None = None
+        self.waiting = 0
+        self.running = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            raise InvokePoolFullError(
+                f"{self.running} calls running and {self.waiting} waiting"
+            )
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+
+        loop = asyncio.get_running_loop()
+        self.running += 1
+        try:
+            future: Future = self._executor.submit(partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _release(self):
+        self.running -= 1
+        self._slots.release()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
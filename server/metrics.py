@@ -0,0 +1,225 @@
+import os
+import re
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, NamedTuple
+
+# Covers fast JSON-RPC calls as well as LLM runs that take minutes.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_INVALID_NAME = re.compile(r"[^a-zA-Z0-9_]")
+
+class Sample(NamedTuple):
+    """One value reported by a collector at scrape time."""
+    name: str
+    labels: dict[str, str]
+    value: float
+    kind: str = "gauge"
+    help: str = ""
+
+class _Metric:
+    """Base of the instruments; each records a value first, then one label
+    value per label name, e.g. `observe(seconds, method)`."""
+    kind = ""
+
+    def __init__(self, registry: "Registry", name: str, help: str, labelnames: Iterable[str]):
+        self._registry = registry
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _records(self, labels: tuple) -> bool:
+        """Whether to record a value; a wrong label count is a bug, not data."""
+        if not self._registry.enabled:
+            return False
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labels}")
+        return True
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        if not self._records(labels):
+            return
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        for labels, value in self._values.items():
+            yield self.name, labels, value
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self._values: dict[tuple, float] = {}
+
+    def set(self, value: float, *labels: str):
+        if not self._records(labels):
+            return
+        self._values[labels] = value
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        if not self._records(labels):
+            return
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, *labels: str):
+        self.inc(-amount, *labels)
+
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        for labels, value in self._values.items():
+            yield self.name, labels, value
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket (last one is +Inf), sum]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels: str):
+        if not self._records(labels):
+            return
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def samples(self) -> Iterable[tuple[str, tuple, float]]:
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts, strict=True):
+                cumulative += count
+                yield self.name + "_bucket", labels + (("le", _format_value(bound)),), cumulative
+            yield self.name + "_sum", labels, total
+            yield self.name + "_count", labels, cumulative
+
+class Registry:
+    """Counters, gauges and histograms rendered in the Prometheus text format.
+
+    Instruments are cheap to call and do nothing at all when the registry is
+    disabled. Values that already live elsewhere (queue depths, store sizes,
+    the stats dicts of the various components) are not copied on every
+    change; collectors read them when `/metrics` is scraped.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Histogram(self, name, help, labelnames, buckets=buckets)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def unregister_collector(self, collector: Callable[[], Iterable[Sample]]):
+        if collector in self._collectors:
+            self._collectors.remove(collector)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                pairs = list(zip(metric.labelnames, labels[:len(metric.labelnames)], strict=True))
+                pairs.extend(labels[len(metric.labelnames):])  # histogram "le"
+                lines.append(f"{name}{_format_labels(pairs)} {_format_value(value)}")
+        families: dict[str, list[Sample]] = {}
+        for collector in self._collectors:
+            for sample in collector():
+                families.setdefault(sample.name, []).append(sample)
+        for name, samples in families.items():
+            first = samples[0]
+            if first.help:
+                lines.append(f"# HELP {name} {first.help}")
+            lines.append(f"# TYPE {name} {first.kind}")
+            for sample in samples:
+                lines.append(
+                    f"{name}{_format_labels(sample.labels.items())} {_format_value(sample.value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+    def _get(self, cls, name: str, help: str, labelnames: Iterable[str]):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(self, name, help, labelnames)
+        return metric
+
+def stats_samples(
+    prefix: str,
+    stats: dict[str, Any],
+    labels: dict[str, str] | None = None,
+    label_maps: dict[str, str] | None = None,
+    counters: Iterable[str] = (),
+) -> Iterable[Sample]:
+    """Turns a (nested) stats dict into samples named `prefix_key`.
+
+    Nested dicts extend the name; a key listed in `label_maps` holds a dict
+    per entity (e.g. per agent) and becomes a label instead. Keys listed in
+    `counters`, at any depth, only ever increase and are exported as
+    `prefix_key_total` counters so `rate()` works on them; everything else
+    is a point-in-time gauge. Values that are not numbers are skipped.
+    """
+    labels = labels or {}
+    label_maps = label_maps or {}
+    counters = frozenset(counters)
+    for key, value in stats.items():
+        if key in label_maps and isinstance(value, dict):
+            for entity, entity_stats in value.items():
+                if isinstance(entity_stats, dict):
+                    yield from stats_samples(
+                        prefix, entity_stats, {**labels, label_maps[key]: str(entity)},
+                        label_maps, counters,
+                    )
+        elif isinstance(value, dict):
+            yield from stats_samples(f"{prefix}_{key}", value, labels, label_maps, counters)
+        elif isinstance(value, (int, float)):
+            name = _INVALID_NAME.sub("_", f"{prefix}_{key}")
+            if key in counters:
+                yield Sample(name + "_total", labels, float(value), kind="counter")
+            else:
+                yield Sample(name, labels, float(value))
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs)
+    return "{" + rendered + "}" if rendered else ""
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+# Process-wide registry; set A2A_METRICS=0 to turn every instrument into a no-op.
+REGISTRY = Registry(enabled=os.environ.get("A2A_METRICS", "1").lower() not in ("0", "false", "no"))
@@ -1,12 +1,41 @@
-from a2a_types import AgentCard, A2ARequest, GetTaskRequest, SendTaskRequest, JSONRPCResponse
-from starlette.responses import JSONResponse
+import asyncio
+import hashlib
+import time
+from email.utils import formatdate
+from a2a_types import AgentCard, A2ARequest, GetTaskRequest, SendTaskRequest, JSONRPCResponse, JSONRPCError, ServerBusyError
+from starlette.responses import JSONResponse, Response
 from starlette.requests import Request
 from sse_starlette.sse import EventSourceResponse
 from fastapi.encoders import jsonable_encoder
 from server.task_manager import TaskManager
+from server.admission import AdmissionControl, AdmissionPolicy, AdmissionRejectedError, AdmittedStream
+from server.metrics import REGISTRY, CONTENT_TYPE, Sample, stats_samples
 from a2a_types import SendTaskStreamingRequest
-from typing import AsyncIterable, Any
+from typing import AsyncIterable, Any, Iterable
 from fastapi import FastAPI
+import logging
+logger = logging.getLogger(__name__)
+
+# How often a pending non-streaming request checks whether its client left.
+DISCONNECT_POLL_INTERVAL = 0.5
+# How long clients may reuse the agent card before revalidating it.
+AGENT_CARD_MAX_AGE = 300
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "a2a_server_request_seconds",
+    "Time to answer a JSON-RPC request (to the last event for streams)", ["method"])
+FIRST_EVENT_SECONDS = REGISTRY.histogram(
+    "a2a_server_first_event_seconds", "Time from request to the first SSE event", ["method"])
+SSE_EVENTS = REGISTRY.counter("a2a_server_sse_events_total", "SSE events sent", ["method"])
+SHED_REQUESTS = REGISTRY.counter(
+    "a2a_server_shed_total", "Requests rejected by admission control", ["method"])
+# Stats keys that only ever increase; exported as counters, the rest as gauges.
+ADMISSION_COUNTERS = ("admitted", "queued", "rejected_full", "rejected_timeout", "wait_seconds")
+TASK_MANAGER_COUNTERS = (
+    "acquisitions", "wait_seconds",  # locks
+    "evicted_lru", "evicted_ttl", "history_trimmed", "artifacts_trimmed",  # retention
+    "executions", "coalesced", "cancelled",  # singleflight
+)
 
 class A2AServer:
     def __init__(
@@ -15,26 +44,67 @@ class A2AServer:
         task_manager: TaskManager,
         host: str = "localhost",
         port: int = 10000,
+        card_max_age: int = AGENT_CARD_MAX_AGE,
+        admission_policy: AdmissionPolicy | None = None,
     ):
         self.agent_card = agent_card
         self.task_manager = task_manager
         self.host = host
         self.port = port
+        self.card_max_age = card_max_age
+        # Only new work is admitted or shed; tasks/get and card reads never wait
+        self.admission = AdmissionControl(admission_policy)
+        self._prepare_agent_card()
         self.app = FastAPI()
         self._setup_routes()
 
+    def _prepare_agent_card(self):
+        """Serializes the card once; every card request reuses the bytes."""
+        if self.agent_card is None:
+            self._card_body = None
+            return
+        self._card_body = self.agent_card.model_dump_json(exclude_none=True).encode()
+        self._card_headers = {
+            "ETag": '"' + hashlib.sha256(self._card_body).hexdigest()[:32] + '"',
+            "Last-Modified": formatdate(usegmt=True),
+            "Cache-Control": f"max-age={self.card_max_age}",
+        }
+
     def _setup_routes(self):
+        # The collector is only registered while the app runs, so a server
+        # that is shut down (or never started) leaves no series behind.
+        @self.app.on_event("startup")
+        async def startup():
+            REGISTRY.register_collector(self._collect_metrics)
+
+        @self.app.on_event("shutdown")
+        async def shutdown():
+            REGISTRY.unregister_collector(self._collect_metrics)
+            close = getattr(self.task_manager, "close", None)
+            if close is not None:
+                await close()
+
         @self.app.get("/")
-        async def get_agent_card():
-            return self.agent_card.model_dump(exclude_none=True)
+        async def get_agent_card(request: Request):
+            return self._get_agent_card(request)
 
         @self.app.post("/")
         async def handle_post_request(request: Request):
             return await self._handle_request(request)
 
         @self.app.get("/.well-known/agent.json")
-        async def get_agent_card_json():
-            return self.agent_card.model_dump(exclude_none=True)
+        async def get_agent_card_json(request: Request):
+            return self._get_agent_card(request)
+
+        @self.app.get("/metrics")
+        async def get_metrics():
+            if not REGISTRY.enabled:
+                return Response(status_code=404)
+            return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+        @self.app.get("/admission")
+        async def get_admission_stats():
+            return self.admission.metrics()
 
         @self.app.post("/task")
         async def create_task(task):
@@ -59,32 +129,128 @@ class A2AServer:
 
         uvicorn.run(self.app, host=self.host, port=self.port)
     
-    def _get_agent_card(self, request: Request) -> JSONResponse:
-        return JSONResponse(self.agent_card.model_dump(exclude_none=True))
+    def _get_agent_card(self, request: Request) -> Response:
+        if self._card_body is None:
+            raise ValueError("agent_card is not defined")
+        headers = self._card_headers
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            if headers["ETag"] in (tag.strip() for tag in if_none_match.split(",")):
+                return Response(status_code=304, headers=headers)
+        elif request.headers.get("if-modified-since") == headers["Last-Modified"]:
+            return Response(status_code=304, headers=headers)
+        return Response(self._card_body, media_type="application/json", headers=headers)
         
     async def _handle_request(self, request: Request):
+        started = time.perf_counter()
         body = await request.json()
         json_rpc_request = A2ARequest.validate_python(body)
+        method = json_rpc_request.method
         
         if isinstance(json_rpc_request, GetTaskRequest):
             result = await self.task_manager.on_get_task(json_rpc_request)
-            return self._create_response(result)
+            return self._create_response(result, method, started)
         elif isinstance(json_rpc_request, SendTaskRequest):
-            result = await self.task_manager.on_send_task(json_rpc_request)
-            return self._create_response(result)
+            try:
+                result = await self._cancel_on_disconnect(
+                    request, json_rpc_request,
+                    self._admitted(self.task_manager.on_send_task(json_rpc_request)),
+                )
+            except AdmissionRejectedError as e:
+                return self._busy_response(json_rpc_request, e)
+            return self._create_response(result, method, started)
         elif isinstance(json_rpc_request, SendTaskStreamingRequest):
-            result = await self.task_manager.on_send_task_subscribe(json_rpc_request)
+            try:
+                await self.admission.acquire()
+            except AdmissionRejectedError as e:
+                return self._busy_response(json_rpc_request, e)
+            try:
+                result = await self.task_manager.on_send_task_subscribe(json_rpc_request)
+            except BaseException:
+                self.admission.release()
+                raise
+            if isinstance(result, AsyncIterable):
+                result = AdmittedStream(result, self.admission)
+            else:
+                self.admission.release()
         else:
             raise ValueError(f"Unexpected request type: {type(request)}")
-        return self._create_response(result)
+        return self._create_response(result, method, started)
     
-    def _create_response(self, result: Any) -> JSONResponse | EventSourceResponse:
+    async def _cancel_on_disconnect(self, request: Request, json_rpc_request, coro):
+        """Awaits `coro`, cancelling it if the HTTP client goes away first."""
+        task = asyncio.ensure_future(coro)
+        while True:
+            try:
+                done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                logger.info(f"Client disconnected, cancelled request {json_rpc_request.id}")
+                return JSONRPCResponse(
+                    id=json_rpc_request.id,
+                    error=JSONRPCError(code=-32000, message="Client disconnected"),
+                )
+
+    async def _admitted(self, coro):
+        """Awaits `coro` once the task is admitted, holding its slot meanwhile."""
+        try:
+            await self.admission.acquire()
+        except BaseException:
+            coro.close()
+            raise
+        try:
+            return await coro
+        finally:
+            self.admission.release()
+
+    def _busy_response(self, json_rpc_request, error: AdmissionRejectedError) -> JSONResponse:
+        logger.warning(f"Shedding request {json_rpc_request.id}: {error}")
+        SHED_REQUESTS.inc(1, json_rpc_request.method)
+        response = JSONRPCResponse(id=json_rpc_request.id, error=ServerBusyError())
+        return JSONResponse(
+            status_code=429,
+            content=jsonable_encoder(response.model_dump(exclude_none=True)),
+            headers={"Retry-After": str(self.admission.policy.retry_after)},
+        )
+
+    def _create_response(
+        self, result: Any, method: str = "", started: float | None = None
+    ) -> JSONResponse | EventSourceResponse:
+        if started is None:
+            started = time.perf_counter()
         if isinstance(result, AsyncIterable):
             async def event_generator(result) -> AsyncIterable[dict[str, str]]:
-                async for item in result:
-                    yield {"data": item.model_dump_json(exclude_none=True)}
+                events = 0
+                try:
+                    async for item in result:
+                        if not events:
+                            FIRST_EVENT_SECONDS.observe(time.perf_counter() - started, method)
+                        events += 1
+                        yield {"data": item.model_dump_json(exclude_none=True)}
+                finally:
+                    SSE_EVENTS.inc(events, method)
+                    REQUEST_SECONDS.observe(time.perf_counter() - started, method)
             return EventSourceResponse(event_generator(result))
         elif isinstance(result, JSONRPCResponse):
+            REQUEST_SECONDS.observe(time.perf_counter() - started, method)
             return JSONResponse(content=jsonable_encoder(result.model_dump(exclude_none=True)))
         else:
             raise ValueError("Invalid response type")
+
+    def _collect_metrics(self) -> Iterable[Sample]:
+        """Admission and task manager state, read at scrape time."""
+        labels = {"agent": self.agent_card.name} if self.agent_card else {}
+        yield from stats_samples(
+            "a2a_server_admission", self.admission.metrics(), labels, counters=ADMISSION_COUNTERS
+        )
+        task_manager_metrics = getattr(self.task_manager, "metrics", None)
+        if task_manager_metrics is not None:
+            yield from stats_samples(
+                "a2a_server_task_manager", task_manager_metrics(), labels,
+                counters=TASK_MANAGER_COUNTERS,
+            )
@@ -0,0 +1,147 @@
+import asyncio
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Hashable
+import logging
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_TRAILING = re.compile(r"[\s.!?]+$")
+
+
+def normalize_query(text: str) -> str:
+    """Case, whitespace and trailing punctuation do not change the answer.
+
+    Also keys the host's result cache, so coalescing and caching agree on
+    which questions are the same.
+    """
+    return _TRAILING.sub("", _WHITESPACE.sub(" ", text.strip().lower()))
+
+
+class FanOut:
+    """Replay buffer of one shared execution.
+
+    Every item the execution produces is kept until it finishes, so a
+    subscriber that joins late first replays what it missed and then
+    follows along live.
+    """
+
+    def __init__(self):
+        self.items: list[Any] = []
+        self.done = False
+        self.error: BaseException | None = None
+        self._signal = asyncio.Event()
+
+    def publish(self, item: Any):
+        self.items.append(item)
+        self._wake()
+
+    def close(self, error: BaseException | None = None):
+        self.done = True
+        self.error = error
+        self._wake()
+
+    async def replay(self) -> AsyncIterator[Any]:
+        position = 0
+        while True:
+            signal = self._signal
+            while position < len(self.items):
+                yield self.items[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await signal.wait()
+
+    def _wake(self):
+        self._signal.set()
+        self._signal = asyncio.Event()
+
+
+class _Flight:
+    def __init__(self, session_id: str):
+        self.fan_out = FanOut()
+        self.sessions = [session_id]  # the first one runs the execution
+        self.subscribers = 0
+        self.task: asyncio.Task | None = None
+
+
+class Singleflight:
+    """Lets identical requests share one in-flight execution.
+
+    The first caller for a key starts `source()` in a background task; every
+    caller, the first included, reads its items from the flight's FanOut,
+    so each gets a full copy of the stream no matter when it joined. The
+    execution is cancelled only once all of its subscribers have left.
+    When it finishes without error, `on_shared(first_session, others)` is
+    called before the subscribers see the end of the stream, so the other
+    callers' sessions can pick up whatever the run left behind.
+
+    Flights are forgotten as soon as they finish: this coalesces
+    concurrent work and is not a result cache.
+    """
+
+    def __init__(
+        self,
+        on_shared: Callable[[str, list[str]], None] | None = None,
+    ):
+        self.on_shared = on_shared
+        self._flights: dict[Hashable, _Flight] = {}
+        self.stats = {"executions": 0, "coalesced": 0, "cancelled": 0}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def subscribe(
+        self,
+        key: Hashable,
+        session_id: str,
+        source: Callable[[], AsyncIterable[Any]],
+    ) -> AsyncIterator[Any]:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(session_id)
+            flight.task = asyncio.create_task(self._run(key, flight, source))
+            self.stats["executions"] += 1
+        else:
+            flight.sessions.append(session_id)
+            self.stats["coalesced"] += 1
+        flight.subscribers += 1
+        try:
+            async for item in flight.fan_out.replay():
+                yield item
+        finally:
+            flight.subscribers -= 1
+            if not flight.subscribers and not flight.fan_out.done:
+                # Nobody is left to read it; later callers start afresh
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    async def _run(self, key: Hashable, flight: _Flight, source):
+        fan_out = flight.fan_out
+        try:
+            async for item in source():
+                fan_out.publish(item)
+        except asyncio.CancelledError as e:
+            self.stats["cancelled"] += 1
+            fan_out.close(e)
+        except Exception as e:
+            logger.warning(f"Shared execution failed for {len(flight.sessions)} callers: {e}")
+            fan_out.close(e)
+        else:
+            self._share(flight)
+            fan_out.close()
+        finally:
+            self._forget(key, flight)
+
+    def _share(self, flight: _Flight):
+        if self.on_shared is None or len(flight.sessions) < 2:
+            return
+        try:
+            self.on_shared(flight.sessions[0], flight.sessions[1:])
+        except Exception as e:
+            logger.warning(f"Could not share session {flight.sessions[0]}: {e}")
+
+    def _forget(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
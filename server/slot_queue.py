@@ -0,0 +1,123 @@
+import asyncio
+import time
+from collections import deque
+from typing import Callable
+
+class SlotQueueFull(Exception):
+    """Raised by `SlotQueue.acquire` when no slot is free and the queue is full."""
+    pass
+
+class SlotWaitTimeout(Exception):
+    """Raised by `SlotQueue.acquire` when no slot freed up in time."""
+    pass
+
+class SlotQueue:
+    """A semaphore with a bounded FIFO queue of waiters.
+
+    Up to `capacity` holders run at once (`None` means no limit); up to
+    `max_waiting` more wait, first come first served, for at most `timeout`
+    seconds. A freed slot goes straight to the longest-waiting caller, so a
+    newcomer can never overtake the queue. Used by the agent servers'
+    admission control and by the host's per-agent quotas. `on_wait` is
+    called with the seconds every queued caller spent waiting.
+    """
+
+    def __init__(
+        self,
+        capacity: int | None,
+        max_waiting: int,
+        timeout: float,
+        on_wait: Callable[[float], None] | None = None,
+    ):
+        self._capacity = capacity
+        self.on_wait = on_wait
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "rejected": 0,
+            "timed_out": 0,
+            "wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "max_active": 0,
+        }
+
+    @property
+    def capacity(self) -> int | None:
+        return self._capacity
+
+    @capacity.setter
+    def capacity(self, capacity: int | None):
+        self._capacity = capacity
+        self._hand_over()
+
+    async def acquire(self):
+        if self._has_room() and not self.waiting:
+            self._admitted()
+            return
+        if self.waiting >= self.max_waiting:
+            self.stats["rejected"] += 1
+            raise SlotQueueFull(f"{self.active} running and {self.waiting} waiting")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.waiting += 1
+        self.stats["queued"] += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if not self._give_up(waiter):
+                self.stats["timed_out"] += 1
+                raise SlotWaitTimeout(f"No slot freed up within {self.timeout}s")
+        except asyncio.CancelledError:
+            if self._give_up(waiter):
+                self.release()  # the slot arrived as we were cancelled; pass it on
+            raise
+        finally:
+            self.waiting -= 1
+            waited = time.monotonic() - started
+            self.stats["wait_seconds"] += waited
+            self.stats["max_wait_seconds"] = max(self.stats["max_wait_seconds"], waited)
+            if self.on_wait is not None:
+                self.on_wait(waited)
+        self.stats["admitted"] += 1
+
+    def release(self):
+        self.active -= 1
+        self._hand_over()
+
+    @property
+    def average_wait(self) -> float:
+        """Mean wait of the callers that were queued and are done waiting."""
+        waits = self.stats["queued"] - self.waiting
+        return self.stats["wait_seconds"] / waits if waits else 0.0
+
+    def _has_room(self) -> bool:
+        return self._capacity is None or self.active < self._capacity
+
+    def _admitted(self):
+        self.active += 1
+        self.stats["admitted"] += 1
+        self._track_peak()
+
+    def _hand_over(self):
+        while self._waiters and self._has_room():
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.active += 1
+                self._track_peak()
+                waiter.set_result(None)
+
+    def _track_peak(self):
+        self.stats["max_active"] = max(self.stats["max_active"], self.active)
+
+    def _give_up(self, waiter: asyncio.Future) -> bool:
+        """Leaves the queue; True if a slot had already been handed over."""
+        if waiter.done():
+            return True
+        waiter.cancel()
+        return False
@@ -0,0 +1,43 @@
+from collections import deque
+from itertools import islice
+from typing import Iterable
+from a2a_types import Message
+
+class TaskHistory:
+    """Bounded message history of one task.
+
+    Backed by a deque with `maxlen`, so appending is O(1) and drops the
+    oldest message once `capacity` is reached, and `last(n)` walks only the
+    newest n messages instead of copying the whole history.
+    """
+    __slots__ = ("_messages",)
+
+    def __init__(self, capacity: int | None = None, messages: Iterable[Message] = ()):
+        self._messages: deque[Message] = deque(messages, maxlen=capacity)
+
+    @property
+    def capacity(self) -> int | None:
+        return self._messages.maxlen
+
+    def append(self, message: Message) -> bool:
+        """Appends a message. Returns True if the oldest one was dropped."""
+        full = len(self._messages) == self._messages.maxlen
+        self._messages.append(message)
+        return full
+
+    def pop(self) -> Message | None:
+        """Removes and returns the newest message, undoing `append`."""
+        return self._messages.pop() if self._messages else None
+
+    def last(self, n: int | None) -> list[Message]:
+        """Returns the newest `n` messages, oldest first (all if n is None)."""
+        if n is None or n >= len(self._messages):
+            return list(self._messages)
+        if n <= 0:
+            return []
+        newest = list(islice(reversed(self._messages), n))
+        newest.reverse()
+        return newest
+
+    def __len__(self) -> int:
+        return len(self._messages)
@@ -1,9 +1,16 @@
+import time
 from abc import ABC, abstractmethod
 from asyncio import Lock
+from contextlib import asynccontextmanager
 from typing import Dict, Union, AsyncIterable
 from a2a_types import (GetTaskRequest, SendTaskRequest, GetTaskResponse, SendTaskResponse,
-        Task, TaskSendParams, TaskState, TaskStatus, TaskQueryParams, TaskNotFoundError)
+        Task, TaskSendParams, TaskState, TaskStatus, TaskQueryParams, TaskNotFoundError, Artifact)
 from a2a_types import (SendTaskStreamingRequest, SendTaskStreamingResponse, JSONRPCResponse)
+from server.task_retention import TaskRetention, TaskRetentionPolicy
+from server.task_store import TaskStore, InMemoryTaskStore
+from server.invoke_pool import InvokePool
+import logging
+logger = logging.getLogger(__name__)
 
 class TaskManager(ABC):
     @abstractmethod
@@ -44,10 +51,35 @@ class TaskManager(ABC):
     #     pass
     
 class InMemoryTaskManager(TaskManager):
+    """Task manager keeping copy-on-write task snapshots in a TaskStore.
+
+    Writers take a lock striped by task id, build a new Task from the
+    current one and publish it with `store.put`; a published Task is never
+    mutated again, so readers take no lock at all and tasks on different
+    stripes never wait for each other. Message history is kept beside the
+    snapshot in a bounded TaskHistory and attached on the way out, trimmed
+    to the `historyLength` the caller asked for.
+    """
     
-    def __init__(self):
-        self.tasks: Dict[str, Task] = {}   # 🗃️ Dictionary where key = task ID, value = Task object
-        self.lock = Lock()  
+    def __init__(
+        self,
+        retention_policy: TaskRetentionPolicy | None = None,
+        store: TaskStore | None = None,
+        invoke_pool: InvokePool | None = None,
+        lock_stripes: int = 64,
+    ):
+        self.store = store or InMemoryTaskStore()   # 🗃️ key = task ID, value = Task object
+        self.invoke_pool = invoke_pool or InvokePool()  # runs blocking non-streaming calls
+        self._locks = [Lock() for _ in range(lock_stripes)]
+        self.lock_stats = {"acquisitions": 0, "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+        self.retention = TaskRetention(retention_policy)
+        self.store.history_capacity = self.retention.policy.max_history
+        self.store.retention_policy = self.retention.policy
+
+    @property
+    def tasks(self) -> Dict[str, Task]:
+        """Tasks currently held in memory."""
+        return self.store.resident
     
     @abstractmethod
     async def on_send_task(self, request: SendTaskRequest) -> SendTaskResponse:
@@ -56,30 +88,131 @@ class InMemoryTaskManager(TaskManager):
     async def on_get_task(self, request: GetTaskRequest) -> GetTaskResponse:
         task_query_params: TaskQueryParams = request.params
 
-        async with self.lock:
-            task = self.tasks.get(task_query_params.id)
-            if task is None:
-                return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+        # Snapshot read: the stored Task is replaced, never mutated, by writers.
+        task = await self.store.get(task_query_params.id)
+        if task is None:
+            if self.retention.was_evicted(task_query_params.id):
+                return GetTaskResponse(id=request.id, error=TaskNotFoundError(
+                    message="Task not found: evicted by the retention policy"
+                ))
+            return GetTaskResponse(id=request.id, error=TaskNotFoundError())
+        self.retention.touch(task.id)
 
-            task_result = self.append_task_history(
-                task, task_query_params.historyLength
-            )
+        task_result = self.append_task_history(
+            task, task_query_params.historyLength
+        )
 
         return GetTaskResponse(id=request.id, result=task_result)
     
     async def upsert_task(self, params: TaskSendParams) -> Task:
-        async with self.lock:
-            task = self.tasks.get(params.id)  # Try to find an existing task with this ID
-        if task is None:
-            # If task doesn't exist, create it with a "submitted" status
-            task = Task(
-                id=params.id,
-                status=TaskStatus(state=TaskState.SUBMITTED),
-                history=[params.message]
-            )
-            self.tasks[params.id] = task
-        else:
-            # If task exists, add the new message to its history
-            task.history.append(params.message)
-
-        return task
\ No newline at end of file
+        async with self._task_lock(params.id):
+            task = await self.store.get(params.id)  # Try to find an existing task with this ID
+            history = self.store.get_history(params.id)
+            if task is None:
+                # If task doesn't exist, create it with a "submitted" status
+                task = Task(
+                    id=params.id,
+                    sessionId=params.sessionId,
+                    status=TaskStatus(state=TaskState.SUBMITTED),
+                )
+                history = self.retention.new_history(params.message)
+            else:
+                # A new message starts a new run of the task: it is in flight
+                # again, so retention must not evict it until the run ends.
+                task = task.model_copy(update={"status": TaskStatus(state=TaskState.SUBMITTED)})
+                if history is None:
+                    history = self.retention.new_history(params.message)
+                else:
+                    # If task exists, add the new message to its history
+                    self.retention.append_history(history, params.message)
+            self.retention.on_status(task)
+            await self.store.put(task, history)
+            self.retention.touch(task.id)
+            self._evict()
+        return task
+
+    async def restore_task(self, params: TaskSendParams, previous: Task | None):
+        """Undoes `upsert_task` for a message the agent turned away without
+        running it: a new task is dropped, an existing one gets its previous
+        status back and forgets the message, so a retry starts clean."""
+        async with self._task_lock(params.id):
+            if previous is None:
+                await self.store.delete(params.id)
+                self.retention.forget(params.id)
+                return
+            history = self.store.get_history(params.id)
+            if history is not None:
+                history.pop()
+            self.retention.on_status(previous)
+            await self.store.put(previous, history)
+
+    async def _update_store(
+        self, task_id: str, status: TaskStatus, artifacts: list[Artifact] | None
+    ) -> Task:
+        async with self._task_lock(task_id):
+            current = await self.store.get(task_id)
+            if current is None:
+                logger.error(f"Task {task_id} not found for updating the task")
+                raise ValueError(f"Task {task_id} not found")
+            task = current.model_copy(update={"status": status})
+            if artifacts is not None:
+                task.artifacts = list(current.artifacts or [])
+                self.retention.add_artifacts(task, artifacts)
+            self.retention.on_status(task)
+            await self.store.put(task)
+            self.retention.touch(task_id)
+            self._evict()
+            return task
+
+    def append_task_history(self, task: Task, history_length: int | None) -> Task:
+        """Returns a copy of `task` carrying its newest `history_length` messages.
+
+        Without a positive `history_length` no history is returned, so callers
+        only pay for serializing the messages they ask for.
+        """
+        history = self.store.get_history(task.id)
+        if history is None or not history_length or history_length <= 0:
+            return task.model_copy(update={"history": []})
+        return task.model_copy(update={"history": history.last(history_length)})
+
+    @asynccontextmanager
+    async def _task_lock(self, task_id: str):
+        lock = self._locks[hash(task_id) % len(self._locks)]
+        start = time.perf_counter()
+        async with lock:
+            waited = time.perf_counter() - start
+            stats = self.lock_stats
+            stats["acquisitions"] += 1
+            stats["wait_seconds"] += waited
+            if waited > stats["max_wait_seconds"]:
+                stats["max_wait_seconds"] = waited
+            yield
+
+    async def close(self):
+        """Flushes and closes the task store and stops the invoke pool."""
+        self.invoke_pool.shutdown()
+        await self.store.close()
+
+    def _evict(self):
+        expired, evicted = self.retention.collect(self.store.resident)
+        for task_id in expired:
+            self.store.expire(task_id)
+        for task_id in evicted:
+            self.store.evict(task_id)
+
+    def metrics(self) -> dict:
+        """Task store size, lock contention, retention and invoke pool state."""
+        return {
+            "tasks": len(self.tasks),
+            "locks": self.lock_stats,
+            "retention": self.retention.stats,
+            "invoke_pool": {
+                "running": self.invoke_pool.running,
+                "waiting": self.invoke_pool.waiting,
+            },
+        }
+
+    @property
+    def retention_stats(self) -> dict[str, int]:
+        """Eviction and trimming counters plus the current task count."""
+        return {**self.retention.stats, "tasks": len(self.tasks)}
\ No newline at end of file
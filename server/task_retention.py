@@ -0,0 +1,138 @@
+import time
+from collections import OrderedDict
+from pydantic import BaseModel
+from a2a_types import Artifact, Message, Task, TaskState
+from server.task_history import TaskHistory
+
+# Tasks in these states still have a run producing updates for them.
+IN_FLIGHT_STATES = {TaskState.SUBMITTED, TaskState.WORKING}
+TERMINAL_STATES = {TaskState.COMPLETED, TaskState.CANCELED, TaskState.FAILED}
+# Tasks waiting for the user's reply; kept until `input_required_ttl` runs out.
+WAITING_STATES = {TaskState.INPUT_REQUIRED}
+
+class TaskRetentionPolicy(BaseModel):
+    """Limits for the task store. `None` disables the corresponding limit."""
+    max_tasks: int | None = 10_000
+    terminal_ttl: float | None = 3600.0        # seconds after a terminal state
+    input_required_ttl: float | None = 86400.0 # seconds a task waits for a reply
+    max_history: int | None = 100              # messages kept per task
+    max_artifact_bytes: int | None = 1_000_000 # serialized artifact bytes per task
+    evicted_ids_remembered: int = 10_000
+
+class TaskRetention:
+    """Tracks recency and terminal times of tasks and decides what to evict.
+
+    Tasks that are still submitted/working are never evicted, so a stream
+    in progress cannot lose its task underneath it. Tasks waiting for input
+    are not evicted to make room either, only once their own TTL ran out.
+    """
+
+    def __init__(self, policy: TaskRetentionPolicy | None = None):
+        self.policy = policy or TaskRetentionPolicy()
+        self._lru: OrderedDict[str, None] = OrderedDict()
+        self._terminal_at: OrderedDict[str, float] = OrderedDict()
+        self._waiting_since: OrderedDict[str, float] = OrderedDict()
+        self._artifact_bytes: dict[str, int] = {}
+        self._evicted: OrderedDict[str, None] = OrderedDict()
+        self.stats = {
+            "evicted_lru": 0,
+            "evicted_ttl": 0,
+            "history_trimmed": 0,
+            "artifacts_trimmed": 0,
+        }
+
+    def touch(self, task_id: str):
+        self._lru[task_id] = None
+        self._lru.move_to_end(task_id)
+
+    def on_status(self, task: Task):
+        state = task.status.state
+        _mark(self._terminal_at, task.id, state in TERMINAL_STATES)
+        _mark(self._waiting_since, task.id, state in WAITING_STATES)
+
+    def was_evicted(self, task_id: str) -> bool:
+        return task_id in self._evicted
+
+    def forget(self, task_id: str):
+        self._lru.pop(task_id, None)
+        self._terminal_at.pop(task_id, None)
+        self._waiting_since.pop(task_id, None)
+        self._artifact_bytes.pop(task_id, None)
+
+    def collect(self, tasks: dict[str, Task]) -> tuple[list[str], list[str]]:
+        """Returns (expired, evicted) ids so `tasks` fits the policy.
+
+        Expired tasks ran out their TTL and are gone for good; evicted ones
+        only make room in memory, a persistent store may keep them.
+        """
+        victims = []
+        for since, ttl in ((self._terminal_at, self.policy.terminal_ttl),
+                           (self._waiting_since, self.policy.input_required_ttl)):
+            if ttl is None:
+                continue
+            deadline = time.monotonic() - ttl
+            while since:
+                task_id, started = next(iter(since.items()))
+                if started > deadline:
+                    break
+                since.popitem(last=False)
+                victims.append(task_id)
+                self.stats["evicted_ttl"] += 1
+        expired = len(victims)
+
+        max_tasks = self.policy.max_tasks
+        if max_tasks is not None:
+            excess = len(tasks) - len(victims) - max_tasks
+            if excess > 0:
+                chosen = set(victims)
+                for task_id in self._lru:
+                    if excess <= 0:
+                        break
+                    task = tasks.get(task_id)
+                    if task_id in chosen or (task and task.status.state in _PROTECTED_STATES):
+                        continue
+                    victims.append(task_id)
+                    self.stats["evicted_lru"] += 1
+                    excess -= 1
+
+        for task_id in victims:
+            self.forget(task_id)
+            self._evicted[task_id] = None
+            if len(self._evicted) > self.policy.evicted_ids_remembered:
+                self._evicted.popitem(last=False)
+        return victims[:expired], victims[expired:]
+
+    def new_history(self, message: Message) -> TaskHistory:
+        return TaskHistory(self.policy.max_history, [message])
+
+    def append_history(self, history: TaskHistory, message: Message):
+        if history.append(message):
+            self.stats["history_trimmed"] += 1
+
+    def add_artifacts(self, task: Task, artifacts: list[Artifact]):
+        """Appends artifacts, dropping the oldest ones beyond the byte cap."""
+        if task.artifacts is None:
+            task.artifacts = []
+        task.artifacts.extend(artifacts)
+        limit = self.policy.max_artifact_bytes
+        if limit is None:
+            return
+        total = self._artifact_bytes.get(task.id, 0)
+        total += sum(_artifact_size(a) for a in artifacts)
+        while total > limit and len(task.artifacts) > 1:
+            total -= _artifact_size(task.artifacts.pop(0))
+            self.stats["artifacts_trimmed"] += 1
+        self._artifact_bytes[task.id] = total
+
+_PROTECTED_STATES = IN_FLIGHT_STATES | WAITING_STATES
+
+def _mark(since: OrderedDict[str, float], task_id: str, entered: bool):
+    """Records when a task entered a state group, or forgets it if it left."""
+    if entered:
+        if task_id not in since:
+            since[task_id] = time.monotonic()
+    else:
+        since.pop(task_id, None)
+
+def _artifact_size(artifact: Artifact) -> int:
+    return len(artifact.model_dump_json(exclude_none=True))
@@ -0,0 +1,281 @@
+import asyncio
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from pydantic import TypeAdapter
+from a2a_types import Message, Task
+from server.task_history import TaskHistory
+from server.task_retention import (
+    IN_FLIGHT_STATES, TERMINAL_STATES, WAITING_STATES, TaskRetentionPolicy)
+import logging
+logger = logging.getLogger(__name__)
+
+_messages_adapter = TypeAdapter(list[Message])
+
+class TaskStore(ABC):
+    """Storage backend for InMemoryTaskManager.
+
+    `resident` holds the task snapshots currently kept in memory and
+    `histories` their message histories, which live outside the snapshot so
+    appending a message does not copy the task. The task manager publishes
+    changes with `put`.
+    """
+    resident: Dict[str, Task]
+    histories: Dict[str, TaskHistory]
+    history_capacity: int | None = None
+    retention_policy: TaskRetentionPolicy | None = None
+
+    @abstractmethod
+    async def get(self, task_id: str) -> Task | None:
+        pass
+
+    def get_history(self, task_id: str) -> TaskHistory | None:
+        """History of a resident task (call `get` first to load it)."""
+        return self.histories.get(task_id)
+
+    @abstractmethod
+    async def put(self, task: Task, history: TaskHistory | None = None) -> None:
+        pass
+
+    @abstractmethod
+    async def delete(self, task_id: str) -> None:
+        pass
+
+    @abstractmethod
+    def evict(self, task_id: str) -> None:
+        """Drops a task from memory as requested by the retention policy."""
+        pass
+
+    def expire(self, task_id: str) -> None:
+        """Removes a task whose retention TTL ran out; it must not come back."""
+        self.evict(task_id)
+
+    async def close(self) -> None:
+        pass
+
+class InMemoryTaskStore(TaskStore):
+    """The default backend: a dict. Evicted tasks are gone for good."""
+
+    def __init__(self):
+        self.resident: Dict[str, Task] = {}
+        self.histories: Dict[str, TaskHistory] = {}
+
+    async def get(self, task_id: str) -> Task | None:
+        return self.resident.get(task_id)
+
+    async def put(self, task: Task, history: TaskHistory | None = None) -> None:
+        self.resident[task.id] = task
+        if history is not None:
+            self.histories[task.id] = history
+
+    async def delete(self, task_id: str) -> None:
+        self.evict(task_id)
+
+    def evict(self, task_id: str) -> None:
+        self.resident.pop(task_id, None)
+        self.histories.pop(task_id, None)
+
+class SQLiteTaskStore(TaskStore):
+    """SQLite (WAL mode) backend with a hot in-memory cache in front.
+
+    Writes are coalesced: `put` only marks a task dirty, and a background
+    flush writes the latest version of every dirty task in one transaction
+    every `flush_interval` seconds or once `batch_size` tasks are dirty.
+    Tasks missing from the cache are loaded lazily on `get`, so tasks
+    survive restarts and making room in memory only drops them from the
+    cache. Rows follow the retention policy too: expired tasks are deleted
+    right away, and every `prune_interval` seconds a flush also deletes
+    rows past their TTL and the oldest finished rows beyond `max_tasks`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 0.05,
+        batch_size: int = 256,
+        prune_interval: float = 60.0,
+    ):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.prune_interval = prune_interval
+        self._last_prune = time.monotonic()
+        self.pruned = 0
+        self.resident: Dict[str, Task] = {}
+        self.histories: Dict[str, TaskHistory] = {}
+        self._dirty: set[str] = set()
+        self._pending: Dict[str, tuple | None] = {}  # rows to write, None = delete
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="task-store")
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            " id TEXT PRIMARY KEY, session_id TEXT, state TEXT,"
+            " body TEXT NOT NULL, history TEXT, updated_at REAL NOT NULL)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+        if "history" not in columns:
+            self._conn.execute("ALTER TABLE tasks ADD COLUMN history TEXT")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS tasks_state_updated ON tasks (state, updated_at)"
+        )
+        self._conn.commit()
+        self._flush_requested = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    async def get(self, task_id: str) -> Task | None:
+        task = self.resident.get(task_id)
+        if task is not None:
+            return task
+        if task_id in self._pending:
+            row = self._pending[task_id]
+            stored = row[2:] if row else None
+        else:
+            stored = await self._run(self._load, task_id)
+        if stored is None:
+            return None
+        body, history = stored
+        task = Task.model_validate_json(body)
+        messages = _messages_adapter.validate_json(history) if history else []
+        self.resident[task_id] = task
+        self.histories[task_id] = TaskHistory(self.history_capacity, messages)
+        return task
+
+    async def put(self, task: Task, history: TaskHistory | None = None) -> None:
+        self.resident[task.id] = task
+        if history is not None:
+            self.histories[task.id] = history
+        self._dirty.add(task.id)
+        self._ensure_flusher()
+        if len(self._dirty) >= self.batch_size:
+            self._flush_requested.set()
+
+    async def delete(self, task_id: str) -> None:
+        self.resident.pop(task_id, None)
+        self.histories.pop(task_id, None)
+        self._dirty.discard(task_id)
+        self._pending[task_id] = None
+        self._ensure_flusher()
+
+    def evict(self, task_id: str) -> None:
+        task = self.resident.pop(task_id, None)
+        history = self.histories.pop(task_id, None)
+        if task is not None and task_id in self._dirty:
+            self._dirty.discard(task_id)
+            self._pending[task_id] = _row(task, history)
+
+    def expire(self, task_id: str) -> None:
+        self.resident.pop(task_id, None)
+        self.histories.pop(task_id, None)
+        self._dirty.discard(task_id)
+        self._pending[task_id] = None
+        self._ensure_flusher()
+
+    async def flush(self) -> None:
+        """Writes every dirty task now."""
+        for task_id in self._dirty:
+            task = self.resident.get(task_id)
+            if task is not None:
+                self._pending[task_id] = _row(task, self.histories.get(task_id))
+        self._dirty.clear()
+        if self._pending:
+            batch, self._pending = self._pending, {}
+            await self._run(self._write, batch)
+        if (self.retention_policy is not None and
+                time.monotonic() - self._last_prune >= self.prune_interval):
+            self._last_prune = time.monotonic()
+            self.pruned += await self._run(self._prune, self.retention_policy)
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+        await self.flush()
+        await self._run(self._conn.close)
+        self._executor.shutdown(wait=True)
+
+    def _ensure_flusher(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to flush task store: {e}")
+            if not self._dirty and not self._pending:
+                # Idle: stop until the next put restarts the loop.
+                self._flusher = None
+                return
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _load(self, task_id: str) -> tuple | None:
+        return self._conn.execute(
+            "SELECT body, history FROM tasks WHERE id = ?", (task_id,)
+        ).fetchone()
+
+    def _write(self, batch: Dict[str, tuple | None]):
+        now = time.time()
+        upserts = []
+        deletes = []
+        for task_id, row in batch.items():
+            if row is None:
+                deletes.append((task_id,))
+            else:
+                upserts.append((task_id, *row, now))
+        with self._conn:
+            if upserts:
+                self._conn.executemany(
+                    "INSERT INTO tasks (id, session_id, state, body, history, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT(id) DO UPDATE SET session_id = excluded.session_id,"
+                    " state = excluded.state, body = excluded.body,"
+                    " history = excluded.history, updated_at = excluded.updated_at",
+                    upserts,
+                )
+            if deletes:
+                self._conn.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+
+    def _prune(self, policy: TaskRetentionPolicy) -> int:
+        """Deletes rows the retention policy no longer keeps; returns how many."""
+        now = time.time()
+        deleted = 0
+        with self._conn:
+            for states, ttl in ((TERMINAL_STATES, policy.terminal_ttl),
+                                (WAITING_STATES, policy.input_required_ttl)):
+                if ttl is None:
+                    continue
+                values = [s.value for s in states]
+                deleted += self._conn.execute(
+                    f"DELETE FROM tasks WHERE state IN ({', '.join('?' * len(values))})"
+                    " AND updated_at < ?",
+                    (*values, now - ttl),
+                ).rowcount
+            if policy.max_tasks is not None:
+                # Never prune tasks with a run in progress or awaiting a reply
+                kept = [s.value for s in IN_FLIGHT_STATES | WAITING_STATES]
+                deleted += self._conn.execute(
+                    "DELETE FROM tasks WHERE id IN (SELECT id FROM tasks"
+                    f" WHERE state NOT IN ({', '.join('?' * len(kept))})"
+                    " ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (*kept, policy.max_tasks),
+                ).rowcount
+        return deleted
+
+def _row(task: Task, history: TaskHistory | None) -> tuple:
+    state = getattr(task.status.state, "value", task.status.state)
+    messages = None
+    if history is not None:
+        messages = _messages_adapter.dump_json(history.last(None), exclude_none=True).decode()
+    return (task.sessionId, state, task.model_dump_json(exclude_none=True), messages)